@@ -0,0 +1,82 @@
+"""
+Tree-walking interpreter versus the compiling backends
+
+Runs a procedure-heavy program shaped like src.pas through every
+backend and prints the best time of each.
+
+    python -m benchmarks.backends --calls 2000 --repeat 5
+"""
+
+import argparse
+import timeit
+from interpreter.ex19 import Lexer, Parser, SemanticAnalyzer, Interpreter, Compiler, VM, Engine
+from interpreter.ex19 import PythonTranspiler
+
+PROGRAM_TEMPLATE = r'''
+program Main;
+var r : integer;
+
+procedure Alpha(a : integer; b : integer);
+var x : integer;
+
+   procedure Beta(a : integer; b : integer);
+   var x : integer;
+   begin
+      x := a * 10 + b * 2;
+   end;
+
+begin
+   x := (a + b ) * 2;
+
+   Beta(5, 10);      {{ procedure call }}
+end;
+
+begin {{ Main }}
+{calls}
+   r := 1
+end.  {{ Main }}
+'''
+
+def build_program(calls):
+    body = '\n'.join('   Alpha(3 + 5, 7);' for _ in range(calls))
+    return PROGRAM_TEMPLATE.format(calls=body)
+
+def analyze(text):
+    tree = Parser(Lexer(text)).parse()
+    SemanticAnalyzer().visit(tree)
+    return tree
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argparser.add_argument('--calls', type=int, default=2000)
+    argparser.add_argument('--repeat', type=int, default=5)
+    args = argparser.parse_args()
+
+    text = build_program(args.calls)
+    tree = analyze(text)
+    bytecode = Compiler().compile(tree)
+    engine = Engine(tree)
+    engine.compile()
+    transpiler = PythonTranspiler(Parser(Lexer(text)))
+    code = transpiler.compile()
+
+    def run_python():
+        namespace = {}
+        exec(code, namespace)
+        namespace['_program']()
+
+    backends = (
+            ('tree', lambda: Interpreter(tree).interpret()),
+            ('vm', lambda: VM(bytecode).interpret()),
+            ('closure', engine.interpret),
+            ('python', run_python),
+            )
+
+    results = {}
+    for name, run in backends:
+        results[name] = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        speedup = results['tree'] / results[name]
+        print(f'{name:<8}: {results[name] * 1000:8.2f} ms {speedup:5.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Activation record pooling versus a fresh record per call
+
+Runs a call-heavy program and a deep chain of nested calls with the
+pooled slotted records and with unpooled dict-based records, and
+prints the records allocated, the tracemalloc peak and the best time.
+
+    python -m benchmarks.frames --calls 20000 --depth 5000 --repeat 5
+"""
+
+import argparse
+import timeit
+import tracemalloc
+from interpreter.ex19 import Interpreter, StackInterpreter
+from interpreter.ex19.memory import CallStack
+from .backends import build_program, analyze
+
+
+class DictActivationRecord:
+    # ActivationRecord as it was, attributes in the instance dict
+    def __init__(self, name, type, nesting_level, slot_names=()):
+        self.name = name
+        self.type = type
+        self.nesting_level = nesting_level
+        self.slot_names = slot_names
+        self.slots = [None] * len(slot_names)
+        self.free_list = None
+
+class UnpooledCallStack(CallStack):
+    def __init__(self):
+        super().__init__()
+        self.allocated = 0
+
+    def new_record(self, key, name, type, nesting_level, slot_names):
+        self.allocated += 1
+        return DictActivationRecord(name, type, nesting_level, slot_names)
+
+
+def chain_program(depth):
+    procs = ['procedure P0(x : integer); begin r := x end;']
+    procs.extend(f'procedure P{i}(x : integer); var y : integer; begin y := x; P{i-1}(y + 1) end;'
+            for i in range(1, depth))
+    return 'program Chain; var r : integer;\n' + '\n'.join(procs) + f'\nbegin P{depth - 1}(0) end.'
+
+def allocated(call_stack):
+    if isinstance(call_stack, UnpooledCallStack):
+        return call_stack.allocated
+    # every pooled record is back on its free list after the run
+    return sum(len(free_list) for free_list in call_stack.free_lists.values())
+
+def run(cls, tree, call_stack):
+    interpreter = cls(tree)
+    interpreter.call_stack = call_stack
+    interpreter.interpret()
+
+def measure(cls, tree, call_stack_cls, repeat):
+    call_stack = call_stack_cls()
+    tracemalloc.start()
+    run(cls, tree, call_stack)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # timed apart, tracing slows every allocation down
+    elapsed = min(timeit.repeat(lambda: run(cls, tree, call_stack_cls()),
+            number=1, repeat=repeat))
+
+    return allocated(call_stack), peak, elapsed
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argparser.add_argument('--calls', type=int, default=20000)
+    argparser.add_argument('--depth', type=int, default=5000)
+    argparser.add_argument('--repeat', type=int, default=5)
+    args = argparser.parse_args()
+
+    programs = (
+            (f'{args.calls} calls', Interpreter, analyze(build_program(args.calls))),
+            (f'{args.depth} deep', StackInterpreter, analyze(chain_program(args.depth))),
+            )
+
+    for name, cls, tree in programs:
+        for label, call_stack in (('unpooled', UnpooledCallStack), ('pooled', CallStack)):
+            records, peak, elapsed = measure(cls, tree, call_stack, args.repeat)
+            print(f'{name:<12} {label:<8}: {records:6} records, '
+                  f'peak {peak / 1024:8.1f} KiB, {elapsed * 1000:7.1f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Seeded generator of ex19 programs
+
+Programs are valid for the whole pipeline and run without errors:
+every variable is assigned before it is read and divisions are by
+non-zero literals. Multiplications are by literals up to 3, so an
+expression of depth d is at most 3**d times its largest variable, and
+procedures store to globals that expression divided by 3**d + 1: the
+globals can't grow however many calls the program makes.
+
+    python -m benchmarks.generator --seed 1 --statements 20 --calls 100
+"""
+
+import argparse
+import random
+
+INDENT = '    '
+
+
+class ProgramGenerator:
+    """
+    Generates a program shaped by the parameters
+
+    seed        -- random seed, the same parameters give the same program
+    statements  -- assignments in every body
+    expr_depth  -- nesting depth of the expressions
+    procedures  -- procedures declared in the program
+    nesting     -- procedures nested in every procedure, one in another
+    calls       -- calls of every procedure from the program body
+
+    A procedure calls the procedure nested in it once, at the end of
+    its body, so calls * procedures * (nesting + 1) procedure bodies run.
+    Procedures read the variables of their enclosing scopes and assign
+    the globals.
+    """
+
+    def __init__(self, seed=0, statements=10, expr_depth=3, procedures=3, nesting=1, calls=100):
+        self.seed = seed
+        self.random = None
+        self.statements = statements
+        self.expr_depth = expr_depth
+        self.procedures = procedures
+        self.nesting = nesting
+        self.calls = calls
+        self.lines = []
+        self.names = 0
+        self.globals = []
+        self.damping = 3 ** expr_depth + 1
+
+    def new_name(self, prefix):
+        self.names += 1
+        return f'{prefix}{self.names}'
+
+    def emit(self, level, line):
+        self.lines.append(INDENT * level + line if line else line)
+
+    def generate(self):
+        self.random = random.Random(self.seed)
+        self.lines = []
+        self.names = 0
+        globals_ = self.globals = [self.new_name('g') for _ in range(3)]
+
+        self.emit(0, 'PROGRAM Generated;')
+        self.emit(0, f'VAR {", ".join(globals_)} : INTEGER;')
+        self.emit(0, '')
+
+        procs = [self.procedure(0, globals_, self.nesting) for _ in range(self.procedures)]
+
+        self.emit(0, 'BEGIN')
+        for name in globals_:
+            self.emit(1, f'{name} := {self.random.randint(1, 9)};')
+        for _ in range(self.calls):
+            for proc in procs:
+                self.emit(1, f'{proc}({self.expr(globals_)}, {self.expr(globals_)});')
+        for _ in range(self.statements):
+            self.emit(1, f'{self.random.choice(globals_)} := {self.expr(globals_)};')
+        self.emit(0, 'END.')
+
+        return '\n'.join(self.lines) + '\n'
+
+    def procedure(self, level, visible, nesting):
+        name = self.new_name('P')
+        params = [self.new_name('a'), self.new_name('b')]
+        local_vars = [self.new_name('x') for _ in range(2)]
+
+        self.emit(level, f'PROCEDURE {name}({", ".join(params)} : INTEGER);')
+        self.emit(level, f'VAR {", ".join(local_vars)} : INTEGER;')
+
+        # the nested procedure is called once the locals are assigned,
+        # it can read all of them
+        readable = visible + params
+        if nesting:
+            nested = self.procedure(level + 1, readable + local_vars, nesting - 1)
+        else:
+            nested = None
+
+        self.emit(level, 'BEGIN')
+        for var in local_vars:
+            self.emit(level + 1, f'{var} := {self.expr(readable)};')
+            readable = readable + [var]
+        for _ in range(self.statements):
+            target = self.random.choice(self.globals)
+            self.emit(level + 1, f'{target} := ({self.expr(readable)}) DIV {self.damping};')
+        if nested:
+            self.emit(level + 1, f'{nested}({self.expr(readable)}, {self.expr(readable)});')
+        self.emit(level, 'END;')
+        self.emit(level, '')
+
+        return name
+
+    def expr(self, names, depth=None):
+        if depth is None:
+            depth = self.expr_depth
+
+        if depth == 0 or self.random.random() < 0.2:
+            if self.random.random() < 0.3:
+                return str(self.random.randint(0, 9))
+            return self.random.choice(names)
+
+        kind = self.random.random()
+        left = self.expr(names, depth - 1)
+
+        if kind < 0.35:
+            return f'{left} + {self.expr(names, depth - 1)}'
+        elif kind < 0.65:
+            return f'({left} - {self.expr(names, depth - 1)})'
+        elif kind < 0.8:
+            return f'({left}) * {self.random.randint(0, 3)}'
+        elif kind < 0.95:
+            return f'({left}) DIV {self.random.randint(1, 9)}'
+        return f'-({left})'
+
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argparser.add_argument('--seed', type=int, default=0)
+    argparser.add_argument('--statements', type=int, default=10)
+    argparser.add_argument('--expr-depth', type=int, default=3)
+    argparser.add_argument('--procedures', type=int, default=3)
+    argparser.add_argument('--nesting', type=int, default=1)
+    argparser.add_argument('--calls', type=int, default=100)
+    args = argparser.parse_args()
+
+    generator = ProgramGenerator(
+            seed=args.seed,
+            statements=args.statements,
+            expr_depth=args.expr_depth,
+            procedures=args.procedures,
+            nesting=args.nesting,
+            calls=args.calls,
+            )
+    print(generator.generate(), end='')
+
+if __name__ == '__main__':
+    main()
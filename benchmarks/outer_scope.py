@@ -0,0 +1,68 @@
+"""
+Outer scope variable access: display versus call stack scan
+
+Every procedure of a chain of nested calls updates a global variable,
+the interpreter finds its record through the display and through the
+scan of the call stack that the display replaced.
+
+    python -m benchmarks.outer_scope --depths 10 100 1000 --repeat 5
+"""
+
+import argparse
+import sys
+import timeit
+from interpreter.ex19 import Interpreter
+from .backends import analyze
+
+
+class ScanningInterpreter(Interpreter):
+    # records looked up as before the display, by a scan from the top
+    def get_ar(self, nesting_level):
+        ar = self.call_stack.peek()
+        if ar.nesting_level == nesting_level:
+            return ar
+        for ar in reversed(self.call_stack):
+            if ar.nesting_level == nesting_level:
+                return ar
+
+    def visit_Assign(self, node):
+        var_val = self.visit(node.right)
+        nesting_level, slot = node.left.address
+        self.get_ar(nesting_level).slots[slot] = var_val
+
+    def visit_Var(self, node):
+        nesting_level, slot = node.address
+        var_val = self.get_ar(nesting_level).slots[slot]
+        if var_val is None:
+            raise NameError(repr(node.name))
+        return var_val
+
+
+def chain_program(depth):
+    procs = ['procedure P0(x : integer); begin r := r + x end;']
+    procs.extend(f'procedure P{i}(x : integer); begin r := r + x; P{i-1}(x) end;'
+            for i in range(1, depth))
+    return 'program Chain; var r : integer;\n' + '\n'.join(procs) + f'\nbegin r := 0; P{depth - 1}(1) end.'
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argparser.add_argument('--depths', type=int, nargs='+', default=[10, 100, 1000])
+    argparser.add_argument('--repeat', type=int, default=5)
+    args = argparser.parse_args()
+
+    # the tree-walker takes a few Python frames per Pascal call
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 10 * max(args.depths) + 1000))
+
+    for depth in args.depths:
+        tree = analyze(chain_program(depth))
+        results = {}
+
+        for name, cls in (('scan', ScanningInterpreter), ('display', Interpreter)):
+            best = min(timeit.repeat(lambda: cls(tree).interpret(), number=1, repeat=args.repeat))
+            results[name] = best / depth * 1e6
+
+        print(f'depth {depth:<6}: scan {results["scan"]:7.2f} us/call, '
+              f'display {results["display"]:7.2f} us/call')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Phase benchmark runner over generated programs
+
+Times lexing, parsing, semantic analysis and execution of a generated
+program apart, with warmup runs and repetitions, and prints the results
+as JSON. Given a baseline JSON of an earlier run, compares every phase
+with it and exits with status 1 when one got slower than the tolerance.
+
+    python -m benchmarks.runner --calls 200 --repeat 10 --output new.json
+    python -m benchmarks.runner --calls 200 --baseline new.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from interpreter.ex19 import Parser, TokenBuffer, SemanticAnalyzer, Interpreter, StackInterpreter
+from interpreter.ex19 import Compiler, VM, Engine
+from .generator import ProgramGenerator
+
+PHASES = ('lex', 'parse', 'analyze', 'execute')
+
+BACKENDS = {
+        'tree': Interpreter,
+        'stack': StackInterpreter,
+        'vm': lambda tree: VM(Compiler().compile(tree)),
+        'closure': Engine,
+        }
+
+
+def run_phases(text, backend):
+    """
+    Runs the pipeline once, returns the seconds spent in every phase
+    """
+
+    times = {}
+
+    start = time.perf_counter()
+    tokens = TokenBuffer(text)
+    times['lex'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tree = Parser(tokens.cursor()).parse()
+    times['parse'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    SemanticAnalyzer().visit(tree)
+    times['analyze'] = time.perf_counter() - start
+
+    # compiling backends are timed with their compilation
+    start = time.perf_counter()
+    BACKENDS[backend](tree).interpret()
+    times['execute'] = time.perf_counter() - start
+
+    return times
+
+def summarize(runs):
+    return {
+            'min': min(runs),
+            'median': statistics.median(runs),
+            'mean': statistics.fmean(runs),
+            'stdev': statistics.stdev(runs) if len(runs) > 1 else 0.0,
+            'runs': runs,
+            }
+
+def benchmark(generator, backend='tree', warmup=2, repeat=10):
+    text = generator.generate()
+
+    for _ in range(warmup):
+        run_phases(text, backend)
+
+    runs = {phase: [] for phase in PHASES}
+    for _ in range(repeat):
+        for phase, seconds in run_phases(text, backend).items():
+            runs[phase].append(seconds)
+
+    return {
+            'params': {
+                'seed': generator.seed,
+                'statements': generator.statements,
+                'expr_depth': generator.expr_depth,
+                'procedures': generator.procedures,
+                'nesting': generator.nesting,
+                'calls': generator.calls,
+                'backend': backend,
+                'warmup': warmup,
+                'repeat': repeat,
+                },
+            'source_size': len(text),
+            'python': platform.python_version(),
+            'phases': {phase: summarize(runs[phase]) for phase in PHASES},
+            }
+
+def compare(results, baseline, tolerance):
+    """
+    Returns (phase, baseline seconds, seconds, ratio, regressed) rows
+
+    The minimum of the runs is compared, it's the least noisy.
+    """
+
+    rows = []
+    for phase in PHASES:
+        if phase not in baseline['phases']:
+            continue
+        before = baseline['phases'][phase]['min']
+        after = results['phases'][phase]['min']
+        ratio = after / before if before else float('inf')
+        rows.append((phase, before, after, ratio, ratio > 1 + tolerance))
+    return rows
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argparser.add_argument('--seed', type=int, default=0)
+    argparser.add_argument('--statements', type=int, default=10)
+    argparser.add_argument('--expr-depth', type=int, default=3)
+    argparser.add_argument('--procedures', type=int, default=3)
+    argparser.add_argument('--nesting', type=int, default=1)
+    argparser.add_argument('--calls', type=int, default=100)
+    argparser.add_argument('--backend', choices=tuple(BACKENDS), default='tree')
+    argparser.add_argument('--warmup', type=int, default=2)
+    argparser.add_argument('--repeat', type=int, default=10)
+    argparser.add_argument('--output', help='Write the results to the file')
+    argparser.add_argument('--baseline', help='Results to compare with')
+    argparser.add_argument('--tolerance', type=float, default=0.1,
+            help='Slowdown ratio over 1 counted as a regression')
+    args = argparser.parse_args()
+
+    generator = ProgramGenerator(
+            seed=args.seed,
+            statements=args.statements,
+            expr_depth=args.expr_depth,
+            procedures=args.procedures,
+            nesting=args.nesting,
+            calls=args.calls,
+            )
+    results = benchmark(generator, args.backend, args.warmup, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        if baseline['params'] != results['params']:
+            print('warning: the baseline was run with other parameters', file=sys.stderr)
+
+        regressed = False
+        for phase, before, after, ratio, slower in compare(results, baseline, args.tolerance):
+            mark = '  REGRESSION' if slower else ''
+            print(f'{phase:<8}: {before * 1000:9.3f} ms -> {after * 1000:9.3f} ms '
+                  f'{ratio:6.2f}x{mark}', file=sys.stderr)
+            regressed = regressed or slower
+
+        if regressed:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
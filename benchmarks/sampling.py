@@ -0,0 +1,47 @@
+"""
+Overhead of the line sampling profiler
+
+Runs a procedure-heavy program with and without a LineSampler
+attached, alternating the runs, and prints the best time of each.
+
+    python -m benchmarks.sampling --calls 50000 --repeat 8 --interval 0.001
+"""
+
+import argparse
+import time
+from interpreter.ex19 import Interpreter, StackInterpreter
+from interpreter.ex19.line_profiler import LineSampler, DEFAULT_INTERVAL
+from .backends import build_program, analyze
+
+
+def timed(run):
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argparser.add_argument('--calls', type=int, default=50000)
+    argparser.add_argument('--repeat', type=int, default=8)
+    argparser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL)
+    args = argparser.parse_args()
+
+    tree = analyze(build_program(args.calls))
+
+    for cls in (Interpreter, StackInterpreter):
+        plain, sampled, samples = [], [], 0
+
+        for _ in range(args.repeat):
+            plain.append(timed(lambda: cls(tree).interpret()))
+            sampler = LineSampler(args.interval)
+            with sampler:
+                sampled.append(timed(lambda: cls(tree).interpret()))
+            samples += sampler.samples
+
+        overhead = (min(sampled) / min(plain) - 1) * 100
+        print(f'{cls.__name__:<16}: plain {min(plain) * 1000:7.1f} ms, '
+              f'sampled {min(sampled) * 1000:7.1f} ms, {overhead:+5.1f}%, '
+              f'{samples / args.repeat:.0f} samples per run')
+
+if __name__ == '__main__':
+    main()
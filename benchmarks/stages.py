@@ -0,0 +1,209 @@
+"""
+Throughput and memory of the interpreter stages
+
+Evaluates the same seeded arithmetic expressions (+ - * / and
+parentheses over integers, the subset every stage from ex6 on
+understands) through the public API of every stage, from the direct
+evaluator of ex6 to the analyzed ex19 pipeline. The calculators get the
+bare expression, the Pascal stages a program assigning it to a variable,
+with the DIV spelling of the division. Results are checked against
+Python before timing, where the stage can report them.
+
+Every row is the best of the repetitions, in expressions per second, and
+the tracemalloc peak of one pass. Output of the stages (ex14 prints its
+scopes) goes to os.devnull and is part of their time.
+
+    python -m benchmarks.stages --expressions 200 --depth 5 --repeat 5
+"""
+
+import argparse
+import contextlib
+import importlib
+import os
+import random
+import time
+import tracemalloc
+
+OPERATORS = ('+', '-', '*', '/')
+
+SKIPPED = {
+        'ex12': 'the interpreter fails on every assignment',
+        }
+
+
+def as_expression(expression):
+    return expression
+
+def as_compound(expression):
+    return f'BEGIN r := {expression.replace("/", "DIV")} END.'
+
+def as_program(expression):
+    return f'PROGRAM Bench; VAR r : INTEGER; BEGIN r := {expression.replace("/", "DIV")} END.'
+
+def run_direct(package, text):
+    return package.Interpreter(text).expr()
+
+def run_calculator(package, text):
+    return package.Interpreter(package.Parser(package.Lexer(text))).interpret()
+
+def run_parsing(package, text):
+    interpreter = package.Interpreter(package.Parser(package.Lexer(text)))
+    interpreter.interpret()
+    return interpreter.get_var_value('r')
+
+def run_analyzed(package, text):
+    tree = package.Parser(package.Lexer(text)).parse()
+    package.SemanticAnalyzer().visit(tree)
+    interpreter = package.Interpreter(tree)
+    interpreter.interpret()
+    return interpreter.get_var_value('r')
+
+def run_unreadable(package, text):
+    # get_var_value of these stages reads the program activation record
+    # after it was popped, the result can't be checked
+    tree = package.Parser(package.Lexer(text)).parse()
+    package.SemanticAnalyzer().visit(tree)
+    package.Interpreter(tree).interpret()
+    return None
+
+# stage -> (source form, runner)
+STAGES = {
+        'ex6': (as_expression, run_direct),
+        'ex7': (as_expression, run_calculator),
+        'ex8': (as_expression, run_calculator),
+        'ex9': (as_compound, run_parsing),
+        'ex10': (as_program, run_parsing),
+        'ex11': (as_program, run_parsing),
+        'ex13': (as_program, run_parsing),
+        'ex14': (as_program, run_analyzed),
+        'ex15': (as_program, run_analyzed),
+        'ex16': (as_program, run_analyzed),
+        'ex17': (as_program, run_unreadable),
+        'ex18': (as_program, run_unreadable),
+        'ex19': (as_program, run_analyzed),
+        }
+
+
+def generate_expressions(seed=0, count=100, depth=5):
+    """
+    Returns count expressions nested up to depth, divisions are by
+    non-zero literals
+    """
+
+    rand = random.Random(seed)
+
+    def expression(depth):
+        if depth == 0 or rand.random() < 0.15:
+            return str(rand.randint(0, 99))
+
+        operator = rand.choice(OPERATORS)
+        left = expression(depth - 1)
+        if operator == '/':
+            return f'({left}) / {rand.randint(1, 9)}'
+        return f'({left} {operator} {expression(depth - 1)})'
+
+    return [expression(depth) for _ in range(count)]
+
+def reference(expression):
+    return eval(expression.replace('/', '//'))
+
+class Stage:
+    """
+    Runs expressions through the public API of a stage
+
+    name    -- package name in interpreter, ex6 ... ex19
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.package = importlib.import_module(f'interpreter.{name}')
+        self.form, self.runner = STAGES[name]
+
+    def sources(self, expressions):
+        return [self.form(expression) for expression in expressions]
+
+    def run(self, sources):
+        package, runner = self.package, self.runner
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            return [runner(package, text) for text in sources]
+
+    def check(self, expressions):
+        """
+        Returns whether the results were checked, raises AssertionError
+        on a wrong one
+        """
+
+        results = self.run(self.sources(expressions))
+        if all(result is None for result in results):
+            return False
+
+        for expression, result in zip(expressions, results):
+            expected = reference(expression)
+            if result != expected:
+                raise AssertionError(f'{self.name}: {expression} = {result}, expected {expected}')
+        return True
+
+    def measure(self, expressions, repeat=5):
+        """
+        Returns (expressions per second, peak bytes allocated)
+        """
+
+        sources = self.sources(expressions)
+
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            self.run(sources)
+            best = min(best, time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            self.run(sources)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return len(expressions) / best, peak
+
+def benchmark(names, expressions, repeat=5):
+    """
+    Returns (stage, expressions per second, peak bytes, checked) rows
+    """
+
+    rows = []
+    for name in names:
+        stage = Stage(name)
+        checked = stage.check(expressions)
+        throughput, peak = stage.measure(expressions, repeat)
+        rows.append((name, throughput, peak, checked))
+    return rows
+
+def report(rows):
+    lines = [f'{"stage":<6} {"expr/s":>10} {"vs prev":>8} {"peak KiB":>10} {"checked":>8}']
+
+    previous = None
+    for name, throughput, peak, checked in rows:
+        ratio = f'{throughput / previous:7.2f}x' if previous else f'{"":>8}'
+        lines.append(f'{name:<6} {throughput:10.0f} {ratio} {peak / 1024:10.1f} '
+                     f'{"yes" if checked else "no":>8}')
+        previous = throughput
+
+    for name, reason in SKIPPED.items():
+        lines.append(f'{name:<6} skipped: {reason}')
+
+    return '\n'.join(lines)
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argparser.add_argument('--seed', type=int, default=0)
+    argparser.add_argument('--expressions', type=int, default=200)
+    argparser.add_argument('--depth', type=int, default=5)
+    argparser.add_argument('--repeat', type=int, default=5)
+    argparser.add_argument('--stages', nargs='+', choices=tuple(STAGES), default=tuple(STAGES))
+    args = argparser.parse_args()
+
+    expressions = generate_expressions(args.seed, args.expressions, args.depth)
+    print(report(benchmark(args.stages, expressions, args.repeat)))
+
+if __name__ == '__main__':
+    main()
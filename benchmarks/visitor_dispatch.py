@@ -0,0 +1,98 @@
+"""
+Per-visit cost of NodeVisitor dispatch
+
+Runs SemanticAnalyzer and Interpreter over the same program with the
+string-built getattr dispatch and with the per-class dispatch table,
+and prints the time per visited node of each.
+
+    python -m benchmarks.visitor_dispatch --calls 2000 --repeat 5
+"""
+
+import argparse
+import timeit
+from interpreter.ex19 import Lexer, Parser, SemanticAnalyzer, Interpreter
+from .backends import build_program
+
+
+class GetattrDispatch:
+    # NodeVisitor.visit as it was before the dispatch table
+    def visit(self, node):
+        method_name = 'visit_' + type(node).__name__
+        visitor = getattr(self, method_name, self.generic_visit)
+        return visitor(node)
+
+class GetattrSemanticAnalyzer(GetattrDispatch, SemanticAnalyzer):
+    pass
+
+class GetattrInterpreter(GetattrDispatch, Interpreter):
+    pass
+
+
+class CountingDispatch:
+    visits = 0
+
+    def visit(self, node):
+        CountingDispatch.visits += 1
+        return super().visit(node)
+
+class CountingSemanticAnalyzer(CountingDispatch, SemanticAnalyzer):
+    pass
+
+class CountingInterpreter(CountingDispatch, Interpreter):
+    pass
+
+
+def count_visits(run):
+    CountingDispatch.visits = 0
+    run()
+    return CountingDispatch.visits
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    argparser.add_argument('--calls', type=int, default=2000)
+    argparser.add_argument('--repeat', type=int, default=5)
+    args = argparser.parse_args()
+
+    text = build_program(args.calls)
+    parse = lambda: Parser(Lexer(text)).parse()
+    tree = parse()
+    SemanticAnalyzer().visit(tree)
+
+    # the analyzer annotates the tree it visits, so every run gets a
+    # freshly parsed one
+    trees = {}
+
+    def analyze(cls):
+        def setup():
+            trees[cls] = parse()
+        def run():
+            cls().visit(trees[cls])
+        return setup, run
+
+    def interpret(cls):
+        return (lambda: None), (lambda: cls(tree).interpret())
+
+    stages = (
+            ('SemanticAnalyzer', analyze, CountingSemanticAnalyzer, GetattrSemanticAnalyzer, SemanticAnalyzer),
+            ('Interpreter', interpret, CountingInterpreter, GetattrInterpreter, Interpreter),
+            )
+
+    for name, bench, counting, before, after in stages:
+        setup, run = bench(counting)
+        setup()
+        visits = count_visits(run)
+        results = []
+
+        for cls in (before, after):
+            setup, run = bench(cls)
+            times = []
+            for _ in range(args.repeat):
+                setup()
+                times.append(timeit.timeit(run, number=1))
+            results.append(min(times) / visits * 1e9)
+
+        print(f'{name:<16}: {visits} visits, getattr {results[0]:6.1f} ns/visit, '
+              f'table {results[1]:6.1f} ns/visit, {results[0] / results[1]:4.2f}x')
+
+if __name__ == '__main__':
+    main()
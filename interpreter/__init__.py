@@ -1 +1 @@
-from .ex19 import Interpreter, Lexer, Parser, SemanticAnalyzer, enable_log, main
+from .ex19 import Interpreter, Lexer, Parser, SemanticAnalyzer, Tracer, enable_log, main
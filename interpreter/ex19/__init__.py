@@ -1,7 +1,16 @@
 from .interpreter import Interpreter
+from .stack_interpreter import StackInterpreter
 from .lexer import Lexer
+from .token_buffer import TokenBuffer
 from .parser import Parser
 from .symbols import SemanticAnalyzer, enable_log
+from .tracer import Tracer
+from .optimizer import ConstantFolder
 from .ln_translator import LNTranslator
 from .rpn_translator import RPNTranslator
+from .compiler import Compiler
+from .vm import VM
+from .engine import Engine
+from .python_transpiler import PythonTranspiler
+from .program import CompiledProgram
 from .main import main
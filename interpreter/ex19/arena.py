@@ -0,0 +1,302 @@
+from array import array
+from . import ast
+
+NONE = -1
+
+
+class Arena:
+    """
+    Flat AST representation
+
+    Every node is a row of typed arrays:
+
+    kinds           -- node kind, index in VIEWS
+    a, b            -- child node indexes or list references, NONE if unused
+    c               -- operator code or index in payloads
+    lines, columns  -- source position of the node, 0 if unknown
+
+    Child lists live in lists as a length followed by the node indexes,
+    a list reference is the index of the length. Names, constants,
+    tokens and analysis annotations are kept in payloads, variable names
+    and constants are interned.
+
+    Nodes are read through views: lightweight objects of the ast node
+    classes that fetch their fields from the arrays, so every visitor
+    works over an arena the same way it works over a tree. Assigning a
+    child of a view stores the index of a view of the arena and appends
+    any other node as new rows, the rows it replaces are left unused.
+    """
+
+    def __init__(self):
+        self.kinds = array('B')
+        self.a = array('i')
+        self.b = array('i')
+        self.c = array('i')
+        self.lines = array('I')
+        self.columns = array('I')
+        self.lists = array('i')
+        self.payloads = []
+        self.interned = {}          # (type, value) -> index in payloads
+        self.root = None
+
+    def __len__(self):
+        return len(self.kinds)
+
+    @classmethod
+    def from_tree(cls, tree):
+        arena = cls()
+        arena.root = arena.view(arena.add(tree))
+        return arena
+
+    def view(self, index):
+        if index == NONE:
+            return None
+        return VIEWS[self.kinds[index]](self, index)
+
+    def views(self, ref):
+        count = self.lists[ref]
+        return [self.view(index) for index in self.lists[ref+1:ref+1+count]]
+
+    def payload(self, value):
+        self.payloads.append(value)
+        return len(self.payloads) - 1
+
+    def intern(self, value):
+        key = (type(value), value)
+        ref = self.interned.get(key)
+        if ref is None:
+            ref = self.interned[key] = self.payload(value)
+        return ref
+
+    def ref(self, node):
+        """
+        Returns the index of the node, appending it unless it is a view
+        of this arena
+        """
+
+        if self.owns(node):
+            return node.index
+        return self.add(node)
+
+    def owns(self, node):
+        return isinstance(node, View) and node.arena is self
+
+    def add_list(self, nodes):
+        indexes = [self.ref(node) for node in nodes]
+        ref = len(self.lists)
+        self.lists.append(len(indexes))
+        self.lists.extend(indexes)
+        return ref
+
+    def add(self, node):
+        """
+        Appends the node and its subtree, returns the node index
+        """
+
+        kind = KIND_CODES[type(node).__name__]
+        a = b = c = NONE
+        lineno = column = 0
+
+        if kind == BINOP:
+            # the chain of left operands is added in a loop, long chains
+            # take no Python frame per term
+            chain = []
+            while isinstance(node, ast.BinOp) and not self.owns(node):
+                chain.append(node)
+                node = node.left
+
+            index = self.ref(node)
+            for node in reversed(chain):
+                index = self.append(BINOP, index, self.ref(node.right), node.op,
+                        node.lineno, node.column)
+            return index
+        elif kind == UNOP:
+            a, c = self.ref(node.factor), node.op
+            lineno, column = node.lineno, node.column
+        elif kind == VAR:
+            b, c = self.payload(node.address), self.intern(node.name)
+            lineno, column = node.lineno, node.column
+        elif kind == NUM:
+            c = self.intern(node.value)
+        elif kind == ASSIGN:
+            a, b, c = self.ref(node.left), self.ref(node.right), self.payload(node.token)
+        elif kind == COMPOUND:
+            a = self.add_list(node.leaves)
+        elif kind == PROC_CALL:
+            a = self.add_list(node.actual_params)
+            c = self.payload((node.name, node.token, node.symbol))
+            lineno, column = node.token.lineno or 0, node.token.column or 0
+        elif kind == BLOCK:
+            a = self.add_list(node.declarations)
+            b = self.ref(node.compound_statement)
+            c = self.payload(node.slot_names)
+        elif kind == PROGRAM:
+            a, b = self.ref(node.variable), self.ref(node.block)
+        elif kind == VAR_DECL:
+            a, b = self.ref(node.name), self.ref(node.type)
+        elif kind == PROC_DECL:
+            a, b = self.add_list(node.params), self.ref(node.body)
+            c = self.payload(node.name)
+        elif kind == PARAM:
+            a, b = self.ref(node.var_node), self.ref(node.type_node)
+        elif kind == TYPE:
+            c = self.payload(node.token)
+
+        return self.append(kind, a, b, c, lineno, column)
+
+    def append(self, kind, a, b, c, lineno, column):
+        index = len(self.kinds)
+        self.kinds.append(kind)
+        self.a.append(a)
+        self.b.append(b)
+        self.c.append(c)
+        self.lines.append(lineno)
+        self.columns.append(column)
+        return index
+
+
+# Views region {{{
+def child(column):
+    def getter(self):
+        return self.arena.view(getattr(self.arena, column)[self.index])
+
+    def setter(self, node):
+        getattr(self.arena, column)[self.index] = self.arena.ref(node)
+
+    return property(getter, setter)
+
+def child_list(column):
+    def getter(self):
+        return self.arena.views(getattr(self.arena, column)[self.index])
+
+    def setter(self, nodes):
+        getattr(self.arena, column)[self.index] = self.arena.add_list(nodes)
+
+    return property(getter, setter)
+
+def field(column):
+    return property(lambda self: getattr(self.arena, column)[self.index])
+
+def interned_field(column):
+    return property(lambda self: self.arena.payloads[getattr(self.arena, column)[self.index]])
+
+def payload_field(column, item=None):
+    def getter(self):
+        value = self.arena.payloads[getattr(self.arena, column)[self.index]]
+        return value if item is None else value[item]
+
+    def setter(self, value):
+        ref = getattr(self.arena, column)[self.index]
+        if item is None:
+            self.arena.payloads[ref] = value
+        else:
+            values = list(self.arena.payloads[ref])
+            values[item] = value
+            self.arena.payloads[ref] = tuple(values)
+
+    return property(getter, setter)
+
+
+class View:
+    __slots__ = ()
+
+    def __init__(self, arena, index):
+        self.arena = arena
+        self.index = index
+
+    def __eq__(self, other):
+        return (type(self) is type(other) and
+                self.arena is other.arena and
+                self.index == other.index)
+
+    def __hash__(self):
+        return hash((id(self.arena), self.index))
+
+
+# Every view subclasses the matching node class, so isinstance checks and
+# visit_<ClassName> dispatch see an ordinary node.
+class Program(View, ast.Program):
+    __slots__ = ('arena', 'index')
+    variable = child('a')
+    block = child('b')
+
+class Block(View, ast.Block):
+    __slots__ = ('arena', 'index')
+    declarations = child_list('a')
+    compound_statement = child('b')
+    slot_names = payload_field('c')
+
+class VarDecl(View, ast.VarDecl):
+    __slots__ = ('arena', 'index')
+    name = child('a')
+    type = child('b')
+
+class ProcDecl(View, ast.ProcDecl):
+    __slots__ = ('arena', 'index')
+    params = child_list('a')
+    body = child('b')
+    name = payload_field('c')
+
+class ProcCall(View, ast.ProcCall):
+    __slots__ = ('arena', 'index')
+    actual_params = child_list('a')
+    name = payload_field('c', 0)
+    token = payload_field('c', 1)
+    symbol = payload_field('c', 2)
+
+class Param(View, ast.Param):
+    __slots__ = ('arena', 'index')
+    var_node = child('a')
+    type_node = child('b')
+
+class Type(View, ast.Type):
+    __slots__ = ('arena', 'index')
+    token = payload_field('c')
+
+class Compound(View, ast.Compound):
+    __slots__ = ('arena', 'index')
+    leaves = child_list('a')
+
+class Assign(View, ast.Assign):
+    __slots__ = ('arena', 'index')
+    left = child('a')
+    right = child('b')
+    token = payload_field('c')
+
+class Var(View, ast.Var):
+    __slots__ = ('arena', 'index')
+    address = payload_field('b')
+    name = interned_field('c')
+    lineno = field('lines')
+    column = field('columns')
+
+class BinOp(View, ast.BinOp):
+    __slots__ = ('arena', 'index')
+    left = child('a')
+    right = child('b')
+    op = field('c')
+    lineno = field('lines')
+    column = field('columns')
+
+class UnOp(View, ast.UnOp):
+    __slots__ = ('arena', 'index')
+    factor = child('a')
+    op = field('c')
+    lineno = field('lines')
+    column = field('columns')
+
+class Num(View, ast.Num):
+    __slots__ = ('arena', 'index')
+    value = interned_field('c')
+
+class NoOp(View, ast.NoOp):
+    __slots__ = ('arena', 'index')
+# }}}
+
+
+VIEWS = (Program, Block, VarDecl, ProcDecl, ProcCall, Param, Type,
+         Compound, Assign, Var, BinOp, UnOp, Num, NoOp)
+KIND_CODES = {view.__name__: kind for kind, view in enumerate(VIEWS)}
+
+(PROGRAM, BLOCK, VAR_DECL, PROC_DECL, PROC_CALL, PARAM, TYPE,
+ COMPOUND, ASSIGN, VAR, BINOP, UNOP, NUM, NOOP) = range(len(VIEWS))
@@ -1,17 +1,52 @@
+from .token_type import TokenType
+from .token import Token
+
+# operator codes of BinOp and UnOp nodes
+OP_PLUS = 0
+OP_MINUS = 1
+OP_MUL = 2
+OP_INTEGER_DIV = 3
+OP_FLOAT_DIV = 4
+
+OP_TOKEN_TYPES = (
+        TokenType.PLUS,
+        TokenType.MINUS,
+        TokenType.MUL,
+        TokenType.INTEGER_DIV,
+        TokenType.FLOAT_DIV,
+        )
+OP_CODES = {tok_type: op for op, tok_type in enumerate(OP_TOKEN_TYPES)}
+
+
 class Ast():
-    pass
+    __slots__ = ()
 
 class Program(Ast):
+    __slots__ = ('variable', 'block')
+
     def __init__(self, variable, block):
         self.variable = variable
         self.block = block
-        
+
 class Block(Ast):
+    """
+    A block node
+
+    declarations        -- variable and procedure declarations
+    compound_statement  -- block`s body
+    slot_names          -- names of the frame slots, set by SemanticAnalyzer
+    """
+
+    __slots__ = ('declarations', 'compound_statement', 'slot_names')
+
     def __init__(self, declarations, compound_statement):
         self.declarations = declarations
         self.compound_statement = compound_statement
+        self.slot_names = None
 
 class VarDecl(Ast):
+    __slots__ = ('name', 'type')
+
     def __init__(self, name, type):
         self.name = name
         self.type = type
@@ -25,6 +60,8 @@ class ProcDecl(Ast):
     body    -- procedure`s body
     """
 
+    __slots__ = ('name', 'params', 'body')
+
     def __init__(self, name, body, params=[]):
         self.name = name
         self.params = params
@@ -39,6 +76,9 @@ class ProcCall(Ast):
     token   -- associated token
     symbol  -- associated procedure symbol
     """
+
+    __slots__ = ('name', 'actual_params', 'token', 'symbol')
+
     def __init__(self, name, actual_params, token):
         self.name = name
         self.actual_params = actual_params
@@ -53,11 +93,15 @@ class Param(Ast):
     type_node   -- node that represents variable type
     """
 
+    __slots__ = ('var_node', 'type_node')
+
     def __init__(self, var_node, type_node):
         self.var_node = var_node
         self.type_node = type_node
 
 class Type(Ast):
+    __slots__ = ('token',)
+
     def __init__(self, token):
         self.token = token
 
@@ -66,33 +110,109 @@ class Compound(Ast):
     Represents a 'BEGIN ... END' block
     """
 
+    __slots__ = ('leaves',)
+
     def __init__(self):
         self.leaves = list()
 
 class Assign(Ast):
+    __slots__ = ('left', 'token', 'right')
+
     def __init__(self, left, token, right):
         self.left = left
         self.right = right
         self.token = token
 
 class Var(Ast):
+    """
+    A variable node
+
+    name            -- variable`s identifier
+    lineno, column  -- position of the identifier
+    address         -- (nesting level, slot index) pair, set by SemanticAnalyzer
+
+    The token is rebuilt on demand, the node doesn't keep it.
+    """
+
+    __slots__ = ('name', 'lineno', 'column', 'address')
+
     def __init__(self, token):
-        self.token = token
+        self.name = token.value
+        self.lineno = token.lineno
+        self.column = token.column
+        self.address = None
+
+    @property
+    def token(self):
+        return Token(TokenType.ID, self.name, self.lineno, self.column)
 
 class BinOp(Ast):
+    """
+    A binary operation node
+
+    op              -- operator code, one of OP_* constants
+    lineno, column  -- position of the operator
+    """
+
+    __slots__ = ('left', 'op', 'right', 'lineno', 'column')
+
     def __init__(self, left, token, right):
         self.left = left
-        self.token = token
+        self.op = OP_CODES[token.type]
         self.right = right
+        self.lineno = token.lineno
+        self.column = token.column
+
+    @property
+    def token(self):
+        tok_type = OP_TOKEN_TYPES[self.op]
+        return Token(tok_type, tok_type.value, self.lineno, self.column)
 
 class UnOp(Ast):
+    """
+    An unary operation node
+
+    op              -- operator code, OP_PLUS or OP_MINUS
+    lineno, column  -- position of the operator
+    """
+
+    __slots__ = ('op', 'factor', 'lineno', 'column')
+
     def __init__(self, token, factor):
-        self.token = token
+        self.op = OP_CODES[token.type]
         self.factor = factor
+        self.lineno = token.lineno
+        self.column = token.column
+
+    @property
+    def token(self):
+        tok_type = OP_TOKEN_TYPES[self.op]
+        return Token(tok_type, tok_type.value, self.lineno, self.column)
 
 class Num(Ast):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value
 
 class NoOp(Ast):
-    pass
+    __slots__ = ()
+
+
+def left_chain(node):
+    """
+    Returns the leftmost operand of the BinOp chain hanging from the
+    node's left operands and the BinOps of the chain, the innermost
+    first
+
+    Pascal operators are left associative, so a + b + ... + z nests on
+    the left only. Walks looping over the chain take no Python frame
+    per term however long the expression.
+    """
+
+    chain = []
+    while isinstance(node, BinOp):
+        chain.append(node)
+        node = node.left
+    chain.reverse()
+    return node, chain
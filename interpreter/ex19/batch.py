@@ -0,0 +1,113 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .lexer import Lexer
+from .parser import Parser
+from .symbols import SemanticAnalyzer
+from .interpreter import Interpreter
+from .error import error_as_dict
+
+MAX_CHUNK_SIZE = 32
+
+
+def find_programs(directory):
+    """
+    Returns the paths of the .pas files under the directory, sorted
+    """
+
+    return sorted(glob.glob(os.path.join(directory, '**', '*.pas'), recursive=True))
+
+def run_file(path):
+    """
+    Runs the program of the file through the whole pipeline, returns its
+    JSON result line as a dict
+
+    Runs in the worker processes, every error is part of the result.
+    """
+
+    start = time.perf_counter()
+
+    try:
+        with open(path) as f:
+            source_code = f.read()
+
+        tree = Parser(Lexer(source_code)).parse()
+        SemanticAnalyzer().visit(tree)
+        interpreter = Interpreter(tree)
+        interpreter.interpret()
+
+        ar = interpreter.ar
+        result = {'file': path, 'ok': True, 'globals': dict(zip(ar.slot_names, ar.slots))}
+    except Exception as e:
+        result = {'file': path, 'ok': False, 'error': error_as_dict(e)}
+
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+def run_files(paths):
+    return [run_file(path) for path in paths]
+
+def run_batch(paths, jobs=None, output=sys.stdout):
+    """
+    Runs the files on a pool of jobs worker processes, writes a JSON line
+    per file as it completes, returns the (ok, failed) counts
+
+    The workers live for the whole batch, each one runs many files with
+    the pipeline modules already imported. Files are sent in chunks, a
+    task per small file would cost more in interprocess traffic than
+    running it, but in at least four chunks per worker so the workers
+    stay evenly loaded and results keep streaming.
+    """
+
+    jobs = jobs or os.cpu_count() or 1
+    chunk_size = max(1, min(MAX_CHUNK_SIZE, len(paths) // (jobs * 4)))
+    ok = failed = 0
+
+    with ProcessPoolExecutor(jobs) as executor:
+        futures = [executor.submit(run_files, paths[i:i + chunk_size])
+                for i in range(0, len(paths), chunk_size)]
+
+        for future in as_completed(futures):
+            for result in future.result():
+                if result['ok']:
+                    ok += 1
+                else:
+                    failed += 1
+                output.write(json.dumps(result) + '\n')
+            output.flush()
+
+    return ok, failed
+
+def main(argv=None):
+    argparser = argparse.ArgumentParser(
+            prog='interpreter batch',
+            description='Run every Pascal program of a directory')
+    argparser.add_argument(
+            'directory',
+            help='Directory searched for .pas files, recursively')
+    argparser.add_argument(
+            '--jobs',
+            help='Worker processes, the number of CPUs by default',
+            type=int)
+
+    args = argparser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        argparser.error(f'{args.directory} is not a directory')
+
+    paths = find_programs(args.directory)
+
+    start = time.perf_counter()
+    ok, failed = run_batch(paths, args.jobs)
+    elapsed = time.perf_counter() - start
+
+    rate = len(paths) / elapsed if elapsed else 0.0
+    print(f'{len(paths)} files, {ok} ok, {failed} failed in {elapsed:.3f} s '
+          f'({rate:.1f} files/s)', file=sys.stderr)
+
+    if failed:
+        sys.exit(1)
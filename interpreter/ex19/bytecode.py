@@ -0,0 +1,99 @@
+from enum import IntEnum
+
+class OpCode(IntEnum):
+    """
+    Stack machine instructions
+
+    Every instruction is a single opcode word followed by its operands,
+    all of them stored flat in Bytecode.code.
+    """
+
+    LOAD_CONST = 1      # const_index       -> push consts[const_index]
+    LOAD_LOCAL = 2      # slot              -> push frame[slot]
+    STORE_LOCAL = 3     # slot              -> frame[slot] = pop()
+    LOAD_VAR = 4        # level slot        -> push display[level][slot]
+    STORE_VAR = 5       # level slot        -> display[level][slot] = pop()
+    ADD = 6
+    SUB = 7
+    MUL = 8
+    INTEGER_DIV = 9
+    FLOAT_DIV = 10
+    NEG = 11
+    CALL = 12           # proc_index argc
+    RET = 13
+    HALT = 14
+
+
+OPERANDS_COUNT = {
+        OpCode.LOAD_CONST: 1,
+        OpCode.LOAD_LOCAL: 1,
+        OpCode.STORE_LOCAL: 1,
+        OpCode.LOAD_VAR: 2,
+        OpCode.STORE_VAR: 2,
+        OpCode.CALL: 2,
+        }
+
+
+class Procedure:
+    """
+    Compiled procedure descriptor
+
+    name        -- procedure`s identifier
+    level       -- nesting level of the procedure`s own frame
+    slot_names  -- frame slot names, formal params come first
+    entry       -- address of the first instruction of the body
+    """
+
+    def __init__(self, name, level, slot_names, entry=None):
+        self.name = name
+        self.level = level
+        self.slot_names = slot_names
+        self.entry = entry
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}(name="{self.name}", level={self.level}, entry={self.entry})>'
+
+
+class Bytecode:
+    """
+    A compiled program
+
+    code        -- flat list of opcodes and operands
+    consts      -- constants pool
+    procs       -- procedure descriptors indexed by CALL
+    main        -- descriptor of the program`s global frame
+    names       -- variable names of load instructions by address,
+                   used to report uninitialized variables
+    """
+
+    def __init__(self, code, consts, procs, main, names):
+        self.code = code
+        self.consts = consts
+        self.procs = procs
+        self.main = main
+        self.names = names
+
+    def disassemble(self):
+        lines = []
+        entries = {proc.entry: proc.name for proc in self.procs}
+        entries[0] = self.main.name
+        pc = 0
+
+        while pc < len(self.code):
+            if pc in entries:
+                lines.append(f'{entries[pc]}:')
+
+            op = OpCode(self.code[pc])
+            count = OPERANDS_COUNT.get(op, 0)
+            operands = self.code[pc+1:pc+1+count]
+            line = f'{pc:>6} {op.name:<12} ' + ' '.join(str(x) for x in operands)
+
+            if op == OpCode.LOAD_CONST:
+                line += f' ({self.consts[operands[0]]!r})'
+            elif op == OpCode.CALL:
+                line += f' ({self.procs[operands[0]].name})'
+
+            lines.append(line.rstrip())
+            pc += count + 1
+
+        return '\n'.join(lines)
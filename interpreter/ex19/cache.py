@@ -0,0 +1,122 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+# bump whenever the shape of the analyzed AST changes
+FORMAT_VERSION = 3
+INTERPRETER_VERSION = '0.1.0'
+
+CACHE_SUFFIX = '.pasc'
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+def default_cache_dir():
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'pascal-interpreter')
+
+
+class CompileCache:
+    """
+    Content addressed cache of analyzed programs
+
+    Every entry is a pickled AST stored in a '.pasc' file named by the
+    hash of the source text, the interpreter and format versions and
+    the Python version, so changing any of them invalidates the entry.
+    Loading an entry refreshes its modification time, the least
+    recently used entries are evicted once the cache outgrows max_size.
+
+    directory   -- cache directory, created on the first store
+    max_size    -- total size limit of the entries in bytes
+    """
+
+    def __init__(self, directory=None, max_size=DEFAULT_MAX_SIZE):
+        self.directory = directory or default_cache_dir()
+        self.max_size = max_size
+
+    def key(self, source):
+        header = f'{INTERPRETER_VERSION}:{FORMAT_VERSION}:{sys.version_info[0]}.{sys.version_info[1]}:'
+        return hashlib.sha256(header.encode() + source.encode()).hexdigest()
+
+    def path(self, source):
+        return os.path.join(self.directory, self.key(source) + CACHE_SUFFIX)
+
+    def load(self, source):
+        """
+        Returns the cached analyzed AST of the source or None
+        """
+
+        path = self.path(source)
+
+        try:
+            with open(path, 'rb') as f:
+                key, tree = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # a truncated or otherwise unreadable entry is dropped
+            self.remove(path)
+            return None
+
+        if key != self.key(source):
+            self.remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return tree
+
+    def store(self, source, tree):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump((self.key(source), tree), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path(source))
+        except (OSError, pickle.PicklingError, RecursionError):
+            # caching is an optimization, a program that can't be stored
+            # is simply compiled again next time
+            self.remove(tmp_path)
+            return False
+
+        self.evict()
+        return True
+
+    def entries(self):
+        """
+        Returns (mtime, size, path) of every entry, oldest first
+        """
+
+        ret = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(CACHE_SUFFIX):
+                stat = entry.stat()
+                ret.append((stat.st_mtime, stat.st_size, entry.path))
+        ret.sort()
+        return ret
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            self.remove(path)
+            total -= size
+
+    def clear(self):
+        if os.path.isdir(self.directory):
+            for _, _, path in self.entries():
+                self.remove(path)
+
+    @staticmethod
+    def remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,143 @@
+from collections import deque
+from .visitor import NodeVisitor
+from .bytecode import OpCode, Procedure, Bytecode
+from .ast import *
+
+BINARY_OPCODES = {
+        OP_PLUS: OpCode.ADD,
+        OP_MINUS: OpCode.SUB,
+        OP_MUL: OpCode.MUL,
+        OP_INTEGER_DIV: OpCode.INTEGER_DIV,
+        OP_FLOAT_DIV: OpCode.FLOAT_DIV,
+        }
+
+
+class Compiler(NodeVisitor):
+    """
+    Lowers an analyzed AST into a linear bytecode for the VM
+
+    The tree must have been visited by SemanticAnalyzer beforehand:
+    variables are addressed through Var.address and procedure calls
+    are bound through ProcCall.symbol.
+    """
+
+    def __init__(self):
+        self.code = []
+        self.consts = []
+        self.const_index = {}
+        self.procs = []
+        self.proc_index = {}        # procedure body -> index in self.procs
+        self.pending = deque()      # procedures waiting for their bodies
+        self.names = {}
+        self.level = None
+
+    def compile(self, tree):
+        self.visit(tree)
+
+        while self.pending:
+            proc, body = self.pending.popleft()
+            self.level = proc.level
+            proc.entry = len(self.code)
+            self.visit(body)
+            self.emit(OpCode.RET)
+
+        return Bytecode(
+                code=self.code,
+                consts=self.consts,
+                procs=self.procs,
+                main=self.main,
+                names=self.names,
+                )
+
+    def emit(self, *words):
+        self.code.extend(int(word) for word in words)
+
+    def emit_const(self, value):
+        key = (type(value), value)
+        index = self.const_index.get(key)
+
+        if index is None:
+            index = len(self.consts)
+            self.consts.append(value)
+            self.const_index[key] = index
+
+        self.emit(OpCode.LOAD_CONST, index)
+
+    def visit_Program(self, node):
+        self.level = 1
+        self.main = Procedure(
+                name=node.variable.name,
+                level=1,
+                slot_names=node.block.slot_names,
+                entry=0)
+        self.visit(node.block)
+        self.emit(OpCode.HALT)
+
+    def visit_Block(self, node):
+        for decl in node.declarations:
+            self.visit(decl)
+        self.visit(node.compound_statement)
+
+    def visit_VarDecl(self, node):
+        pass
+
+    def visit_ProcDecl(self, node):
+        proc = Procedure(
+                name=node.name,
+                level=self.level+1,
+                slot_names=node.body.slot_names)
+        self.proc_index[node.body] = len(self.procs)
+        self.procs.append(proc)
+        self.pending.append((proc, node.body))
+
+    def visit_ProcCall(self, node):
+        for argument_node in node.actual_params:
+            self.visit(argument_node)
+
+        index = self.proc_index[node.symbol.body]
+        self.emit(OpCode.CALL, index, len(node.actual_params))
+
+    def visit_Type(self, node):
+        pass
+
+    def visit_Compound(self, node):
+        for leaf in node.leaves:
+            self.visit(leaf)
+
+    def visit_Assign(self, node):
+        self.visit(node.right)
+        level, slot = node.left.address
+
+        if level == self.level:
+            self.emit(OpCode.STORE_LOCAL, slot)
+        else:
+            self.emit(OpCode.STORE_VAR, level, slot)
+
+    def visit_Var(self, node):
+        level, slot = node.address
+        self.names[len(self.code)] = node.name
+
+        if level == self.level:
+            self.emit(OpCode.LOAD_LOCAL, slot)
+        else:
+            self.emit(OpCode.LOAD_VAR, level, slot)
+
+    def visit_NoOp(self, node):
+        pass
+
+    def visit_BinOp(self, node):
+        # a chain of left operands is emitted in a loop, long chains
+        # take no Python frame per term
+        first, chain = left_chain(node)
+        self.visit(first)
+        for node in chain:
+            self.visit(node.right)
+            self.emit(BINARY_OPCODES[node.op])
+
+    def visit_Num(self, node):
+        self.emit_const(node.value)
+
+    def visit_UnOp(self, node):
+        self.visit(node.factor)
+        if node.op == OP_MINUS:
+            self.emit(OpCode.NEG)
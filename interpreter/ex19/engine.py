@@ -0,0 +1,195 @@
+import operator
+from .visitor import NodeVisitor
+from .symbols import SemanticAnalyzer
+from .ast import *
+
+# a chain of left operands longer than this compiles into one closure
+# looping over the chain, shorter ones nest a closure per operation
+MAX_NESTED_CHAIN = 32
+
+# Python operator of every operator code
+CHAIN_OPERATORS = (
+        operator.add,
+        operator.sub,
+        operator.mul,
+        operator.floordiv,
+        operator.truediv,
+        )
+
+
+class Engine(NodeVisitor):
+    """
+    Closure compiling execution engine
+
+    Every node is turned once into a Python closure specialized for
+    the node's operator and operands. A closure takes the display,
+    the list of innermost frames indexed by nesting level, so running
+    the program is a chain of plain function calls.
+    """
+
+    def __init__(self, ast):
+        self.ast = ast
+        self.globals = None
+        self.program = None
+        self.bodies = {}        # procedure body -> [compiled body]
+        self.max_level = 1
+        self.level = None
+
+    def compile(self):
+        if self.program is None:
+            if self.ast.block.slot_names is None:
+                SemanticAnalyzer().visit(self.ast)
+            self.program = self.visit(self.ast)
+        return self.program
+
+    def get_var_value(self, var_name):
+        var_name = var_name.upper()
+        slot_names = self.ast.block.slot_names
+        if var_name not in slot_names:
+            return None
+        return self.globals[slot_names.index(var_name)]
+
+    def interpret(self):
+        program = self.compile()
+        display = [None] * (self.max_level + 1)
+        self.globals = display[1] = [None] * len(self.ast.block.slot_names)
+        program(display)
+
+    def visit_Program(self, node):
+        self.level = 1
+        return self.visit(node.block)
+
+    def visit_Block(self, node):
+        # declarations do not produce code, procedures are compiled
+        # on their first call site
+        return self.visit(node.compound_statement)
+
+    def visit_ProcCall(self, node):
+        proc_symbol = node.symbol
+        body = proc_symbol.body
+        level = proc_symbol.scope_level + 1
+        padding = [None] * (len(body.slot_names) - len(node.actual_params))
+        args = tuple(self.visit(param) for param in node.actual_params)
+        cell = self.compile_body(body, level)
+
+        def call(d):
+            frame = [arg(d) for arg in args]
+            frame.extend(padding)
+            saved = d[level]
+            d[level] = frame
+            cell[0](d)
+            d[level] = saved
+
+        return call
+
+    def compile_body(self, body, level):
+        cell = self.bodies.get(body)
+
+        if cell is None:
+            # the cell is registered before compiling so that recursive
+            # calls inside the body can refer to it
+            cell = self.bodies[body] = [None]
+            caller_level = self.level
+            self.level = level
+            self.max_level = max(self.max_level, level)
+            cell[0] = self.visit(body)
+            self.level = caller_level
+
+        return cell
+
+    def visit_Compound(self, node):
+        stmts = tuple(self.visit(leaf) for leaf in node.leaves
+                if not isinstance(leaf, NoOp))
+
+        if len(stmts) == 1:
+            return stmts[0]
+
+        def compound(d):
+            for stmt in stmts:
+                stmt(d)
+
+        return compound
+
+    def visit_NoOp(self, node):
+        return lambda d: None
+
+    def visit_Assign(self, node):
+        level, slot = node.left.address
+        expr = self.visit(node.right)
+
+        def assign(d):
+            d[level][slot] = expr(d)
+
+        return assign
+
+    def visit_Var(self, node):
+        level, slot = node.address
+        var_nam = node.name
+
+        def var(d):
+            var_val = d[level][slot]
+            if var_val is None:
+                raise NameError(repr(var_nam))
+            return var_val
+
+        return var
+
+    def visit_Num(self, node):
+        value = node.value
+        return lambda d: value
+
+    def visit_BinOp(self, node):
+        left = node.left
+        length = 1
+        while isinstance(left, BinOp) and length <= MAX_NESTED_CHAIN:
+            left = left.left
+            length += 1
+        if length > MAX_NESTED_CHAIN:
+            return self.compile_chain(node)
+
+        l = self.visit(node.left)
+        op = node.op
+
+        if isinstance(node.right, Num):
+            c = node.right.value
+            if op == OP_PLUS:
+                return lambda d: l(d) + c
+            elif op == OP_MINUS:
+                return lambda d: l(d) - c
+            elif op == OP_MUL:
+                return lambda d: l(d) * c
+            elif op == OP_INTEGER_DIV:
+                return lambda d: l(d) // c
+            elif op == OP_FLOAT_DIV:
+                return lambda d: l(d) / c
+
+        r = self.visit(node.right)
+        if op == OP_PLUS:
+            return lambda d: l(d) + r(d)
+        elif op == OP_MINUS:
+            return lambda d: l(d) - r(d)
+        elif op == OP_MUL:
+            return lambda d: l(d) * r(d)
+        elif op == OP_INTEGER_DIV:
+            return lambda d: l(d) // r(d)
+        elif op == OP_FLOAT_DIV:
+            return lambda d: l(d) / r(d)
+
+    def compile_chain(self, node):
+        first, chain = left_chain(node)
+        first = self.visit(first)
+        steps = tuple((CHAIN_OPERATORS[node.op], self.visit(node.right)) for node in chain)
+
+        def chain(d):
+            value = first(d)
+            for apply, right in steps:
+                value = apply(value, right(d))
+            return value
+
+        return chain
+
+    def visit_UnOp(self, node):
+        factor = self.visit(node.factor)
+        if node.op == OP_MINUS:
+            return lambda d: -factor(d)
+        return factor
@@ -6,12 +6,30 @@ class ErrorCode(Enum):
     ID_NOT_FOUND = 'Identifier not found'
     DUPLICATE_ID = 'Duplicate id found'
     PARAMS_COUNT_MISMATCH = 'Number of actual and formal parameters are not equal'
+    EXPR_TOO_DEEP = 'Expression nesting is too deep'
+    UNINITIALIZED_VAR = 'Variable used before assignment'
+    RUNTIME_ERROR = 'Runtime error'
+    COMPILE_ERROR = 'Python compile error'
+    CALL_DEPTH_EXCEEDED = 'Maximum call depth exceeded'
+    STEP_BUDGET_EXCEEDED = 'Step budget exceeded'
+    DEADLINE_EXCEEDED = 'Deadline exceeded'
 
 class Error(Exception):
     def __init__(self, error_code: ErrorCode=None, token: Token=None, message: str=None):
         super().__init__(f'{self.__class__.__name__}: {message}')
         self.error_code = error_code
         self.token = token
+        self.message = message
+
+    def as_dict(self):
+        token = self.token
+        return {
+                'type': self.__class__.__name__,
+                'code': self.error_code.value if self.error_code else None,
+                'message': self.message,
+                'line': token.lineno if token else None,
+                'column': token.column if token else None,
+                }
 
 class LexerError(Error):
     pass
@@ -21,3 +39,26 @@ class ParserError(Error):
 
 class SemanticError(Error):
     pass
+
+class InterpreterError(Error):
+    pass
+
+class LimitExceededError(InterpreterError):
+    def __init__(self, error_code: ErrorCode=None, token: Token=None, message: str=None, call_stack=()):
+        super().__init__(error_code, token, message)
+        self.call_stack = list(call_stack)      # procedure names, the program first
+
+    def as_dict(self):
+        ret = super().as_dict()
+        ret['call_stack'] = self.call_stack
+        return ret
+
+
+def error_as_dict(e):
+    """
+    Returns the JSON form of an error raised running a program
+    """
+
+    if isinstance(e, Error):
+        return e.as_dict()
+    return {'type': e.__class__.__name__, 'message': str(e)}
@@ -1,36 +1,96 @@
+import time
+import warnings
 from .visitor import NodeVisitor
-from .token_type import TokenType
 from .memory import CallStack, ActivationRecord, ARType
+from .symbols import SemanticAnalyzer
+from .error import InterpreterError, LimitExceededError, ErrorCode
+from .tracer import NULL_TRACER
 from .ast import *
 
-SHOULD_LOG_STACK = False
+# statements run between two reads of the clock
+DEADLINE_CHECK_INTERVAL = 1000
 
 def enable_log():
-    global SHOULD_LOG_STACK
-    SHOULD_LOG_STACK = True
+    """
+    Deprecated, stack logging is enabled per interpreter by its tracer
+    """
+
+    warnings.warn(
+            'enable_log() has no effect, pass a tracer to the interpreter: '
+            'Interpreter(tree, tracer=Tracer(sys.stdout))',
+            DeprecationWarning,
+            stacklevel=2,
+            )
 
 class Interpreter(NodeVisitor):
-    def __init__(self, ast):
+    """
+    Tree-walking interpreter
+
+    A run can be limited to max_steps statements and to a deadline, a
+    time.monotonic() value. Every statement counts down to the next
+    check of the limits, which reads the clock every
+    DEADLINE_CHECK_INTERVAL statements. Past a limit the run stops with
+    LimitExceededError.
+
+    ast             -- analyzed program tree
+    initial_globals -- global variable name -> value assigned before the run
+    tracer          -- receiver of the call stack trace
+    max_steps       -- limit of statements run
+    deadline        -- time.monotonic() the run must end by
+    """
+
+    def __init__(self, ast, initial_globals=None, tracer=NULL_TRACER, max_steps=None, deadline=None):
         self.ast = ast
+        self.initial_globals = initial_globals
+        self.tracer = tracer
+        self.max_steps = max_steps
+        self.deadline = deadline
+        self.steps = 0                  # statements run up to the last check
+        self.period = 0                 # statements between the last two checks
+        self.countdown = -1             # statements to the next check, never reached when -1
         self.call_stack = CallStack()
+        self.display = None             # display of the call stack
+        self.ar = None                  # program activation record
 
     def get_var_value(self, var_name):
         var_name = var_name.upper()
-        ar = self.call_stack.peek()
         return self.ar.get(var_name)
 
     def log(self, msg):
-        if SHOULD_LOG_STACK:
-            print(msg)
+        if self.tracer.enabled:
+            self.tracer.trace(msg)
 
-    def visit_Program(self, node):
-        program_name = node.variable.token.value
+    def program_record(self, node):
+        """
+        Returns the program activation record, the globals given to the
+        interpreter already assigned
+        """
 
         ar = ActivationRecord(
-                name=program_name,
+                name=node.variable.name,
                 type=ARType.PROGRAM,
-                nesting_level=1
+                nesting_level=1,
+                slot_names=node.block.slot_names,
                 )
+
+        if self.initial_globals:
+            for name, value in self.initial_globals.items():
+                key = name.upper()
+                if key not in ar.slot_names:
+                    raise InterpreterError(
+                            error_code=ErrorCode.ID_NOT_FOUND,
+                            message=f'{ErrorCode.ID_NOT_FOUND.value} -> {name} is not a global variable',
+                            )
+                ar[key] = value
+
+        return ar
+
+    def visit_Program(self, node):
+        program_name = node.variable.name
+
+        ar = self.program_record(node)
+        self.ar = ar
+        self.display = self.call_stack.display
         self.call_stack.push(ar)
 
         self.log(f'ENTER: PROGRAM {program_name}')
@@ -58,25 +118,30 @@ class Interpreter(NodeVisitor):
         proc_name = node.name
         proc_symbol = node.symbol
 
-        ar = ActivationRecord(
+        ar = self.call_stack.new_record(
+                key=proc_symbol,
                 name=proc_name,
-                type = ARType.PROCEDURE,
-                nesting_level=proc_symbol.scope_level+1,)
-
-        formal_params = proc_symbol.params
-        actual_params = node.actual_params
+                type=ARType.PROCEDURE,
+                nesting_level=proc_symbol.scope_level+1,
+                slot_names=proc_symbol.body.slot_names,
+                )
 
-        for param_symbol, argument_node in zip(formal_params, actual_params):
-            ar[param_symbol.name] = self.visit(argument_node)
+        # formal params occupy the first slots of the record
+        slots = ar.slots
+        for slot, argument_node in enumerate(node.actual_params):
+            slots[slot] = self.visit(argument_node)
 
+        tracer = self.tracer
         self.call_stack.push(ar)
-        self.log(f'ENTER: PROCEDURE {proc_name}')
-        self.log(self.call_stack)
+        if tracer.enabled:
+            tracer.trace(f'ENTER: PROCEDURE {proc_name}')
+            tracer.trace(self.call_stack)
 
         self.visit(proc_symbol.body)
 
-        self.log(f'LEAVE: PROCEDURE {proc_name}')
-        self.log(self.call_stack)
+        if tracer.enabled:
+            tracer.trace(f'LEAVE: PROCEDURE {proc_name}')
+            tracer.trace(self.call_stack)
         self.call_stack.pop()
 
     def visit_Type(self, node):
@@ -84,22 +149,22 @@ class Interpreter(NodeVisitor):
 
     def visit_Compound(self, node):
         for leaf in node.leaves:
+            self.countdown -= 1
+            if not self.countdown:
+                self.countdown = self.check_limits(leaf)
             self.visit(leaf)
 
     def visit_Assign(self, node):
-        var_tok = node.left.token
-        var_nam = var_tok.value
         var_val = self.visit(node.right)
-        ar = self.call_stack.peek()
-        ar[var_nam] = var_val
+        nesting_level, slot = node.left.address
+        self.display[nesting_level].slots[slot] = var_val
 
     def visit_Var(self, node):
-        ar = self.call_stack.peek()
-        var_nam = node.token.value
-        var_val = ar.get(var_nam)
+        nesting_level, slot = node.address
+        var_val = self.display[nesting_level].slots[slot]
 
         if var_val is None:
-            raise NameError(repr(var_nam))
+            raise NameError(repr(node.name))
         else:
             return var_val
 
@@ -107,26 +172,103 @@ class Interpreter(NodeVisitor):
         pass
 
     def visit_BinOp(self, node):
-        if node.token.type == TokenType.PLUS:
-            return self.visit(node.left) + self.visit(node.right)
-        elif node.token.type == TokenType.MINUS:
-            return self.visit(node.left) - self.visit(node.right)
-        elif node.token.type == TokenType.MUL:
-            return self.visit(node.left) * self.visit(node.right)
-        elif node.token.type == TokenType.INTEGER_DIV:
-            return self.visit(node.left) // self.visit(node.right)
-        elif node.token.type == TokenType.FLOAT_DIV:
-            return self.visit(node.left) / self.visit(node.right)
+        left = node.left
+        if isinstance(left, BinOp):
+            # the chain of left operands is evaluated in a loop, so a
+            # long a + b + ... + z takes no Python frame per term
+            first, chain = left_chain(node)
+            value = self.visit(first)
+
+            for node in chain:
+                right = self.visit(node.right)
+                op = node.op
+                if op == OP_PLUS:
+                    value = value + right
+                elif op == OP_MINUS:
+                    value = value - right
+                elif op == OP_MUL:
+                    value = value * right
+                elif op == OP_INTEGER_DIV:
+                    value = value // right
+                elif op == OP_FLOAT_DIV:
+                    value = value / right
+
+            return value
+
+        op = node.op
+        if op == OP_PLUS:
+            return self.visit(left) + self.visit(node.right)
+        elif op == OP_MINUS:
+            return self.visit(left) - self.visit(node.right)
+        elif op == OP_MUL:
+            return self.visit(left) * self.visit(node.right)
+        elif op == OP_INTEGER_DIV:
+            return self.visit(left) // self.visit(node.right)
+        elif op == OP_FLOAT_DIV:
+            return self.visit(left) / self.visit(node.right)
 
     def visit_Num(self, node):
         return node.value
 
     def visit_UnOp(self, node):
         value = self.visit(node.factor)
-        if node.token.type == TokenType.MINUS:
+        if node.op == OP_MINUS:
             return -value
-        elif node.token.type == TokenType.PLUS:
+        elif node.op == OP_PLUS:
             return value
 
+    def schedule(self):
+        """
+        Returns the number of statements to run until the next check of
+        the limits, -1 without limits
+        """
+
+        if self.max_steps is not None:
+            # the check comes right before the first statement over
+            # the budget
+            period = self.max_steps - self.steps + 1
+            if self.deadline is not None:
+                period = min(period, DEADLINE_CHECK_INTERVAL)
+        elif self.deadline is not None:
+            period = DEADLINE_CHECK_INTERVAL
+        else:
+            return -1
+
+        self.period = period
+        return period
+
+    def check_limits(self, node):
+        """
+        Raises LimitExceededError before the node runs once a limit is
+        passed, returns the number of statements to the next check
+        """
+
+        self.steps += self.period
+
+        if self.max_steps is not None and self.steps > self.max_steps:
+            self.limit_error(ErrorCode.STEP_BUDGET_EXCEEDED, f'{self.max_steps} steps', node)
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.limit_error(ErrorCode.DEADLINE_EXCEEDED, f'after {self.steps} steps', node)
+
+        return self.schedule()
+
+    def limit_error(self, error_code, detail, node):
+        token = getattr(node, 'token', None)
+        names = self.call_stack.names()
+        raise LimitExceededError(
+                error_code=error_code,
+                token=token,
+                message=f'{error_code.value} ({detail}) -> {token} in {" > ".join(names)}',
+                call_stack=names,
+                )
+
+    def prepare(self):
+        if self.ast.block.slot_names is None:
+            # variables are addressed by slots laid out during the analysis
+            SemanticAnalyzer().visit(self.ast)
+        self.steps = 0
+        self.countdown = self.schedule()
+
     def interpret(self):
+        self.prepare()
         self.visit(self.ast)
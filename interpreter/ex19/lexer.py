@@ -1,3 +1,4 @@
+import re
 from .token_type import TokenType
 from .token import Token
 from . import error
@@ -10,6 +11,33 @@ def build_reserved_keywords() -> dict:
             for tok_type in tok_list[begin:end]}
     return reserved_keywords
 
+def build_single_char_tokens() -> dict:
+    tok_list = list(TokenType)
+    begin = tok_list.index(TokenType.INF) + 1
+    end = tok_list.index(TokenType.RESERVED_INF)
+    single_char_tokens = {tok_type.value: tok_type
+            for tok_type in tok_list[begin:end]}
+    return single_char_tokens
+
+
+SINGLE_CHAR_TOKENS = build_single_char_tokens()
+
+# a single match of the master pattern consumes the whitespace and
+# comments in front of a token together with the token itself, the name
+# of the matched group tells the token kind
+TOKEN_PATTERN = re.compile(r'''
+    (?:\s+|\{[^}]*\})*
+    (?:
+          (?P<ID>[^\W\d]\w*)
+        | (?P<REAL_CONST>\d+\.\d*)
+        | (?P<INTEGER_CONST>\d+)
+        | (?P<ASSIGN>:=)
+        | (?P<SINGLE_CHAR>[%s])
+        | (?P<EOF>\Z)
+        | (?P<ERROR>.)
+    )
+    ''' % re.escape(''.join(SINGLE_CHAR_TOKENS)), re.VERBOSE | re.DOTALL)
+
 
 class Lexer:
     RESERVED_ID_TOKENS = build_reserved_keywords().get
@@ -18,58 +46,21 @@ class Lexer:
         self.text = text                                  # client string input
         self.len = len(self.text)                         # input length
         self.cur_pos = 0                                  # is an index in self.text
-        self.cur_char = self.text[self.cur_pos] if self.len > 0 else None
         self.lineno = 1                                   # curent line
-        self.column = 1                                   # curent column
+        self.line_start = 0                               # index of the curent line start
+
+    @property
+    def cur_char(self):
+        return self.text[self.cur_pos] if self.cur_pos < self.len else None
+
+    @property
+    def column(self):
+        return self.cur_pos - self.line_start + 1
 
     def error(self):
         s = f"Lexer error on '{self.cur_char}' line: {self.lineno} column: {self.column}"
-        raise error.LexerError(message=s)
-
-    def advance(self):
-        if self.cur_char == '\n':
-            self.lineno += 1
-            self.column = 0
-            
-        self.cur_pos += 1
-
-        if self.cur_pos < self.len:
-            self.cur_char = self.text[self.cur_pos]
-            self.column += 1
-        else:
-            self.cur_char = None
-
-    def skip_whitespace(self):
-        while self.cur_char is not None and self.cur_char.isspace():
-            self.advance()
-
-    def skip_comment(self):
-        while self.cur_char != '}':
-            self.advance()
-        self.advance()
-
-    def number(self):
-        result = ''
-        while self.cur_char is not None and self.cur_char.isdigit():
-            result += self.cur_char
-            self.advance()
-
-        if self.cur_char == '.':
-            result += self.cur_char
-            self.advance()
-
-            while (
-                self.cur_char is not None and
-                self.cur_char.isdigit()
-                ):
-                result += self.cur_char
-                self.advance()
-
-            token = Token(TokenType.REAL_CONST, float(result))
-        else:
-            token = Token(TokenType.INTEGER_CONST, int(result))
-
-        return token
+        token = Token(None, self.cur_char, self.lineno, self.column)
+        raise error.LexerError(token=token, message=s)
 
     def peek(self):
         peek_pos = self.cur_pos + 1
@@ -78,61 +69,43 @@ class Lexer:
         else:
             return self.text[peek_pos]
 
-    def id(self):
-        ret = Token(type=None, value=None, lineno=self.lineno, column= self.column)
-        keyword = ''
-        while (self.cur_char is not None and
-                (self.cur_char.isalnum() or
-                    self.cur_char == '_')):
-            keyword += self.cur_char
-            self.advance()
-
-        keyword = keyword.upper()
-        token_type = self.RESERVED_ID_TOKENS(keyword)
-        
-        if token_type is None:
-            ret.type = TokenType.ID
-            ret.value = keyword
+    def get_next_token(self):
+        text = self.text
+        pos = self.cur_pos
+        m = TOKEN_PATTERN.match(text, pos)
+        kind = m.lastgroup
+        start = m.start(kind)
+
+        newlines = text.count('\n', pos, start)
+        if newlines:
+            self.lineno += newlines
+            self.line_start = text.rindex('\n', pos, start) + 1
+
+        if kind == 'ERROR':
+            self.cur_pos = start
+            self.error()
+
+        self.cur_pos = m.end()
+        column = start - self.line_start + 1
+
+        # keywords and single-character tokens are valued by their own
+        # spelling, so the lexeme is used as is
+        value = m.group(kind)
+
+        if kind == 'ID':
+            value = value.upper()
+            token_type = self.RESERVED_ID_TOKENS(value, TokenType.ID)
+        elif kind == 'SINGLE_CHAR':
+            token_type = SINGLE_CHAR_TOKENS[value]
+        elif kind == 'INTEGER_CONST':
+            token_type = TokenType.INTEGER_CONST
+            value = int(value)
+        elif kind == 'REAL_CONST':
+            token_type = TokenType.REAL_CONST
+            value = float(value)
+        elif kind == 'ASSIGN':
+            token_type = TokenType.ASSIGN
         else:
-            ret.type = token_type
-            ret.value = token_type.value
-
-        return ret
+            return Token(TokenType.EOF, None)
 
-    def get_next_token(self):
-        while self.cur_char is not None:
-
-            if self.cur_char.isspace():
-                self.skip_whitespace()
-                continue
-
-            if self.cur_char == '{':
-                self.skip_comment()
-                continue
-
-            if self.cur_char.isdigit():
-                return self.number()
-
-            if (self.cur_char.isalpha() or
-                self.cur_char == '_'):
-                return self.id()
-
-            if self.cur_char == ':' and self.peek() == '=':
-                self.advance()
-                self.advance()
-                return Token(TokenType.ASSIGN, ':=')
-
-            try:
-                token_type = TokenType(self.cur_char)
-            except ValueError:
-                self.error()
-            else:
-                token = Token(
-                        type=token_type,
-                        value=token_type.value,
-                        lineno=self.lineno,
-                        column=self.column,)
-                self.advance()
-                return token
-
-        return Token(TokenType.EOF, None)
+        return Token(token_type, value, self.lineno, column)
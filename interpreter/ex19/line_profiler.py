@@ -0,0 +1,108 @@
+import sys
+import threading
+from .ast import Ast
+
+DEFAULT_INTERVAL = 0.001
+
+
+class LineSampler:
+    """
+    Sampling profiler of Pascal source lines
+
+    A background thread wakes up every interval, looks at the Python
+    stack of the interpreting thread and finds the innermost AST node
+    being visited that knows its source position, the hit goes to the
+    node's line. The interpreter itself runs unchanged, the cost is the
+    sampling thread taking the GIL for a few microseconds per sample.
+    The thread waits for the GIL up to sys.getswitchinterval(), so
+    samples are at least that far apart whatever the interval.
+
+    interval    -- seconds between samples
+    hits        -- line number -> number of samples
+    samples     -- number of samples taken
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL):
+        self.interval = interval
+        self.hits = {}
+        self.samples = 0
+        self.thread_id = None
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def start(self, thread_id=None):
+        self.thread_id = thread_id or threading.get_ident()
+        self.stopped.clear()
+        self.thread = threading.Thread(target=self.run, name='LineSampler', daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.sample()
+
+    def sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        lineno = frame_line(frame)
+        self.samples += 1
+
+        if lineno is not None:
+            self.hits[lineno] = self.hits.get(lineno, 0) + 1
+
+    def report(self, source):
+        """
+        Returns the source annotated with the hits of every line
+        """
+
+        width = len(str(max(self.hits.values(), default=0)))
+        width = max(width, len('hits'))
+        attributed = sum(self.hits.values())
+
+        lines = [
+                f'{self.samples} samples, {attributed} in the program',
+                '',
+                f'{"hits":>{width}} {"%":>6} {"line":>5}  source',
+                ]
+
+        for lineno, text in enumerate(source.splitlines(), 1):
+            hits = self.hits.get(lineno)
+            if hits:
+                percent = 100 * hits / attributed
+                lines.append(f'{hits:>{width}} {percent:6.1f} {lineno:>5}  {text}')
+            else:
+                lines.append(f'{"":>{width}} {"":>6} {lineno:>5}  {text}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def node_line(node):
+    lineno = getattr(node, 'lineno', None)
+    if lineno is None:
+        token = getattr(node, 'token', None)
+        lineno = getattr(token, 'lineno', None)
+    return lineno
+
+def frame_line(frame):
+    """
+    Returns the line of the innermost node visited on the frame stack
+    """
+
+    while frame is not None:
+        if 'node' in frame.f_code.co_varnames:
+            node = frame.f_locals.get('node')
+            if isinstance(node, Ast):
+                lineno = node_line(node)
+                if lineno is not None:
+                    return lineno
+        frame = frame.f_back
+    return None
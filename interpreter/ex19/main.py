@@ -1,12 +1,61 @@
 import argparse
-from .interpreter import Interpreter, enable_log as interp_enable_log
+from .interpreter import Interpreter
+from .stack_interpreter import StackInterpreter, DEFAULT_MAX_CALL_DEPTH
 from .lexer import Lexer
+from .token_buffer import TokenBuffer
 from .parser import Parser
-from .symbols import SemanticAnalyzer, enable_log as symbols_enable_log
+from .symbols import SemanticAnalyzer
+from .tracer import Tracer, NULL_TRACER
+from .compiler import Compiler
+from .vm import VM
+from .engine import Engine
+from .python_transpiler import PythonTranspiler
+from .cache import CompileCache
+from .optimizer import ConstantFolder
+from .timings import Timings, count_nodes
+from .profiler import ProfilingInterpreter, SORT_KEYS
+from .line_profiler import LineSampler, DEFAULT_INTERVAL
+from .server import main as serve_main
+from .batch import main as batch_main
 from .error import *
 import sys
 
+def analyze(source_code, timings, tracer=NULL_TRACER):
+    try:
+        # the source is lexed at once, so lexing and parsing are timed
+        # apart
+        with timings.phase('lex'):
+            tokens = TokenBuffer(source_code)
+        timings.counters['tokens'] = len(tokens)
+
+        with timings.phase('parse'):
+            parser = Parser(tokens.cursor())
+            tree = parser.parse()
+    except (LexerError, ParserError) as e:
+        print(e)
+        sys.exit(1)
+
+    semantic_analyzer = SemanticAnalyzer(tracer)
+
+    try:
+        with timings.phase('analyze'):
+            semantic_analyzer.visit(tree)
+    except SemanticError as e:
+        print(e)
+        sys.exit(1)
+
+    return tree
+
+# subcommands, any other first argument is the Pascal source file
+COMMANDS = {
+        'serve': serve_main,
+        'batch': batch_main,
+        }
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        return COMMANDS[sys.argv[1]](sys.argv[2:])
+
     argparser = argparse.ArgumentParser(
             description='Simple Pascal Interpreter')
     argparser.add_argument(
@@ -20,30 +69,142 @@ def main():
             '--stack',
             help='Print call stack',
             action='store_true')
+    argparser.add_argument(
+            '--backend',
+            help='Execution backend: tree-walking interpreter, non-recursive '
+                 'tree-walking interpreter, bytecode VM, closure compiling '
+                 'engine or Python transpiler',
+            choices=('tree', 'stack', 'vm', 'closure', 'python'),
+            default='tree')
+    argparser.add_argument(
+            '--max-call-depth',
+            help='Limit of nested procedure calls of the stack backend',
+            type=int,
+            default=DEFAULT_MAX_CALL_DEPTH)
+    argparser.add_argument(
+            '--no-cache',
+            help='Do not read or write the compile cache',
+            action='store_true')
+    argparser.add_argument(
+            '--cache-dir',
+            help='Compile cache directory')
+    argparser.add_argument(
+            '--no-fold',
+            help='Do not fold constant expressions',
+            action='store_true')
+    argparser.add_argument(
+            '--timings',
+            help='Print wall and CPU time of every phase, token and AST node '
+                 'counts and peak memory to stderr, as text or JSON '
+                 '(--timings=json)',
+            nargs='?',
+            choices=('text', 'json'),
+            const='text')
+    argparser.add_argument(
+            '--profile',
+            help='Print calls, internal and cumulative time of every Pascal '
+                 'procedure to stderr, runs the tree backend',
+            action='store_true')
+    argparser.add_argument(
+            '--profile-sort',
+            help='Profile sort order',
+            choices=tuple(SORT_KEYS),
+            default='cumulative')
+    argparser.add_argument(
+            '--profile-stacks',
+            help='Write the profiled call paths in the collapsed stack format '
+                 'of flame graph tools',
+            metavar='FILE')
+    argparser.add_argument(
+            '--sample-lines',
+            help='Sample the executed source lines and print the source '
+                 'annotated with the hits to stderr, runs with the tree or '
+                 'stack backend',
+            action='store_true')
+    argparser.add_argument(
+            '--sample-interval',
+            help='Seconds between line samples',
+            type=float,
+            default=DEFAULT_INTERVAL)
 
     args = argparser.parse_args()
 
-    if args.scope: symbols_enable_log()
-    if args.stack: interp_enable_log()
+    profile = args.profile or args.profile_stacks
+    if profile and args.backend != 'tree':
+        argparser.error('--profile and --profile-stacks need the tree backend')
+    if args.sample_lines and args.backend not in ('tree', 'stack'):
+        argparser.error('--sample-lines needs the tree or stack backend')
 
-    source_code = open(args.inputfile, 'r').read()
+    scope_tracer = Tracer() if args.scope else NULL_TRACER
+    stack_tracer = Tracer() if args.stack else NULL_TRACER
 
-    lexer = Lexer(source_code)
+    timings = Timings()
 
-    try:
-        parser = Parser(lexer)
-        tree = parser.parse()
-    except (LexerError, ParserError) as e:
-        print(e.message)
-        sys.exit(1)
+    with timings.phase('read'):
+        with open(args.inputfile, 'r') as f:
+            source_code = f.read()
+
+    # scope logging happens during the analysis, which a cached
+    # program skips
+    cache = None if args.no_cache or args.scope else CompileCache(args.cache_dir)
+    tree = None
+
+    if cache:
+        with timings.phase('cache load'):
+            tree = cache.load(source_code)
+
+    if tree is None:
+        tree = analyze(source_code, timings, scope_tracer)
+        if cache:
+            with timings.phase('cache store'):
+                cache.store(source_code, tree)
 
-    semantic_analyzer = SemanticAnalyzer()
+    if not args.no_fold:
+        with timings.phase('fold'):
+            timings.counters['folded_nodes'] = ConstantFolder().fold(tree)
+
+    with timings.phase('compile'):
+        if args.backend == 'vm':
+            bytecode = Compiler().compile(tree)
+            interpreter = VM(bytecode)
+        elif args.backend == 'stack':
+            interpreter = StackInterpreter(tree, max_call_depth=args.max_call_depth, tracer=stack_tracer)
+        elif args.backend == 'closure':
+            interpreter = Engine(tree)
+            interpreter.compile()
+        elif args.backend == 'python':
+            # the transpiler parses the source itself when it runs
+            parser = Parser(Lexer(source_code))
+            interpreter = PythonTranspiler(parser, filename=args.inputfile)
+        elif profile:
+            interpreter = ProfilingInterpreter(tree, tracer=stack_tracer)
+        else:
+            interpreter = Interpreter(tree, tracer=stack_tracer)
+
+    sampler = LineSampler(args.sample_interval) if args.sample_lines else None
 
     try:
-        semantic_analyzer.visit(tree)
-    except SemanticError as e:
+        with timings.phase('execute'):
+            if sampler:
+                sampler.start()
+            try:
+                interpreter.interpret()
+            finally:
+                if sampler:
+                    sampler.stop()
+    except InterpreterError as e:
         print(e)
         sys.exit(1)
 
-    interpreter = Interpreter(tree)
-    interpreter.interpret()
+    if sampler:
+        print(sampler.report(source_code), file=sys.stderr)
+
+    if args.profile:
+        print(interpreter.profiler.report(args.profile_sort), file=sys.stderr)
+    if args.profile_stacks:
+        interpreter.profiler.write_collapsed_stacks(args.profile_stacks)
+
+    if args.timings:
+        timings.counters['ast_nodes'] = count_nodes(tree)
+        report = timings.to_json() if args.timings == 'json' else timings.report()
+        print(report, file=sys.stderr)
@@ -1,16 +1,85 @@
 class CallStack:
+    """
+    Stack of activation records
+
+    Procedure records are taken with new_record and return to the free
+    list of their procedure once popped, so a procedure called over and
+    over reuses the same few records instead of allocating new ones.
+
+    The display holds the innermost record of every nesting level, the
+    record of a variable's scope is found by its level in constant
+    time. A pushed record saves the display entry it replaces, popping
+    it restores the entry.
+    """
+
     def __init__(self):
         self.__records = []
+        self.free_lists = {}        # procedure key -> free records
+        self.display = [None]       # nesting level -> innermost record
 
     def push(self, item):
         self.__records.append(item)
 
+        display = self.display
+        nesting_level = item.nesting_level
+        while len(display) <= nesting_level:
+            display.append(None)
+        item.saved = display[nesting_level]
+        display[nesting_level] = item
+
     def pop(self):
-        return self.__records.pop()
+        ar = self.__records.pop()
+        self.display[ar.nesting_level] = ar.saved
+        ar.saved = None
+        if ar.free_list is not None:
+            ar.clear()
+            ar.free_list.append(ar)
+        return ar
+
+    def new_record(self, key, name, type, nesting_level, slot_names):
+        """
+        Returns an empty record from the free list of the key
+        """
+
+        free_list = self.free_lists.get(key)
+
+        if free_list is None:
+            free_list = self.free_lists[key] = []
+        elif free_list:
+            return free_list.pop()
+
+        ar = ActivationRecord(name, type, nesting_level, slot_names)
+        ar.free_list = free_list
+        return ar
 
     def peek(self):
         return self.__records[-1]
 
+    def unwind(self):
+        """
+        Pops every record, the innermost first
+        """
+
+        while self.__records:
+            self.pop()
+
+    def names(self):
+        """
+        Returns the names of the records, the outermost first
+        """
+
+        return [ar.name for ar in self]
+
+    def __iter__(self):
+        """
+        Iterates over the records, the outermost first
+        """
+
+        return iter(self.__records)
+
+    def __reversed__(self):
+        return reversed(self.__records)
+
     def is_empty(self):
         return len(self.__records) == 0
 
@@ -28,24 +97,47 @@ class ARType(Enum):
 
 
 class ActivationRecord:
-    def __init__(self, name, type, nesting_level):
+    """
+    Procedure (or program) frame
+
+    Variables live in a fixed-size list of slots laid out by
+    SemanticAnalyzer, slot_names gives the name of every slot.
+    A record made by CallStack.new_record keeps the free list it goes
+    back to, a pushed record keeps the display entry it replaced.
+    """
+
+    __slots__ = ('name', 'type', 'nesting_level', 'slot_names', 'slots', 'free_list', 'saved')
+
+    def __init__(self, name, type, nesting_level, slot_names=()):
         self.name = name
         self.type = type
         self.nesting_level = nesting_level
-        self.__members = {}
+        self.slot_names = slot_names
+        self.slots = [None] * len(slot_names)
+        self.free_list = None
+        self.saved = None
+
+    def clear(self):
+        slots = self.slots
+        for i in range(len(slots)):
+            slots[i] = None
 
     def __setitem__(self, key, value):
-        self.__members[key] = value
+        self.slots[self.slot_names.index(key)] = value
 
     def __getitem__(self, key):
-        return self.__members[key]
+        if key not in self.slot_names:
+            raise KeyError(key)
+        return self.slots[self.slot_names.index(key)]
 
     def get(self, key):
-        return self.__members.get(key)
+        if key not in self.slot_names:
+            return None
+        return self.slots[self.slot_names.index(key)]
 
     def __repr__(self):
         lines = [f'{self.nesting_level}: {self.type} {self.name}']
-        for name, val in self.__members.items():
+        for name, val in zip(self.slot_names, self.slots):
             lines.append(f'{name:<20}: {val}')
 
         s = '\n'.join(lines)
@@ -0,0 +1,183 @@
+from .visitor import NodeVisitor
+from .ast import *
+
+# evaluation of a constant operation, the same Python operators the
+# interpreter uses, so a folded program computes exactly the same values
+FOLD_OPERATORS = {
+        OP_PLUS: lambda a, b: a + b,
+        OP_MINUS: lambda a, b: a - b,
+        OP_MUL: lambda a, b: a * b,
+        OP_INTEGER_DIV: lambda a, b: a // b,
+        OP_FLOAT_DIV: lambda a, b: a / b,
+        }
+
+
+class ConstantFolder(NodeVisitor):
+    """
+    Constant folding and algebraic simplification pass
+
+    Runs over an analyzed tree or arena and simplifies its expressions:
+
+    - a BinOp or UnOp of constant operands becomes a Num
+    - x * 1, 1 * x, x + 0, 0 + x, x - 0, +x and - -x become x
+
+    Only integer literals 0 and 1 take part in the identities, x * 1.0
+    turns an integer into a real. Operations dividing by a constant zero
+    are left to fail at run time.
+
+    Expression nodes are never modified, a simplified expression is
+    made of new nodes and is assigned to its Assign or ProcCall only.
+    Statements and blocks stay where they are, so the procedure symbols
+    keep pointing at their bodies, and an arena view stores the new
+    expression as new rows.
+
+    removed -- number of nodes removed from the tree
+    """
+
+    def __init__(self):
+        self.removed = 0
+
+    def fold(self, tree):
+        self.visit(tree)
+        return self.removed
+
+    def visit_Program(self, node):
+        self.visit(node.block)
+        return node
+
+    def visit_Block(self, node):
+        for declaration in node.declarations:
+            self.visit(declaration)
+        self.visit(node.compound_statement)
+        return node
+
+    def visit_VarDecl(self, node):
+        return node
+
+    def visit_ProcDecl(self, node):
+        self.visit(node.body)
+        return node
+
+    def visit_ProcCall(self, node):
+        params = node.actual_params
+        folded = [self.visit(param) for param in params]
+        if any(new is not old for new, old in zip(folded, params)):
+            node.actual_params = folded
+        return node
+
+    def visit_Compound(self, node):
+        for leaf in node.leaves:
+            self.visit(leaf)
+        return node
+
+    def visit_Assign(self, node):
+        expr = node.right
+        folded = self.visit(expr)
+        if folded is not expr:
+            node.right = folded
+        return node
+
+    def visit_NoOp(self, node):
+        return node
+
+    def visit_Var(self, node):
+        return node
+
+    def visit_Num(self, node):
+        return node
+
+    def visit_BinOp(self, node):
+        return self.fold_expression(node)
+
+    def visit_UnOp(self, node):
+        return self.fold_expression(node)
+
+    def fold_expression(self, node):
+        """
+        Returns the simplified expression
+
+        The expression is walked in post order with an explicit stack,
+        so neither long operator chains nor deep nesting take Python
+        frames.
+        """
+
+        folded = []
+        # (node, operands) pairs, operands are None until the node is
+        # expanded, then its original operands
+        pending = [(node, None)]
+
+        while pending:
+            node, operands = pending.pop()
+
+            if isinstance(node, BinOp):
+                if operands is None:
+                    operands = node.left, node.right
+                    pending.append((node, operands))
+                    pending.append((operands[1], None))
+                    pending.append((operands[0], None))
+                else:
+                    right = folded.pop()
+                    left = folded.pop()
+                    folded.append(self.fold_binop(node, operands, left, right))
+            elif isinstance(node, UnOp):
+                if operands is None:
+                    operands = node.factor,
+                    pending.append((node, operands))
+                    pending.append((operands[0], None))
+                else:
+                    folded.append(self.fold_unop(node, operands, folded.pop()))
+            else:
+                folded.append(node)
+
+        return folded[0]
+
+    def fold_binop(self, node, operands, left, right):
+        op = node.op
+
+        if isinstance(left, Num) and isinstance(right, Num):
+            if op not in (OP_INTEGER_DIV, OP_FLOAT_DIV) or right.value != 0:
+                self.removed += 2
+                return Num(FOLD_OPERATORS[op](left.value, right.value))
+        elif op == OP_MUL:
+            if is_int_literal(right, 1):
+                return self.replace(node, left)
+            if is_int_literal(left, 1):
+                return self.replace(node, right)
+        elif op == OP_PLUS:
+            if is_int_literal(right, 0):
+                return self.replace(node, left)
+            if is_int_literal(left, 0):
+                return self.replace(node, right)
+        elif op == OP_MINUS:
+            if is_int_literal(right, 0):
+                return self.replace(node, left)
+
+        if left is not operands[0] or right is not operands[1]:
+            return BinOp(left=left, token=node.token, right=right)
+        return node
+
+    def fold_unop(self, node, operands, factor):
+        if node.op == OP_PLUS:
+            self.removed += 1
+            return factor
+
+        if isinstance(factor, Num):
+            self.removed += 1
+            return Num(-factor.value)
+
+        if isinstance(factor, UnOp) and factor.op == OP_MINUS:
+            self.removed += 2
+            return factor.factor
+
+        if factor is not operands[0]:
+            return UnOp(token=node.token, factor=factor)
+        return node
+
+    def replace(self, node, operand):
+        # the operation and its literal operand are dropped
+        self.removed += 2
+        return operand
+
+
+def is_int_literal(node, value):
+    return isinstance(node, Num) and type(node.value) is int and node.value == value
@@ -3,6 +3,28 @@ from .token_type import TokenType
 from .ast import *
 from .error import ParserError, ErrorCode
 
+BINARY_PRECEDENCE = {
+        TokenType.PLUS: 1,
+        TokenType.MINUS: 1,
+        TokenType.MUL: 2,
+        TokenType.INTEGER_DIV: 2,
+        TokenType.FLOAT_DIV: 2,
+        }
+
+# prefix operators bind tighter than any binary one, an open parenthesis
+# stops every reduction until its RP
+UNARY_OPERATORS = (TokenType.PLUS, TokenType.MINUS)
+UNARY_PRECEDENCE = max(BINARY_PRECEDENCE.values()) + 1
+LP_PRECEDENCE = 0
+
+# upper bound of the nesting of an expression: a Num or Var is nested
+# 1, an UnOp one more than its operand and a BinOp the most of its left
+# operand and one more than its right operand. Every walk loops over
+# chains of left operands, so a + b + ... + z of any length is nested
+# 2, while right operands and unary operands still take a few Python
+# frames per level in the recursive backends.
+MAX_EXPR_NESTING = 200
+
 class Parser():
     def __init__(self, lexer):
         self.lexer = lexer
@@ -57,22 +79,24 @@ class Parser():
 
         declarations = []
 
-        if self.cur_token.type == TokenType.VAR:
-            self.eat(TokenType.VAR)
+        # the tail of the rule is looped over rather than recursed into,
+        # so the number of declarations is not bounded by the Python stack
+        while True:
+            if self.cur_token.type == TokenType.VAR:
+                self.eat(TokenType.VAR)
 
-            while self.cur_token.type == TokenType.ID:
-                var_decl = self.variable_declaration()
-                self.eat(TokenType.SEMI)
-                declarations.extend(var_decl)
-            declarations.extend(self.declarations())
+                while self.cur_token.type == TokenType.ID:
+                    var_decl = self.variable_declaration()
+                    self.eat(TokenType.SEMI)
+                    declarations.extend(var_decl)
 
-        elif self.cur_token.type == TokenType.PROCEDURE:
-            self.eat(TokenType.PROCEDURE)
-            proc_decl = self.procedure_declaration()
-            declarations.append(proc_decl)
-            declarations.extend(self.declarations())
+            elif self.cur_token.type == TokenType.PROCEDURE:
+                self.eat(TokenType.PROCEDURE)
+                proc_decl = self.procedure_declaration()
+                declarations.append(proc_decl)
 
-        return declarations
+            else:
+                return declarations
 
     def variable_declaration(self):
         """
@@ -254,9 +278,9 @@ class Parser():
         assignment_statement : variable ASSIGN expr
         """
         left = self.variable()
+        token = self.cur_token
         self.eat(TokenType.ASSIGN)
         right = self.expr()
-        token = self.cur_token
         node = Assign(left=left, token=token, right=right)
 
         return node
@@ -270,71 +294,92 @@ class Parser():
 
     def expr(self):
         """
-        expr: term((PLUS|MINUS)term)*
-        """
-        node = self.term()
+        expr: term ((PLUS | MINUS) term)*
+        term: factor ((MUL | INTEGER_DIV | FLOAT_DIV) factor)*
+        factor : PLUS factor
+               | MINUS factor
+               | INTEGER_CONST
+               | REAL_CONST
+               | LP expr RP
+               | variable
+
+        Operator precedence parsing over explicit operand and operator
+        stacks, so neither long operator chains nor deep nesting take
+        Python frames. Operators are defined by BINARY_PRECEDENCE and
+        UNARY_OPERATORS only. An expression nested deeper than
+        MAX_EXPR_NESTING is an error, parentheses alone add no
+        nesting.
+        """
+        operands = []
+        nestings = []           # nesting of every operand
+        operators = []          # (precedence, token) pairs
+        parens = 0
+        expect_operand = True
+
+        def reduce():
+            precedence, token = operators.pop()
+            if precedence == UNARY_PRECEDENCE:
+                operands.append(UnOp(token=token, factor=operands.pop()))
+                nesting = nestings.pop() + 1
+            else:
+                right = operands.pop()
+                operands.append(BinOp(left=operands.pop(), token=token, right=right))
+                right_nesting = nestings.pop() + 1
+                nesting = max(nestings.pop(), right_nesting)
+
+            if nesting > MAX_EXPR_NESTING:
+                self.error(
+                        error_code=ErrorCode.EXPR_TOO_DEEP,
+                        token=token,
+                        )
+            nestings.append(nesting)
 
         while True:
             token = self.cur_token
 
-            if token.type == TokenType.PLUS:
-                self.eat(TokenType.PLUS)
-                node = BinOp(left=node, token=token, right=self.term())
-            elif token.type == TokenType.MINUS:
-                self.eat(TokenType.MINUS)
-                node = BinOp(left=node, token=token, right=self.term())
+            if expect_operand:
+                if token.type in UNARY_OPERATORS:
+                    self.eat(token.type)
+                    operators.append((UNARY_PRECEDENCE, token))
+                elif token.type == TokenType.LP:
+                    self.eat(TokenType.LP)
+                    operators.append((LP_PRECEDENCE, token))
+                    parens += 1
+                elif token.type in (TokenType.INTEGER_CONST, TokenType.REAL_CONST):
+                    self.eat(token.type)
+                    operands.append(Num(value=token.value))
+                    nestings.append(1)
+                    expect_operand = False
+                else:
+                    operands.append(self.variable())
+                    nestings.append(1)
+                    expect_operand = False
+                continue
+
+            precedence = BINARY_PRECEDENCE.get(token.type)
+
+            if precedence is not None:
+                while operators and operators[-1][0] >= precedence:
+                    reduce()
+                self.eat(token.type)
+                operators.append((precedence, token))
+                expect_operand = True
+            elif token.type == TokenType.RP and parens:
+                while operators[-1][0] != LP_PRECEDENCE:
+                    reduce()
+                operators.pop()
+                parens -= 1
+                self.eat(TokenType.RP)
             else:
                 break
 
-        return node
-
-    def term(self):
-       """
-       term: factor ((MUL | INTEGER_DIV | FLOAT_DIV) factor)*
-       """
-       node = self.factor()
-
-       while True:
-           token = self.cur_token
-
-           if token.type == TokenType.MUL:
-               self.eat(TokenType.MUL)
-               node = BinOp(left=node, token=token, right=self.factor())
-           elif self.cur_token.type == TokenType.INTEGER_DIV:
-               self.eat(TokenType.INTEGER_DIV)
-               node = BinOp(left=node, token=token, right=self.factor())
-           elif self.cur_token.type == TokenType.FLOAT_DIV:
-               self.eat(TokenType.FLOAT_DIV)
-               node = BinOp(left=node, token=token, right=self.factor())
-           else:
-               break
-
-       return node
-
-    def factor(self):
-        """
-        factor : PLUS factor
-               | MINUS factor
-               | INTEGER_CONST
-               | REAL_CONST
-               | LP expr RP
-               | variable
-        """
-        token = self.cur_token
-        if token.type in (TokenType.PLUS, TokenType.MINUS):
-            self.eat(token.type)
-            node = UnOp(token=token, factor=self.factor())
-        elif token.type in (TokenType.INTEGER_CONST, TokenType.REAL_CONST):
-            self.eat(token.type)
-            node = Num(value=token.value)
-        elif token.type == TokenType.LP:
-            self.eat(TokenType.LP)
-            node = self.expr()
+        if parens:
             self.eat(TokenType.RP)
-        else:
-            node = self.variable()
 
-        return node
+        while operators:
+            reduce()
+
+        return operands[0]
 
     def variable(self):
         """
@@ -0,0 +1,134 @@
+import time
+from .interpreter import Interpreter
+from .tracer import NULL_TRACER
+
+SORT_KEYS = {
+        'calls': lambda row: (-row[1], row[0]),
+        'cumulative': lambda row: (-row[3], row[0]),
+        'tottime': lambda row: (-row[2], row[0]),
+        'name': lambda row: row[0],
+        }
+
+SORT_TITLES = {
+        'calls': 'call count',
+        'cumulative': 'cumulative time',
+        'tottime': 'internal time',
+        'name': 'procedure name',
+        }
+
+
+class Profiler:
+    """
+    Pascal procedure profiler
+
+    Collects for every procedure (and the program) the number of calls,
+    the inclusive time spent in it and its callees, and the exclusive
+    time spent in its own statements. A procedure recursing into itself
+    adds its inclusive time once, as pstats does. The exclusive time is
+    also summed per call path for collapsed stack output.
+
+    clock   -- time source in seconds
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.stats = {}             # name -> [calls, exclusive, inclusive]
+        self.active = {}            # name -> frames of the name on the stack
+        self.stacks = {}            # call path -> exclusive time
+        self.frames = []            # [name, path, start, callees time]
+
+    def enter(self, name):
+        frames = self.frames
+        path = f'{frames[-1][1]};{name}' if frames else name
+        self.active[name] = self.active.get(name, 0) + 1
+        frames.append([name, path, self.clock(), 0.0])
+
+    def leave(self):
+        name, path, start, callees = self.frames.pop()
+        elapsed = self.clock() - start
+        exclusive = elapsed - callees
+
+        if self.frames:
+            self.frames[-1][3] += elapsed
+
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = [0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += exclusive
+
+        self.active[name] -= 1
+        if not self.active[name]:
+            stats[2] += elapsed
+
+        self.stacks[path] = self.stacks.get(path, 0.0) + exclusive
+
+    def rows(self, sort='cumulative'):
+        """
+        Returns (name, calls, exclusive, inclusive) sorted by the key
+        """
+
+        rows = [(name, calls, exclusive, inclusive)
+                for name, (calls, exclusive, inclusive) in self.stats.items()]
+        rows.sort(key=SORT_KEYS[sort])
+        return rows
+
+    def report(self, sort='cumulative'):
+        rows = self.rows(sort)
+        total_calls = sum(row[1] for row in rows)
+        total_time = sum(row[2] for row in rows)
+
+        lines = [
+                f'         {total_calls} procedure calls in {total_time:.3f} seconds',
+                '',
+                f'   Ordered by: {SORT_TITLES[sort]}',
+                '',
+                '   ncalls  tottime  percall  cumtime  percall procedure',
+                ]
+
+        for name, calls, exclusive, inclusive in rows:
+            lines.append(f'{calls:9} {exclusive:8.3f} {exclusive / calls:8.3f} '
+                         f'{inclusive:8.3f} {inclusive / calls:8.3f} {name}')
+
+        return '\n'.join(lines) + '\n'
+
+    def collapsed_stacks(self):
+        """
+        Returns the call paths in the collapsed stack format
+
+        One 'OUTER;INNER microseconds' line per call path, the input of
+        flamegraph.pl and compatible tools.
+        """
+
+        return ''.join(f'{path} {round(exclusive * 1e6)}\n'
+                for path, exclusive in sorted(self.stacks.items()))
+
+    def write_collapsed_stacks(self, path):
+        with open(path, 'w') as f:
+            f.write(self.collapsed_stacks())
+
+
+class ProfilingInterpreter(Interpreter):
+    """
+    Tree-walking interpreter reporting the program and procedure calls
+    to a profiler, the evaluation of the arguments counts to the called
+    procedure
+    """
+
+    def __init__(self, ast, profiler=None, tracer=NULL_TRACER):
+        super().__init__(ast, tracer=tracer)
+        self.profiler = profiler or Profiler()
+
+    def visit_Program(self, node):
+        self.profiler.enter(node.variable.name)
+        try:
+            super().visit_Program(node)
+        finally:
+            self.profiler.leave()
+
+    def visit_ProcCall(self, node):
+        self.profiler.enter(node.name)
+        try:
+            super().visit_ProcCall(node)
+        finally:
+            self.profiler.leave()
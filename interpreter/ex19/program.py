@@ -0,0 +1,93 @@
+from .token_buffer import TokenBuffer
+from .parser import Parser
+from .symbols import SemanticAnalyzer
+from .optimizer import ConstantFolder
+from .interpreter import Interpreter
+from .stack_interpreter import StackInterpreter, DEFAULT_MAX_CALL_DEPTH, DEFAULT_SLICE_STEPS
+
+
+class CompiledProgram:
+    """
+    Program analyzed once and run any number of times
+
+    The source is lexed, parsed, analyzed and folded when the program is
+    made. A run only builds an interpreter with a fresh call stack over
+    the analyzed tree, which runs never change, so a program can be
+    shared by threads and run by all of them at once.
+
+    name            -- program name
+    global_names    -- names of the global variables, in slot order
+    """
+
+    __slots__ = ('name', 'global_names', '_tree')
+
+    def __init__(self, source, fold=True):
+        tree = Parser(TokenBuffer(source).cursor()).parse()
+        SemanticAnalyzer().visit(tree)
+        if fold:
+            ConstantFolder().fold(tree)
+        self._init(tree)
+
+    @classmethod
+    def from_tree(cls, tree):
+        """
+        Returns the program of an analyzed tree, the program owns the
+        tree from then on
+        """
+
+        program = cls.__new__(cls)
+        program._init(tree)
+        return program
+
+    def _init(self, tree):
+        set_field = object.__setattr__
+        set_field(self, '_tree', tree)
+        set_field(self, 'name', tree.variable.name)
+        set_field(self, 'global_names', tree.block.slot_names)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def run(self, initial_globals=None, max_call_depth=None, max_steps=None, deadline=None):
+        """
+        Runs the program, returns the final values of its globals
+
+        initial_globals -- global variable name -> value assigned before
+                           the program body runs
+        max_call_depth  -- when given, the program runs on the
+                           StackInterpreter limited to that call depth
+        max_steps       -- limit of statements run
+        deadline        -- time.monotonic() the run must end by
+        """
+
+        if max_call_depth is None:
+            interpreter = Interpreter(self._tree, initial_globals,
+                    max_steps=max_steps, deadline=deadline)
+        else:
+            interpreter = StackInterpreter(self._tree, max_call_depth, initial_globals,
+                    max_steps=max_steps, deadline=deadline)
+        interpreter.interpret()
+
+        ar = interpreter.ar
+        return dict(zip(ar.slot_names, ar.slots))
+
+    async def run_async(self, initial_globals=None, slice_steps=DEFAULT_SLICE_STEPS,
+            max_call_depth=DEFAULT_MAX_CALL_DEPTH, max_steps=None, deadline=None):
+        """
+        Runs the program on the StackInterpreter as a coroutine giving
+        control back to the event loop every slice_steps statements,
+        returns the final values of its globals
+        """
+
+        interpreter = StackInterpreter(self._tree, max_call_depth, initial_globals,
+                max_steps=max_steps, deadline=deadline)
+        await interpreter.run_async(slice_steps)
+
+        ar = interpreter.ar
+        return dict(zip(ar.slot_names, ar.slots))
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} {self.name}>'
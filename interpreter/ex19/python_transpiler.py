@@ -0,0 +1,250 @@
+from .visitor import NodeVisitor
+from .symbols import SemanticAnalyzer
+from .error import InterpreterError, ErrorCode
+from .ast import *
+
+PYTHON_OPERATORS = {
+        OP_PLUS: '+',
+        OP_MINUS: '-',
+        OP_MUL: '*',
+        OP_INTEGER_DIV: '//',
+        OP_FLOAT_DIV: '/',
+        }
+
+# Python binding strength of the emitted operators, an operand is put in
+# parentheses only when it binds looser than its place requires
+PYTHON_PRECEDENCE = {
+        OP_PLUS: 1,
+        OP_MINUS: 1,
+        OP_MUL: 2,
+        OP_INTEGER_DIV: 2,
+        OP_FLOAT_DIV: 2,
+        }
+UNARY_PRECEDENCE = 3
+ATOM_PRECEDENCE = 4
+
+INDENT = '    '
+
+
+class PythonTranspiler(NodeVisitor):
+    """
+    Python source visitor
+
+    The program becomes a function, procedures become nested functions
+    and Pascal variables become their locals, so CPython resolves the
+    lexical scopes itself. Every emitted line remembers the Pascal
+    token it came from, compile and runtime errors are reported at that
+    position.
+
+    parser      -- source parser
+    filename    -- name of the Pascal source, used in error messages
+    """
+
+    def __init__(self, parser, filename='<pascal>'):
+        self.parser = parser
+        self.filename = filename
+        self.lines = []
+        self.line_tokens = []       # Pascal token of every emitted line
+        self.indent = 0
+        self.level = None
+        self.slot_names = None
+        self.state = None
+
+    def emit(self, line, token=None):
+        self.lines.append(INDENT * self.indent + line)
+        self.line_tokens.append(token)
+
+    def translate(self):
+        ast = self.parser.parse()
+        SemanticAnalyzer().visit(ast)
+        self.visit(ast)
+        return '\n'.join(self.lines) + '\n'
+
+    def compile(self):
+        source = self.translate()
+        try:
+            return compile(source, self.filename, 'exec')
+        except (SyntaxError, RecursionError, MemoryError) as e:
+            self.compile_error(e)
+
+    def interpret(self):
+        namespace = {}
+        exec(self.compile(), namespace)
+
+        try:
+            state = namespace['_program']()
+        except Exception as e:
+            self.runtime_error(e)
+
+        self.state = {name: state[name]
+                for name in self.slot_names if name in state}
+
+    def get_var_value(self, var_name):
+        return self.state.get(var_name.upper())
+
+    def compile_error(self, e):
+        lineno = getattr(e, 'lineno', None)
+        if lineno:
+            token = self.line_tokens[lineno - 1]
+        else:
+            # CPython gives no line when the compiler runs out of stack
+            token = next(token for token in self.line_tokens if token)
+
+        error_code = ErrorCode.COMPILE_ERROR
+        raise InterpreterError(
+                error_code=error_code,
+                token=token,
+                message=f'{error_code.value} ({e}) -> '
+                        f'{self.filename}:{token.lineno}:{token.column}',
+                ) from e
+
+    def runtime_error(self, e):
+        tb = e.__traceback__
+        token = None
+
+        while tb is not None:
+            if tb.tb_frame.f_code.co_filename == self.filename:
+                token = self.line_tokens[tb.tb_lineno - 1] or token
+            tb = tb.tb_next
+
+        if token is None:
+            raise e
+
+        if isinstance(e, NameError):
+            error_code = ErrorCode.UNINITIALIZED_VAR
+        else:
+            error_code = ErrorCode.RUNTIME_ERROR
+
+        raise InterpreterError(
+                error_code=error_code,
+                token=token,
+                message=f'{error_code.value} ({e}) -> '
+                        f'{self.filename}:{token.lineno}:{token.column}',
+                ) from e
+
+    def declare_locals(self, names, token):
+        # bind and unbind every variable so that it is local to the
+        # function and reading it before an assignment fails
+        if names:
+            self.emit(' = '.join(names) + ' = None', token)
+            self.emit('del ' + ', '.join(names), token)
+
+    def visit_Program(self, node):
+        token = node.variable.token
+        self.slot_names = node.block.slot_names
+        self.level = 1
+        self.emit('def _program():', token)
+        self.indent += 1
+        self.declare_locals(node.block.slot_names, token)
+        self.visit(node.block)
+        self.emit('return locals()', token)
+        self.indent -= 1
+
+    def visit_Block(self, node):
+        for decl in node.declarations:
+            self.visit(decl)
+        self.visit(node.compound_statement)
+
+    def visit_VarDecl(self, node):
+        pass
+
+    def visit_ProcDecl(self, node):
+        params = [param.var_node.name for param in node.params]
+        token = node.params[0].var_node.token if node.params else None
+        self.emit(f'def {node.name}({", ".join(params)}):', token)
+        self.indent += 1
+        self.level += 1
+
+        outer = self.assigned_outer_names(node.body)
+        if outer:
+            self.emit('nonlocal ' + ', '.join(outer), token)
+
+        self.declare_locals(node.body.slot_names[len(params):], token)
+        start = len(self.lines)
+        self.visit(node.body)
+        if len(self.lines) == start:
+            self.emit('pass', token)
+
+        self.level -= 1
+        self.indent -= 1
+
+    def assigned_outer_names(self, block):
+        """
+        Returns names of enclosing scopes variables assigned in the block
+        """
+
+        names = []
+        stack = [block.compound_statement]
+
+        while stack:
+            node = stack.pop()
+            if isinstance(node, Compound):
+                stack.extend(reversed(node.leaves))
+            elif isinstance(node, Assign):
+                var_level, _ = node.left.address
+                var_name = node.left.name
+                if var_level < self.level and var_name not in names:
+                    names.append(var_name)
+
+        return names
+
+    def visit_ProcCall(self, node):
+        args = ', '.join(self.visit(param) for param in node.actual_params)
+        self.emit(f'{node.name}({args})', node.token)
+
+    def visit_Type(self, node):
+        pass
+
+    def visit_Compound(self, node):
+        for leaf in node.leaves:
+            self.visit(leaf)
+
+    def visit_Assign(self, node):
+        self.emit(f'{node.left.name} = {self.visit(node.right)}',
+                node.left.token)
+
+    def visit_Var(self, node):
+        return node.name
+
+    def visit_NoOp(self, node):
+        pass
+
+    def visit_BinOp(self, node):
+        # Pascal operators are left associative, a right operand of the
+        # same precedence keeps its parentheses. The chain of left
+        # operands is emitted in a loop, long chains take no Python
+        # frame per term.
+        first, chain = left_chain(node)
+        parts = [self.visit(first)]
+        left_precedence = precedence_of(first)
+
+        for node in chain:
+            precedence = PYTHON_PRECEDENCE[node.op]
+            if left_precedence < precedence:
+                parts.insert(0, '(')
+                parts.append(')')
+            parts.append(f' {PYTHON_OPERATORS[node.op]} {self.operand(node.right, precedence + 1)}')
+            left_precedence = precedence
+
+        return ''.join(parts)
+
+    def visit_Num(self, node):
+        return repr(node.value)
+
+    def visit_UnOp(self, node):
+        op = PYTHON_OPERATORS[node.op]
+        return f'{op}{self.operand(node.factor, UNARY_PRECEDENCE)}'
+
+    def operand(self, node, precedence):
+        source = self.visit(node)
+        if precedence_of(node) < precedence:
+            return f'({source})'
+        return source
+
+
+def precedence_of(node):
+    if isinstance(node, BinOp):
+        return PYTHON_PRECEDENCE[node.op]
+    if isinstance(node, UnOp) or isinstance(node, Num) and node.value < 0:
+        return UNARY_PRECEDENCE
+    return ATOM_PRECEDENCE
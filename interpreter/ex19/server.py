@@ -0,0 +1,333 @@
+import argparse
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import socket
+import stat
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from .program import CompiledProgram
+from .error import error_as_dict
+
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_MAX_CALL_DEPTH = 10000
+DEFAULT_MAX_STEPS = 10 ** 7
+DEFAULT_MAX_REQUEST_SIZE = 1024 * 1024
+DEADLINE_GRACE = 1.0
+
+
+class RequestError(Exception):
+    pass
+
+
+class ServerError(Exception):
+    pass
+
+
+class ProgramCache:
+    """
+    In-memory LRU cache of compiled programs
+
+    Programs are keyed by the hash of their source text, the least
+    recently used one is dropped once the cache holds max_entries.
+
+    max_entries -- number of programs kept
+    """
+
+    def __init__(self, max_entries=DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()    # source hash -> program
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(source):
+        return hashlib.sha256(source.encode()).hexdigest()
+
+    def get(self, key):
+        program = self.entries.get(key)
+        if program is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return program
+
+    def put(self, key, program):
+        self.entries[key] = program
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class Server:
+    """
+    Interpreter daemon on a Unix socket
+
+    Clients send one JSON request per line and get one JSON response
+    per line, in order. A request runs the 'source' text or the file at
+    'path', with the initial values of 'globals' if any, and answers
+    with the final values of the global variables:
+
+        {"id": 1, "source": "PROGRAM P; VAR a : INTEGER; BEGIN a := 2 END."}
+        {"id": 1, "ok": true, "globals": {"A": 2}, "cached": false, "elapsed": 0.0004}
+
+    or with {"ok": false, "error": {...}}. Connections are served
+    concurrently, analysis and execution run on a pool of worker
+    threads so the event loop keeps accepting clients. Programs run on
+    the StackInterpreter, deep recursion hits the call depth limit
+    rather than the Python one.
+
+    Every request is limited to max_request_size bytes, max_call_depth
+    nested calls, max_steps statements and timeout seconds. A request
+    may ask for lower limits with its own 'max_call_depth', 'max_steps'
+    and 'timeout'. The interpreter stops a program at its deadline and
+    at its step budget, freeing the worker thread.
+
+    cache_size          -- compiled programs kept in memory
+    workers             -- worker threads
+    timeout             -- seconds a request may take
+    max_call_depth      -- limit of nested procedure calls
+    max_steps           -- limit of statements run
+    max_request_size    -- limit of a request line in bytes
+    """
+
+    def __init__(self, cache_size=DEFAULT_CACHE_SIZE, workers=DEFAULT_WORKERS,
+            timeout=DEFAULT_TIMEOUT, max_call_depth=DEFAULT_MAX_CALL_DEPTH,
+            max_steps=DEFAULT_MAX_STEPS, max_request_size=DEFAULT_MAX_REQUEST_SIZE):
+        self.cache = ProgramCache(cache_size)
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix='interpreter')
+        self.timeout = timeout
+        self.max_call_depth = max_call_depth
+        self.max_steps = max_steps
+        self.max_request_size = max_request_size
+        self.server = None
+
+    async def start(self, path):
+        remove_stale_socket(path)
+        self.server = await asyncio.start_unix_server(
+                self.handle,
+                path=path,
+                limit=self.max_request_size,
+                )
+        return self.server
+
+    async def serve(self, path):
+        await self.start(path)
+        try:
+            async with self.server:
+                await self.server.serve_forever()
+        finally:
+            self.close()
+            if os.path.exists(path):
+                os.remove(path)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # the rest of the oversized line can't be told from
+                    # the next request, the connection is dropped
+                    e = RequestError(f'Request is longer than {self.max_request_size} bytes')
+                    await self.send(writer, {'id': None, 'ok': False, 'error': error_as_dict(e)})
+                    break
+
+                if not line:
+                    break
+                if line.strip():
+                    await self.send(writer, await self.respond(line))
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def send(writer, response):
+        writer.write(json.dumps(response).encode() + b'\n')
+        await writer.drain()
+
+    async def respond(self, line):
+        request_id = None
+        start = time.perf_counter()
+
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                raise RequestError(f'Invalid JSON: {e}')
+            if not isinstance(request, dict):
+                raise RequestError('Request must be a JSON object')
+
+            request_id = request.get('id')
+            globals_, cached = await self.run(request)
+        except asyncio.TimeoutError:
+            e = RequestError(f'Request took longer than {self.limit(request, "timeout")} seconds')
+            return {'id': request_id, 'ok': False, 'error': error_as_dict(e)}
+        except Exception as e:
+            return {'id': request_id, 'ok': False, 'error': error_as_dict(e)}
+
+        return {
+                'id': request_id,
+                'ok': True,
+                'globals': globals_,
+                'cached': cached,
+                'elapsed': time.perf_counter() - start,
+                }
+
+    def limit(self, request, name):
+        """
+        Returns the server limit, or the lower one of the request
+        """
+
+        limit = getattr(self, name)
+        value = request.get(name)
+        if value is None:
+            return limit
+        if not isinstance(value, (int, float)) or value <= 0:
+            raise RequestError(f'{name} must be a positive number')
+        return min(value, limit)
+
+    async def run(self, request):
+        """
+        Returns the globals of the requested program and whether it was
+        cached
+        """
+
+        timeout = self.limit(request, 'timeout')
+        max_call_depth = int(self.limit(request, 'max_call_depth'))
+        max_steps = int(self.limit(request, 'max_steps'))
+
+        if isinstance(request.get('source'), str):
+            source = request['source']
+        elif isinstance(request.get('path'), str):
+            with open(request['path']) as f:
+                source = f.read()
+        else:
+            raise RequestError('Request needs a source or a path string')
+
+        initial_globals = request.get('globals')
+        if initial_globals is not None and not isinstance(initial_globals, dict):
+            raise RequestError('globals must be a JSON object')
+
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + timeout
+
+        key = self.cache.key(source)
+        program = self.cache.get(key)
+        cached = program is not None
+
+        if not cached:
+            program = await asyncio.wait_for(
+                    loop.run_in_executor(self.executor, CompiledProgram, source),
+                    deadline - time.monotonic(),
+                    )
+            self.cache.put(key, program)
+
+        # the interpreter stops at the deadline itself, with the call
+        # stack in its error, waiting stops a little later in case one
+        # statement runs long
+        run = functools.partial(program.run, initial_globals, max_call_depth, max_steps, deadline)
+        globals_ = await asyncio.wait_for(
+                loop.run_in_executor(self.executor, run),
+                deadline - time.monotonic() + DEADLINE_GRACE,
+                )
+        return globals_, cached
+
+
+def remove_stale_socket(path):
+    """
+    Removes the socket file left at the path by a server that didn't
+    shut down cleanly, it would make the bind fail
+
+    Raises ServerError, leaving the path alone, when it is not a socket
+    or a server still accepts connections on it.
+    """
+
+    try:
+        mode = os.lstat(path).st_mode
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise ServerError(f'{path} exists and is not a socket')
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except OSError:
+            os.remove(path)
+            return
+
+    raise ServerError(f'a server is already listening on {path}')
+
+
+def main(argv=None):
+    argparser = argparse.ArgumentParser(
+            prog='interpreter serve',
+            description='Run Pascal programs sent over a Unix socket')
+    argparser.add_argument(
+            '--socket',
+            help='Path of the Unix socket',
+            required=True)
+    argparser.add_argument(
+            '--cache-size',
+            help='Compiled programs kept in memory',
+            type=int,
+            default=DEFAULT_CACHE_SIZE)
+    argparser.add_argument(
+            '--workers',
+            help='Worker threads running programs',
+            type=int,
+            default=DEFAULT_WORKERS)
+    argparser.add_argument(
+            '--timeout',
+            help='Seconds a request may take',
+            type=float,
+            default=DEFAULT_TIMEOUT)
+    argparser.add_argument(
+            '--max-call-depth',
+            help='Limit of nested procedure calls of a request',
+            type=int,
+            default=DEFAULT_MAX_CALL_DEPTH)
+    argparser.add_argument(
+            '--max-steps',
+            help='Limit of statements run by a request',
+            type=int,
+            default=DEFAULT_MAX_STEPS)
+    argparser.add_argument(
+            '--max-request-size',
+            help='Limit of a request in bytes',
+            type=int,
+            default=DEFAULT_MAX_REQUEST_SIZE)
+
+    args = argparser.parse_args(argv)
+
+    server = Server(
+            cache_size=args.cache_size,
+            workers=args.workers,
+            timeout=args.timeout,
+            max_call_depth=args.max_call_depth,
+            max_steps=args.max_steps,
+            max_request_size=args.max_request_size,
+            )
+
+    try:
+        asyncio.run(server.serve(args.socket))
+    except ServerError as e:
+        argparser.exit(1, f'{argparser.prog}: {e}\n')
+    except KeyboardInterrupt:
+        pass
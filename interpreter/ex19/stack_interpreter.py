@@ -0,0 +1,292 @@
+import asyncio
+from .interpreter import Interpreter
+from .memory import ARType
+from .error import InterpreterError, ErrorCode
+from .tracer import NULL_TRACER
+from .ast import *
+
+DEFAULT_MAX_CALL_DEPTH = 100000
+DEFAULT_SLICE_STEPS = 1000
+
+# instructions of the postfix form of an expression
+PUSH_CONST = 0
+LOAD_VAR = 1
+BINARY = 2
+NEGATE = 3
+
+
+class StackInterpreter(Interpreter):
+    """
+    Non-recursive tree-walking interpreter
+
+    Statements run from an explicit work stack of statement iterators,
+    a procedure call pushes the iterator of the procedure's body, so
+    the Pascal call depth doesn't consume Python frames. Expressions
+    are flattened once into postfix code evaluated with a value stack.
+
+    As the whole state of a run is on the work stack, a run can stop
+    between two statements and go on later: run_async gives control
+    back to the event loop every slice of statements.
+
+    ast             -- program tree
+    max_call_depth  -- limit of nested procedure calls
+    initial_globals -- global variable name -> value assigned before the run
+    tracer          -- receiver of the call stack trace
+    max_steps       -- limit of statements run
+    deadline        -- time.monotonic() the run must end by
+    """
+
+    def __init__(self, ast, max_call_depth=DEFAULT_MAX_CALL_DEPTH, initial_globals=None,
+            tracer=NULL_TRACER, max_steps=None, deadline=None):
+        super().__init__(ast, initial_globals, tracer, max_steps, deadline)
+        self.max_call_depth = max_call_depth
+        self.exprs = {}         # expression node -> postfix code
+        self.slice_steps = None # statements between two yields of run_slices
+        self.slice_end = float('inf')
+
+    def enter_program(self, node):
+        ar = self.program_record(node)
+        self.ar = ar
+        self.display = self.call_stack.display
+        self.call_stack.push(ar)
+
+        self.log(f'ENTER: PROGRAM {node.variable.name}')
+        self.log(self.call_stack)
+
+    def leave_program(self, node):
+        self.log(f'LEAVE: PROGRAM {node.variable.name}')
+        self.log(self.call_stack)
+
+        self.call_stack.pop()
+
+    def visit_Program(self, node):
+        self.enter_program(node)
+        self.run(node.block)
+        self.leave_program(node)
+
+    async def run_async(self, slice_steps=DEFAULT_SLICE_STEPS):
+        """
+        Runs the program as a coroutine
+
+        The run suspends before every slice_steps-th statement and lets
+        the event loop run other tasks, so many programs share one
+        thread. A cancelled run, or one stopped by an error, pops its
+        records off the call stack.
+        """
+
+        self.slice_steps = slice_steps
+        self.slice_end = slice_steps
+        node = self.ast
+
+        try:
+            self.prepare()
+            self.enter_program(node)
+
+            slices = self.run_slices(node.block)
+            try:
+                for _ in slices:
+                    await asyncio.sleep(0)
+            except BaseException:
+                slices.close()
+                self.call_stack.unwind()
+                raise
+
+            self.leave_program(node)
+        finally:
+            self.slice_steps = None
+            self.slice_end = float('inf')
+
+    def schedule(self):
+        period = super().schedule()
+
+        if self.slice_steps:
+            left = self.slice_end - self.steps
+            if period == -1 or left < period:
+                period = left
+            self.period = period
+
+        return period
+
+    def run(self, block):
+        for _ in self.run_slices(block):
+            pass
+
+    def run_slices(self, block):
+        """
+        Runs the block, yields before the statement ending every slice
+        """
+
+        call_stack = self.call_stack
+        evaluate = self.evaluate
+        display = self.display
+        tracer = self.tracer
+        tracing = tracer.enabled
+        countdown = self.countdown
+        frame = self.ar
+        depth = 0
+
+        # every entry is a statement iterator, the record its statements
+        # run in and whether the record is popped once the iterator is
+        # exhausted
+        work = [(iter(block.compound_statement.leaves), frame, False)]
+
+        while work:
+            statements, frame, is_call = work[-1]
+
+            for node in statements:
+                countdown -= 1
+                if not countdown:
+                    if self.steps + self.period >= self.slice_end:
+                        # the limits are checked once the run resumes
+                        self.slice_end += self.slice_steps
+                        yield
+                    countdown = self.check_limits(node)
+
+                if isinstance(node, Assign):
+                    nesting_level, slot = node.left.address
+                    display[nesting_level].slots[slot] = evaluate(node.right, depth)
+
+                elif isinstance(node, ProcCall):
+                    if depth == self.max_call_depth:
+                        self.call_depth_error(node)
+
+                    proc_symbol = node.symbol
+                    body = proc_symbol.body
+                    callee = call_stack.new_record(
+                            key=proc_symbol,
+                            name=node.name,
+                            type=ARType.PROCEDURE,
+                            nesting_level=proc_symbol.scope_level+1,
+                            slot_names=body.slot_names,
+                            )
+
+                    slots = callee.slots
+                    for slot, argument_node in enumerate(node.actual_params):
+                        slots[slot] = evaluate(argument_node, depth)
+
+                    call_stack.push(callee)
+                    if tracing:
+                        tracer.trace(f'ENTER: PROCEDURE {node.name}')
+                        tracer.trace(call_stack)
+
+                    depth += 1
+                    work.append((iter(body.compound_statement.leaves), callee, True))
+                    break
+
+                elif isinstance(node, Compound):
+                    work.append((iter(node.leaves), frame, False))
+                    break
+
+            else:
+                work.pop()
+                if is_call:
+                    if tracing:
+                        tracer.trace(f'LEAVE: PROCEDURE {frame.name}')
+                        tracer.trace(call_stack)
+                    call_stack.pop()
+                    depth -= 1
+
+    def call_depth_error(self, node):
+        error_code = ErrorCode.CALL_DEPTH_EXCEEDED
+        raise InterpreterError(
+                error_code=error_code,
+                token=node.token,
+                message=f'{error_code.value} ({self.max_call_depth}) -> {node.token}',
+                )
+
+    def evaluate(self, node, depth):
+        """
+        Evaluates an expression at the call depth
+
+        The language has no loops, so the statements of the program
+        body run once and only procedure bodies are worth keeping the
+        postfix code for.
+        """
+
+        if isinstance(node, Num):
+            return node.value
+
+        if isinstance(node, Var):
+            nesting_level, slot = node.address
+            var_val = self.display[nesting_level].slots[slot]
+            if var_val is None:
+                raise NameError(repr(node.name))
+            return var_val
+
+        if depth:
+            code = self.exprs.get(node)
+            if code is None:
+                code = self.exprs[node] = self.flatten(node)
+        else:
+            code = self.flatten(node)
+
+        display = self.display
+        stack = []
+        push = stack.append
+        pop = stack.pop
+
+        for instr in code:
+            kind = instr[0]
+
+            if kind == PUSH_CONST:
+                push(instr[1])
+            elif kind == LOAD_VAR:
+                var_val = display[instr[1]].slots[instr[2]]
+                if var_val is None:
+                    raise NameError(repr(instr[3]))
+                push(var_val)
+            elif kind == BINARY:
+                right = pop()
+                left = stack[-1]
+                op = instr[1]
+                if op == OP_PLUS:
+                    stack[-1] = left + right
+                elif op == OP_MINUS:
+                    stack[-1] = left - right
+                elif op == OP_MUL:
+                    stack[-1] = left * right
+                elif op == OP_INTEGER_DIV:
+                    stack[-1] = left // right
+                elif op == OP_FLOAT_DIV:
+                    stack[-1] = left / right
+            else:
+                stack[-1] = -stack[-1]
+
+        return stack[0]
+
+    @staticmethod
+    def flatten(node):
+        """
+        Returns the postfix code of an expression
+
+        The tree is walked with an explicit stack too, so flattening and
+        evaluation take no Python frames per level of nesting.
+        """
+
+        code = []
+        pending = [(node, False)]
+
+        while pending:
+            node, expanded = pending.pop()
+
+            if isinstance(node, Num):
+                code.append((PUSH_CONST, node.value))
+            elif isinstance(node, Var):
+                nesting_level, slot = node.address
+                code.append((LOAD_VAR, nesting_level, slot, node.name))
+            elif isinstance(node, BinOp):
+                if expanded:
+                    code.append((BINARY, node.op))
+                else:
+                    pending.append((node, True))
+                    pending.append((node.right, False))
+                    pending.append((node.left, False))
+            elif isinstance(node, UnOp):
+                if expanded:
+                    if node.op == OP_MINUS:
+                        code.append((NEGATE,))
+                else:
+                    pending.append((node, True))
+                    pending.append((node.factor, False))
+
+        return tuple(code)
@@ -1,8 +1,16 @@
-SHOULD_LOG_SCOPE = False
+import warnings
 
 def enable_log():
-    global SHOULD_LOG_SCOPE
-    SHOULD_LOG_SCOPE = True
+    """
+    Deprecated, scope logging is enabled per analyzer by its tracer
+    """
+
+    warnings.warn(
+            'enable_log() has no effect, pass a tracer to the analyzer: '
+            'SemanticAnalyzer(Tracer(sys.stdout))',
+            DeprecationWarning,
+            stacklevel=2,
+            )
 
 
 # Symbols region {{{
@@ -27,6 +35,7 @@ class BuiltinTypeSymbol(Symbol):
 class VarSymbol(Symbol):
     def __init__(self, name, type):
         super().__init__(name, type)
+        self.slot = None
 
     def __str__(self):
         return f'{self.name}: <{self.type}>'
@@ -53,6 +62,7 @@ from collections import OrderedDict
 class ScopedSymbolTable:
     def __init__(self, scope_name, scope_level, enclosing_scope=None):
         self.__symbols = OrderedDict()
+        self.var_symbols = []
         self.scope_name = scope_name
         self.scope_level = scope_level
         self.enclosing_scope = enclosing_scope
@@ -79,6 +89,14 @@ class ScopedSymbolTable:
         symbol.scope_level = self.scope_level
         self.__symbols[symbol.name] = symbol
 
+        if isinstance(symbol, VarSymbol):
+            symbol.slot = len(self.var_symbols)
+            self.var_symbols.append(symbol)
+
+    @property
+    def slot_names(self):
+        return tuple(symbol.name for symbol in self.var_symbols)
+
     def try_lookup(self, name, current_scope_only=False):
         symbol = self.__symbols.get(name)
 
@@ -93,10 +111,6 @@ class ScopedSymbolTable:
     def init_builtins(self):
         self.insert(BuiltinTypeSymbol('INTEGER'))
         self.insert(BuiltinTypeSymbol('REAL'))
-        
-    def log(self, msg):
-        if SHOULD_LOG_SCOPE:
-            print(msg)
 # }}}
 
 
@@ -105,10 +119,12 @@ from .visitor import NodeVisitor
 from . import ast
 from .error import SemanticError, ErrorCode
 from .token import Token
+from .tracer import NULL_TRACER
 
 class SemanticAnalyzer(NodeVisitor):
-    def __init__(self):
+    def __init__(self, tracer=NULL_TRACER):
         self.current_scope = None
+        self.tracer = tracer
 
     def error(self, error_code: ErrorCode, token: Token):
         raise SemanticError(
@@ -128,6 +144,7 @@ class SemanticAnalyzer(NodeVisitor):
 
         self.current_scope = global_scope
         self.visit(node.block)
+        node.block.slot_names = global_scope.slot_names
         self.log(global_scope)
         self.current_scope = self.current_scope.enclosing_scope
         self.log('Leave scope: global')
@@ -140,11 +157,12 @@ class SemanticAnalyzer(NodeVisitor):
     def visit_VarDecl(self, node: ast.VarDecl):
         type_name = node.type.token.value
         type_symbol = self.current_scope.try_lookup(type_name)
-        var_name = node.name.token.value
+        var_name = node.name.name
         var_symbol = VarSymbol(var_name, type_name)
 
         if self.current_scope.try_lookup(var_name, current_scope_only=True) is None:
             self.current_scope.insert(var_symbol)
+            node.name.address = (var_symbol.scope_level, var_symbol.slot)
         else:
             self.error(
                     error_code=ErrorCode.DUPLICATE_ID,
@@ -165,13 +183,15 @@ class SemanticAnalyzer(NodeVisitor):
         for param in node.params:
             type_name = param.type_node.token.value
             type_symbol = self.current_scope.try_lookup(type_name)
-            var_name = param.var_node.token.value
+            var_name = param.var_node.name
             var_symbol = VarSymbol(var_name, type_name)
             proc_scope.insert(var_symbol)
             proc_symbol.params.append(var_symbol)
+            param.var_node.address = (var_symbol.scope_level, var_symbol.slot)
 
         self.current_scope = proc_scope
         self.visit(node.body)
+        node.body.slot_names = proc_scope.slot_names
         self.log(proc_scope)
         self.current_scope = self.current_scope.enclosing_scope
         self.log(f'Leave scope {proc_name}')
@@ -214,7 +234,7 @@ class SemanticAnalyzer(NodeVisitor):
         self.visit(node.right)
 
     def visit_Var(self, node):
-        var_name = node.token.value
+        var_name = node.name
         var_symbol = self.current_scope.try_lookup(var_name)
 
         if var_symbol is None:
@@ -223,20 +243,35 @@ class SemanticAnalyzer(NodeVisitor):
                     token=node.token,
                     )
 
+        node.address = (var_symbol.scope_level, var_symbol.slot)
+
     def visit_NoOp(self, node):
         pass
 
     def visit_BinOp(self, node):
-        self.visit(node.left)
-        self.visit(node.right)
+        self.walk_expression(node)
 
     def visit_Num(self, node):
         pass
 
     def visit_UnOp(self, node):
-        self.visit(node.factor)
+        self.walk_expression(node)
+
+    def walk_expression(self, node):
+        # an explicit stack, so neither long operator chains nor deep
+        # nesting take Python frames
+        pending = [node]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, ast.BinOp):
+                pending.append(node.right)
+                pending.append(node.left)
+            elif isinstance(node, ast.UnOp):
+                pending.append(node.factor)
+            elif isinstance(node, ast.Var):
+                self.visit_Var(node)
 
     def log(self, msg):
-        if SHOULD_LOG_SCOPE:
-            print(msg)
+        if self.tracer.enabled:
+            self.tracer.trace(msg)
 # }}}
@@ -0,0 +1,102 @@
+import json
+import sys
+import time
+from contextlib import contextmanager
+from .ast import Ast
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, the peak memory isn't reported there
+    resource = None
+
+
+class Timings:
+    """
+    Wall and CPU time of the pipeline phases
+
+    phases      -- (name, wall seconds, CPU seconds) in the order run
+    counters    -- named counts: tokens, AST nodes, ...
+    """
+
+    def __init__(self):
+        self.phases = []
+        self.counters = {}
+
+    @contextmanager
+    def phase(self, name):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.phases.append((
+                    name,
+                    time.perf_counter() - wall,
+                    time.process_time() - cpu,
+                    ))
+
+    def as_dict(self):
+        return {
+                'phases': [{'name': name, 'wall': wall, 'cpu': cpu}
+                    for name, wall, cpu in self.phases],
+                'total': {
+                    'wall': sum(wall for _, wall, _ in self.phases),
+                    'cpu': sum(cpu for _, _, cpu in self.phases),
+                    },
+                **self.counters,
+                'peak_memory': peak_memory(),
+                }
+
+    def to_json(self):
+        return json.dumps(self.as_dict())
+
+    def report(self):
+        data = self.as_dict()
+        lines = [f'{"phase":<12} {"wall ms":>10} {"cpu ms":>10}']
+
+        for phase in data['phases'] + [dict(name='total', **data['total'])]:
+            lines.append(f'{phase["name"]:<12} {phase["wall"] * 1000:10.3f} {phase["cpu"] * 1000:10.3f}')
+
+        for name, count in self.counters.items():
+            if count is not None:
+                lines.append(f'{name:<12} {count:>10}')
+
+        if data['peak_memory'] is not None:
+            lines.append(f'{"peak memory":<12} {data["peak_memory"] / 1024 / 1024:>7.1f} MiB')
+
+        return '\n'.join(lines)
+
+
+def peak_memory():
+    """
+    Returns the peak resident set size of the process in bytes
+    """
+
+    if resource is None:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+def count_nodes(tree):
+    """
+    Returns the number of nodes of the tree
+    """
+
+    count = 0
+    pending = [tree]
+
+    while pending:
+        node = pending.pop()
+        count += 1
+
+        for cls in type(node).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                value = getattr(node, name, None)
+                if isinstance(value, Ast):
+                    pending.append(value)
+                elif isinstance(value, list):
+                    pending.extend(item for item in value if isinstance(item, Ast))
+
+    return count
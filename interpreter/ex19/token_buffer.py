@@ -0,0 +1,184 @@
+import re
+from array import array
+from bisect import bisect_right
+from .token_type import TokenType
+from .token import Token
+from .lexer import TOKEN_PATTERN, SINGLE_CHAR_TOKENS, build_reserved_keywords
+from . import error
+
+TOKEN_TYPES = tuple(TokenType)
+TOKEN_CODES = {tok_type: code for code, tok_type in enumerate(TOKEN_TYPES)}
+TOKEN_VALUES = tuple(tok_type.value for tok_type in TOKEN_TYPES)
+
+EOF_CODE = TOKEN_CODES[TokenType.EOF]
+ID_CODE = TOKEN_CODES[TokenType.ID]
+INTEGER_CONST_CODE = TOKEN_CODES[TokenType.INTEGER_CONST]
+REAL_CONST_CODE = TOKEN_CODES[TokenType.REAL_CONST]
+ASSIGN_CODE = TOKEN_CODES[TokenType.ASSIGN]
+SINGLE_CHAR_CODES = {char: TOKEN_CODES[tok_type]
+        for char, tok_type in SINGLE_CHAR_TOKENS.items()}
+RESERVED_CODES = {keyword: TOKEN_CODES[tok_type]
+        for keyword, tok_type in build_reserved_keywords().items()}
+
+
+class TokenBuffer:
+    """
+    The whole source lexed at once into parallel arrays
+
+    types       -- token type codes, indexes of TOKEN_TYPES
+    starts      -- token offsets in the text
+    lengths     -- token lengths
+    value_ids   -- indexes in values, 0 for tokens valued by their type
+    values      -- interned identifiers and constants, values[0] is None
+    line_starts -- offsets of the lines beginning
+
+    The last token is always EOF.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.types = array('B')
+        self.starts = array('I')
+        self.lengths = array('I')
+        self.value_ids = array('I')
+        self.values = [None]
+        self.line_starts = array('I', [0])
+        self.line_starts.extend(m.end() for m in re.finditer('\n', text))
+        self.tokenize()
+
+    def __len__(self):
+        return len(self.types)
+
+    def tokenize(self):
+        text = self.text
+        match = TOKEN_PATTERN.match
+        add_type = self.types.append
+        add_start = self.starts.append
+        add_length = self.lengths.append
+        add_value_id = self.value_ids.append
+        values = self.values
+        interned = {}
+        pos = 0
+
+        while True:
+            m = match(text, pos)
+            kind = m.lastgroup
+            start = m.start(kind)
+            pos = m.end()
+            value_id = 0
+
+            if kind == 'ID':
+                value = m.group(kind).upper()
+                code = RESERVED_CODES.get(value)
+                if code is None:
+                    code = ID_CODE
+                    value_id = interned.get(value)
+                    if value_id is None:
+                        value_id = interned[value] = len(values)
+                        values.append(value)
+            elif kind == 'SINGLE_CHAR':
+                code = SINGLE_CHAR_CODES[m.group(kind)]
+            elif kind == 'INTEGER_CONST' or kind == 'REAL_CONST':
+                lexeme = m.group(kind)
+                if kind == 'INTEGER_CONST':
+                    code, value = INTEGER_CONST_CODE, int(lexeme)
+                else:
+                    code, value = REAL_CONST_CODE, float(lexeme)
+                key = (code, lexeme)
+                value_id = interned.get(key)
+                if value_id is None:
+                    value_id = interned[key] = len(values)
+                    values.append(value)
+            elif kind == 'ASSIGN':
+                code = ASSIGN_CODE
+            elif kind == 'EOF':
+                code = EOF_CODE
+            else:
+                self.error(start)
+
+            add_type(code)
+            add_start(start)
+            add_length(pos - start)
+            add_value_id(value_id)
+
+            if code == EOF_CODE:
+                break
+
+    def error(self, pos):
+        lineno, column = self.position(pos)
+        s = f"Lexer error on '{self.text[pos]}' line: {lineno} column: {column}"
+        token = Token(None, self.text[pos], lineno, column)
+        raise error.LexerError(token=token, message=s)
+
+    def position(self, pos):
+        line = bisect_right(self.line_starts, pos)
+        return line, pos - self.line_starts[line - 1] + 1
+
+    def token(self, index):
+        """
+        Builds Token object for the token at the index
+        """
+
+        code = self.types[index]
+
+        if code == EOF_CODE:
+            return Token(TokenType.EOF, None)
+
+        value_id = self.value_ids[index]
+        value = self.values[value_id] if value_id else TOKEN_VALUES[code]
+        start = self.starts[index]
+        line = bisect_right(self.line_starts, start)
+        column = start - self.line_starts[line - 1] + 1
+        return Token(TOKEN_TYPES[code], value, line, column)
+
+    def cursor(self):
+        return TokenCursor(self)
+
+
+class TokenCursor:
+    """
+    Reads a TokenBuffer through the Lexer interface used by Parser
+
+    Tokens are materialized one by one as the parser asks for them,
+    any token ahead is available through peek_type without that.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        self.index = -1                 # index of the last returned token
+        self.last = len(buffer) - 1     # index of the EOF token
+        self.line = 1                   # line of the last returned token
+
+    @property
+    def cur_char(self):
+        buffer = self.buffer
+        pos = buffer.starts[self.index] + buffer.lengths[self.index]
+        return buffer.text[pos] if pos < len(buffer.text) else None
+
+    def peek_type(self, offset=1):
+        index = min(self.index + offset, self.last)
+        return TOKEN_TYPES[self.buffer.types[index]]
+
+    def get_next_token(self):
+        index = self.index
+        if index < self.last:
+            self.index = index = index + 1
+
+        buffer = self.buffer
+        code = buffer.types[index]
+
+        if code == EOF_CODE:
+            return Token(TokenType.EOF, None)
+
+        value_id = buffer.value_ids[index]
+        value = buffer.values[value_id] if value_id else TOKEN_VALUES[code]
+
+        # tokens are read in order, so the line only moves forward
+        start = buffer.starts[index]
+        line_starts = buffer.line_starts
+        line = self.line
+        while line < len(line_starts) and line_starts[line] <= start:
+            line += 1
+        self.line = line
+
+        return Token(TOKEN_TYPES[code], value, line, start - line_starts[line - 1] + 1)
@@ -0,0 +1,38 @@
+import sys
+
+
+class Tracer:
+    """
+    Receiver of the trace messages of an analyzer or interpreter
+
+    Every analyzer and interpreter has its own tracer, so interpreters
+    running in threads of one process trace independently. Call sites
+    test the enabled attribute before building a message, a disabled
+    tracer costs that single check.
+
+    stream  -- file the messages are printed to, the current sys.stdout
+               when None
+    """
+
+    enabled = True
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def trace(self, msg):
+        print(msg, file=self.stream or sys.stdout)
+
+
+class NullTracer(Tracer):
+    """
+    Tracer dropping every message, the default of analyzers and
+    interpreters
+    """
+
+    enabled = False
+
+    def trace(self, msg):
+        pass
+
+
+NULL_TRACER = NullTracer()
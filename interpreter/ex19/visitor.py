@@ -1,9 +1,33 @@
 class NodeVisitor:
+    """
+    Dispatches a node to the visit_<NodeClassName> method
+
+    Every visitor class keeps its own table from node classes to the
+    visit functions, a node class is resolved on its first visit, so
+    later visits cost one dictionary lookup. A node class without a
+    visit method goes to generic_visit. Subclasses get their own table
+    and see the methods they override.
+    """
+
+    _visitors = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._visitors = {}
+
     def generic_visit(self, node):
         node_type = type(node).__name__
         raise Exception(f'No visit_{node_type} method')
 
     def visit(self, node):
-        method_name = 'visit_' + type(node).__name__
-        visitor = getattr(self, method_name, self.generic_visit)
-        return visitor(node)
+        try:
+            visitor = self._visitors[type(node)]
+        except KeyError:
+            visitor = self._resolve(type(node))
+        return visitor(self, node)
+
+    @classmethod
+    def _resolve(cls, node_class):
+        visitor = getattr(cls, 'visit_' + node_class.__name__, cls.generic_visit)
+        cls._visitors[node_class] = visitor
+        return visitor
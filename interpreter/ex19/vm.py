@@ -0,0 +1,127 @@
+from .bytecode import OpCode
+
+LOAD_CONST = int(OpCode.LOAD_CONST)
+LOAD_LOCAL = int(OpCode.LOAD_LOCAL)
+STORE_LOCAL = int(OpCode.STORE_LOCAL)
+LOAD_VAR = int(OpCode.LOAD_VAR)
+STORE_VAR = int(OpCode.STORE_VAR)
+ADD = int(OpCode.ADD)
+SUB = int(OpCode.SUB)
+MUL = int(OpCode.MUL)
+INTEGER_DIV = int(OpCode.INTEGER_DIV)
+FLOAT_DIV = int(OpCode.FLOAT_DIV)
+NEG = int(OpCode.NEG)
+CALL = int(OpCode.CALL)
+RET = int(OpCode.RET)
+HALT = int(OpCode.HALT)
+
+
+class VM:
+    """
+    Stack virtual machine running Bytecode produced by Compiler
+
+    Frames are plain lists of slots. The display holds the innermost
+    active frame of every nesting level, so a variable of any enclosing
+    procedure is reached by a single index.
+    """
+
+    def __init__(self, bytecode):
+        self.bytecode = bytecode
+        self.globals = None
+
+    def get_var_value(self, var_name):
+        var_name = var_name.upper()
+        slot_names = self.bytecode.main.slot_names
+        if var_name not in slot_names:
+            return None
+        return self.globals[slot_names.index(var_name)]
+
+    def interpret(self):
+        bytecode = self.bytecode
+        code = bytecode.code
+        consts = bytecode.consts
+        procs = bytecode.procs
+
+        frame = [None] * len(bytecode.main.slot_names)
+        display = [None, frame]
+        self.globals = frame
+
+        stack = []
+        push = stack.append
+        pop = stack.pop
+        frames = []                 # (return address, level, saved frame)
+        pc = 0
+
+        while True:
+            op = code[pc]
+
+            if op == LOAD_LOCAL:
+                value = frame[code[pc+1]]
+                if value is None:
+                    self.name_error(pc)
+                push(value)
+                pc += 2
+            elif op == LOAD_CONST:
+                push(consts[code[pc+1]])
+                pc += 2
+            elif op == STORE_LOCAL:
+                frame[code[pc+1]] = pop()
+                pc += 2
+            elif op == ADD:
+                right = pop()
+                stack[-1] += right
+                pc += 1
+            elif op == MUL:
+                right = pop()
+                stack[-1] *= right
+                pc += 1
+            elif op == SUB:
+                right = pop()
+                stack[-1] -= right
+                pc += 1
+            elif op == LOAD_VAR:
+                value = display[code[pc+1]][code[pc+2]]
+                if value is None:
+                    self.name_error(pc)
+                push(value)
+                pc += 3
+            elif op == STORE_VAR:
+                display[code[pc+1]][code[pc+2]] = pop()
+                pc += 3
+            elif op == INTEGER_DIV:
+                right = pop()
+                stack[-1] //= right
+                pc += 1
+            elif op == FLOAT_DIV:
+                right = pop()
+                stack[-1] /= right
+                pc += 1
+            elif op == NEG:
+                stack[-1] = -stack[-1]
+                pc += 1
+            elif op == CALL:
+                proc = procs[code[pc+1]]
+                argc = code[pc+2]
+                level = proc.level
+
+                if argc:
+                    new_frame = stack[-argc:]
+                    del stack[-argc:]
+                else:
+                    new_frame = []
+                new_frame.extend([None] * (len(proc.slot_names) - argc))
+
+                if len(display) <= level:
+                    display.append(None)
+                frames.append((pc + 3, level, display[level], frame))
+                display[level] = frame = new_frame
+                pc = proc.entry
+            elif op == RET:
+                pc, level, display[level], frame = frames.pop()
+            elif op == HALT:
+                break
+            else:
+                raise RuntimeError(f'Unknown opcode {op} at {pc}')
+
+    def name_error(self, pc):
+        raise NameError(repr(self.bytecode.names[pc]))
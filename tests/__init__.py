@@ -2,13 +2,58 @@ import unittest
 from .ln_translator_tests import LNTranslatorTests
 from .rpn_translator_tests import RPNTranslatorTests
 from .integration_tests import IntegrationTests
-from .lexer_tests import LexerTests
+from .lexer_tests import LexerTests, RegexLexerTests, TokenBufferTests
+from .vm_tests import VMTests
+from .engine_tests import EngineTests
+from .python_transpiler_tests import PythonTranspilerTests
+from .cache_tests import CompileCacheTests
+from .parser_tests import ExprParserTests
+from .arena_tests import ArenaTests
+from .optimizer_tests import ConstantFolderTests
+from .visitor_tests import NodeVisitorTests
+from .stack_interpreter_tests import StackInterpreterTests
+from .memory_tests import CallStackTests
+from .timings_tests import TimingsTests
+from .profiler_tests import ProfilerTests
+from .line_profiler_tests import LineSamplerTests
+from .benchmark_tests import ProgramGeneratorTests, RunnerTests, StagesTests
+from .server_tests import ProgramCacheTests, ServerTests
+from .batch_tests import BatchTests
+from .program_tests import CompiledProgramTests
+from .tracer_tests import TracerTests
+from .limits_tests import LimitsTests
+from .async_tests import AsyncRunTests
 
 test_cases = (
         LNTranslatorTests,
         RPNTranslatorTests,
         IntegrationTests,
-        LexerTests
+        LexerTests,
+        RegexLexerTests,
+        TokenBufferTests,
+        VMTests,
+        EngineTests,
+        PythonTranspilerTests,
+        CompileCacheTests,
+        ExprParserTests,
+        ArenaTests,
+        ConstantFolderTests,
+        NodeVisitorTests,
+        StackInterpreterTests,
+        CallStackTests,
+        TimingsTests,
+        ProfilerTests,
+        LineSamplerTests,
+        ProgramGeneratorTests,
+        RunnerTests,
+        StagesTests,
+        ProgramCacheTests,
+        ServerTests,
+        BatchTests,
+        CompiledProgramTests,
+        TracerTests,
+        LimitsTests,
+        AsyncRunTests,
         )
 
 def main():
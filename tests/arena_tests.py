@@ -0,0 +1,113 @@
+import unittest
+from interpreter.ex19 import Lexer, Parser, SemanticAnalyzer, ConstantFolder, Interpreter, Engine, Compiler, VM
+from interpreter.ex19.arena import Arena
+from interpreter.ex19.ast import BinOp, Var, Num, OP_MINUS, OP_INTEGER_DIV
+from interpreter.ex19.token_type import TokenType
+
+PROGRAM = r'''
+PROGRAM Arena;
+VAR
+    a, b, c : INTEGER;
+    y       : REAL;
+
+PROCEDURE P1(x : INTEGER);
+VAR
+    z : INTEGER;
+
+    PROCEDURE P2(w : INTEGER);
+    BEGIN
+        c := x + w * z;
+    END;
+
+BEGIN {P1}
+    z := x DIV 2;
+    P2(x - 1);
+END;
+
+BEGIN {Arena}
+    a := 7;
+    b := - a + 10 * a DIV 4;
+    y := 20 / 8 + 3.14 / a;
+    P1(a);
+END. {Arena}
+'''
+
+def parse(text):
+    return Parser(Lexer(text)).parse()
+
+class ArenaTests(unittest.TestCase):
+    def test_slotted_nodes(self):
+        tree = parse(PROGRAM)
+        assign = tree.block.compound_statement.leaves[1]
+        self.assertFalse(hasattr(assign, '__dict__'))
+        self.assertFalse(hasattr(assign.right, '__dict__'))
+
+    def test_operator_codes(self):
+        assign = parse(PROGRAM).block.compound_statement.leaves[1]
+        binop = assign.right
+        self.assertIsInstance(binop, BinOp)
+        self.assertEqual(binop.left.op, OP_MINUS)
+        self.assertEqual(binop.right.op, OP_INTEGER_DIV)
+        self.assertEqual(binop.right.token.type, TokenType.INTEGER_DIV)
+        self.assertEqual(assign.left.token.value, 'B')
+
+    def test_views(self):
+        arena = Arena.from_tree(parse(PROGRAM))
+        assign = arena.root.block.compound_statement.leaves[1]
+        self.assertIsInstance(assign.left, Var)
+        self.assertEqual(assign.left.name, 'B')
+        self.assertEqual(assign.right.op, parse(PROGRAM).block.compound_statement.leaves[1].right.op)
+        self.assertEqual(assign.left, arena.root.block.compound_statement.leaves[1].left)
+
+    def test_interpret_arena(self):
+        tree = Interpreter(parse(PROGRAM))
+        tree.interpret()
+
+        for cls in (Interpreter, Engine):
+            interpreter = cls(Arena.from_tree(parse(PROGRAM)).root)
+            interpreter.interpret()
+            for name in ('a', 'b', 'c', 'y'):
+                self.assertEqual(interpreter.get_var_value(name), tree.get_var_value(name))
+
+        root = Arena.from_tree(parse(PROGRAM)).root
+        SemanticAnalyzer().visit(root)
+        vm = VM(Compiler().compile(root))
+        vm.interpret()
+        for name in ('a', 'b', 'c', 'y'):
+            self.assertEqual(vm.get_var_value(name), tree.get_var_value(name))
+
+    def test_fold_arena(self):
+        program_code = r'''
+        PROGRAM Fold;
+        VAR
+            a, b : INTEGER;
+        PROCEDURE P(c : INTEGER);
+        BEGIN
+            a := c * (2 + 2) + 0;
+        END;
+        BEGIN
+            b := 20 DIV 8 * 3;
+            P(1 + 1 + 1);
+        END.
+        '''
+
+        tree = parse(program_code)
+        SemanticAnalyzer().visit(tree)
+        arena = Arena.from_tree(parse(program_code))
+        root = arena.root
+        SemanticAnalyzer().visit(root)
+
+        self.assertEqual(ConstantFolder().fold(root), ConstantFolder().fold(tree))
+        assign, call = root.block.compound_statement.leaves[:2]
+        self.assertIsInstance(assign.right, Num)
+        self.assertEqual(assign.right.value, 6)
+        self.assertIsInstance(call.actual_params[0], Num)
+
+        body = root.block.declarations[-1].body.compound_statement.leaves[0]
+        self.assertIsInstance(body.right, BinOp)
+        self.assertIsInstance(body.right.left, Var)
+        self.assertEqual(body.right.right.value, 4)
+
+        interpreter = Interpreter(root)
+        interpreter.interpret()
+        self.assertEqual((interpreter.get_var_value('a'), interpreter.get_var_value('b')), (12, 6))
@@ -0,0 +1,96 @@
+import asyncio
+import time
+import unittest
+from interpreter.ex19 import StackInterpreter, CompiledProgram
+from interpreter.ex19.error import LimitExceededError, ErrorCode
+from .programs import two_calls_code, fan_out, analyze
+
+class AsyncRunTests(unittest.TestCase):
+    def test_same_result(self):
+        program = CompiledProgram(fan_out(10))
+        for slice_steps in (1, 7, 1000, 10 ** 6):
+            result = asyncio.run(program.run_async(slice_steps=slice_steps))
+            self.assertEqual(result, program.run())
+
+    def test_yields_every_slice(self):
+        # fan_out(7) runs 2 + 2 ** 7 - 2 + 2 ** 6 statements
+        program = CompiledProgram(fan_out(7))
+        ticks = []
+
+        async def main():
+            run = asyncio.ensure_future(program.run_async(slice_steps=10))
+            while not run.done():
+                ticks.append(None)
+                await asyncio.sleep(0)
+            return run.result()
+
+        self.assertEqual(asyncio.run(main()), {'N': 64})
+        self.assertEqual(len(ticks), 192 // 10 + 1)
+
+    def test_programs_interleave(self):
+        program = CompiledProgram(fan_out(8))
+        order = []
+
+        async def run(i):
+            result = await program.run_async({'n': i}, slice_steps=50)
+            order.append(i)
+            return result
+
+        async def main():
+            return await asyncio.gather(*(run(i) for i in range(100)))
+
+        results = asyncio.run(main())
+        self.assertEqual(results, [{'N': 128}] * 100)
+        self.assertEqual(sorted(order), list(range(100)))
+
+        # a run ending in one slice finishes before longer ones go on
+        short = CompiledProgram(two_calls_code)
+
+        async def mixed():
+            long = asyncio.ensure_future(program.run_async(slice_steps=50))
+            await short.run_async(slice_steps=50)
+            self.assertFalse(long.done())
+            return await long
+
+        self.assertEqual(asyncio.run(mixed()), {'N': 128})
+
+    def test_cancel_unwinds(self):
+        interpreter = StackInterpreter(analyze(fan_out(30)))
+
+        async def main():
+            run = asyncio.ensure_future(interpreter.run_async(slice_steps=100))
+            for _ in range(20):
+                await asyncio.sleep(0)
+            self.assertGreater(len(interpreter.call_stack.names()), 20)
+            run.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await run
+
+        asyncio.run(main())
+        self.assertTrue(interpreter.call_stack.is_empty())
+        self.assertEqual(set(interpreter.call_stack.display), {None})
+        self.assertIsNone(interpreter.slice_steps)
+
+        # the interpreter runs again after the cancelled run
+        interpreter = StackInterpreter(analyze(two_calls_code))
+        asyncio.run(interpreter.run_async(slice_steps=1))
+        self.assertEqual(interpreter.get_var_value('r'), 18)
+
+    def test_limits(self):
+        program = CompiledProgram(two_calls_code)
+        for slice_steps in (1, 3, 100):
+            self.assertEqual(asyncio.run(program.run_async(
+                    slice_steps=slice_steps, max_steps=7)), {'R': 18})
+
+            with self.assertRaises(LimitExceededError) as context:
+                asyncio.run(program.run_async(slice_steps=slice_steps, max_steps=6))
+            error = context.exception
+            self.assertEqual(error.error_code, ErrorCode.STEP_BUDGET_EXCEEDED)
+            self.assertEqual(error.call_stack, ['MAIN', 'ALPHA'])
+
+        start = time.monotonic()
+        with self.assertRaises(LimitExceededError) as context:
+            asyncio.run(CompiledProgram(fan_out(30)).run_async(
+                    slice_steps=10 ** 9, deadline=start + 0.05))
+        self.assertEqual(context.exception.error_code, ErrorCode.DEADLINE_EXCEEDED)
+        self.assertLess(time.monotonic() - start, 1)
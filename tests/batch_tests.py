@@ -0,0 +1,62 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from interpreter.ex19.batch import find_programs, run_file, run_batch
+
+programs = {
+        'a.pas': 'PROGRAM A;\nVAR x : INTEGER;\nBEGIN x := 6 * 7 END.\n',
+        'lexer.pas': 'PROGRAM B;\nVAR x : INTEGER;\nBEGIN x := 1 ? END.\n',
+        'parser.pas': 'PROGRAM C;\nVAR x : INTEGER;\nBEGIN x := END.\n',
+        'sub/semantic.pas': 'PROGRAM D;\nBEGIN\n  y := 1\nEND.\n',
+        'sub/notes.txt': 'not a program',
+        }
+
+class BatchTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        os.mkdir(os.path.join(self.tmp_dir.name, 'sub'))
+        for name, text in programs.items():
+            with open(self.path(name), 'w') as f:
+                f.write(text)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_find_programs(self):
+        self.assertEqual(find_programs(self.tmp_dir.name), [
+                self.path('a.pas'),
+                self.path('lexer.pas'),
+                self.path('parser.pas'),
+                self.path('sub/semantic.pas'),
+                ])
+
+    def test_run_file(self):
+        result = run_file(self.path('a.pas'))
+        self.assertTrue(result['ok'])
+        self.assertEqual(result['globals'], {'X': 42})
+
+    def test_error_positions(self):
+        errors = {name: run_file(self.path(name))['error']
+                for name in ('lexer.pas', 'parser.pas', 'sub/semantic.pas')}
+
+        self.assertEqual(
+                {name: (error['type'], error['line'], error['column']) for name, error in errors.items()},
+                {
+                    'lexer.pas': ('LexerError', 3, 14),
+                    'parser.pas': ('ParserError', 3, 12),
+                    'sub/semantic.pas': ('SemanticError', 3, 3),
+                })
+
+    def test_run_batch(self):
+        output = io.StringIO()
+        ok, failed = run_batch(find_programs(self.tmp_dir.name), jobs=2, output=output)
+        self.assertEqual((ok, failed), (1, 3))
+
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(sorted(result['file'] for result in results),
+                find_programs(self.tmp_dir.name))
@@ -0,0 +1,73 @@
+import unittest
+from benchmarks.generator import ProgramGenerator
+from benchmarks.runner import benchmark, compare, PHASES
+from benchmarks.stages import Stage, STAGES, generate_expressions, reference
+from interpreter.ex19 import Lexer, Parser, SemanticAnalyzer, Interpreter, Compiler, VM
+
+def analyze(text):
+    tree = Parser(Lexer(text)).parse()
+    SemanticAnalyzer().visit(tree)
+    return tree
+
+def run(cls, text):
+    interpreter = cls(analyze(text))
+    interpreter.interpret()
+    return [interpreter.get_var_value(name) for name in ('g1', 'g2', 'g3')]
+
+class ProgramGeneratorTests(unittest.TestCase):
+    def test_seeded(self):
+        generator = ProgramGenerator(seed=7, calls=3)
+        text = generator.generate()
+        self.assertEqual(text, generator.generate())
+        self.assertEqual(text, ProgramGenerator(seed=7, calls=3).generate())
+        self.assertNotEqual(text, ProgramGenerator(seed=8, calls=3).generate())
+
+    def test_programs_run(self):
+        for seed in range(5):
+            text = ProgramGenerator(seed=seed, expr_depth=4, nesting=3, calls=5).generate()
+            values = run(Interpreter, text)
+            self.assertEqual(values, run(lambda tree: VM(Compiler().compile(tree)), text))
+            # values stay bounded however many calls are made
+            self.assertTrue(all(abs(value) < 10 ** 6 for value in values))
+
+    def test_shape(self):
+        text = ProgramGenerator(statements=4, procedures=2, nesting=2, calls=3).generate()
+        self.assertEqual(text.count('PROCEDURE'), 2 * 3)
+        main_body = text[text.rindex('\nBEGIN\n'):]
+        calls = [line for line in main_body.splitlines() if line.lstrip().startswith('P')]
+        self.assertEqual(len(calls), 2 * 3)
+
+class RunnerTests(unittest.TestCase):
+    def test_benchmark(self):
+        generator = ProgramGenerator(calls=2)
+        results = benchmark(generator, warmup=0, repeat=2)
+
+        self.assertEqual(results['params']['calls'], 2)
+        self.assertEqual(tuple(results['phases']), PHASES)
+        for phase in PHASES:
+            self.assertEqual(len(results['phases'][phase]['runs']), 2)
+
+    def test_compare(self):
+        baseline = {'phases': {phase: {'min': 1.0} for phase in PHASES}}
+        results = {'phases': {phase: {'min': 1.0} for phase in PHASES}}
+        results['phases']['parse']['min'] = 1.5
+
+        rows = compare(results, baseline, tolerance=0.1)
+        self.assertEqual([row[0] for row in rows if row[4]], ['parse'])
+
+class StagesTests(unittest.TestCase):
+    def test_expressions(self):
+        expressions = generate_expressions(seed=3, count=20, depth=4)
+        self.assertEqual(expressions, generate_expressions(seed=3, count=20, depth=4))
+        for expression in expressions:
+            self.assertIsInstance(reference(expression), int)
+
+    def test_stages_agree(self):
+        expressions = generate_expressions(count=10, depth=3) + ['(7 - 20) / 3', '2 + 3 * 4']
+        checked = {name for name in STAGES if Stage(name).check(expressions)}
+        self.assertEqual(set(STAGES) - checked, {'ex17', 'ex18'})
+
+    def test_measure(self):
+        throughput, peak = Stage('ex19').measure(generate_expressions(count=5), repeat=1)
+        self.assertGreater(throughput, 0)
+        self.assertGreater(peak, 0)
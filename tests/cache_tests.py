@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+from interpreter.ex19 import Lexer, Parser, SemanticAnalyzer, Interpreter
+from interpreter.ex19 import cache as cache_module
+from interpreter.ex19.cache import CompileCache
+
+def analyze(text):
+    lexer = Lexer(text)
+    parser = Parser(lexer)
+    tree = parser.parse()
+    semantic_analyzer = SemanticAnalyzer()
+    semantic_analyzer.visit(tree)
+    return tree
+
+program_code = r'''
+program Main;
+var r : integer;
+
+procedure Alpha(a : integer; b : integer);
+var x : integer;
+begin
+   x := (a + b ) * 2;
+   r := x;
+end;
+
+begin { Main }
+   Alpha(3 + 5, 7);
+end.  { Main }
+'''
+
+class CompileCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = CompileCache(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_round_trip(self):
+        self.assertIsNone(self.cache.load(program_code))
+        self.assertTrue(self.cache.store(program_code, analyze(program_code)))
+
+        tree = self.cache.load(program_code)
+        interpreter = Interpreter(tree)
+        interpreter.interpret()
+        self.assertEqual(interpreter.get_var_value('r'), 30)
+
+    def test_version_invalidates(self):
+        self.cache.store(program_code, analyze(program_code))
+        old_version = cache_module.FORMAT_VERSION
+        cache_module.FORMAT_VERSION += 1
+        try:
+            self.assertIsNone(self.cache.load(program_code))
+        finally:
+            cache_module.FORMAT_VERSION = old_version
+
+    def test_corrupted_entry_is_dropped(self):
+        self.cache.store(program_code, analyze(program_code))
+        path = self.cache.path(program_code)
+        with open(path, 'wb') as f:
+            f.write(b'garbage')
+
+        self.assertIsNone(self.cache.load(program_code))
+        self.assertFalse(os.path.exists(path))
+
+    def test_lru_eviction(self):
+        sources = [program_code.replace('Alpha(3', f'Alpha({i}') for i in range(3)]
+        for i, source in enumerate(sources):
+            self.cache.store(source, analyze(source))
+            os.utime(self.cache.path(source), (i, i))
+
+        # touch the oldest entry, the second one becomes the least recently used
+        self.cache.load(sources[0])
+        self.cache.max_size = sum(size for _, size, _ in self.cache.entries()) - 1
+        self.cache.evict()
+
+        self.assertIsNotNone(self.cache.load(sources[0]))
+        self.assertIsNone(self.cache.load(sources[1]))
+        self.assertIsNotNone(self.cache.load(sources[2]))
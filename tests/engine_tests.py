@@ -0,0 +1,77 @@
+import unittest
+from interpreter.ex19 import Lexer, Parser, Interpreter, Engine
+
+def interpret(cls, text):
+    lexer = Lexer(text)
+    parser = Parser(lexer)
+    tree = parser.parse()
+    interpreter = cls(tree)
+    interpreter.interpret()
+    return interpreter.get_var_value
+
+class EngineTests(unittest.TestCase):
+    def assertSameState(self, program_code, names):
+        engine_value = interpret(Engine, program_code)
+        tree_value = interpret(Interpreter, program_code)
+        for name in names:
+            self.assertEqual(engine_value(name), tree_value(name))
+
+    def test_expressions(self):
+        program_code = r'''
+        PROGRAM Part10AST;
+        VAR
+            a, b, c : INTEGER;
+            y       : REAL;
+
+        BEGIN {Part10AST}
+            a := 2;
+            b := 10 * a + 10 * a DIV 4;
+            c := a - - b - 1;
+            y := 20 / 8 + 3.14 / a;
+        END. {Part10AST}
+        '''
+
+        get_var_value = interpret(Engine, program_code)
+        self.assertEqual(get_var_value('b'), 25)
+        self.assertEqual(get_var_value('c'), 26)
+        self.assertSameState(program_code, ['a', 'b', 'c', 'y'])
+
+    def test_nested_proc_calls(self):
+        program_code = r'''
+        program Main;
+        var g, r : integer;
+
+        procedure Alpha(a : integer; b : integer);
+        var x : integer;
+
+           procedure Beta(a : integer);
+           begin
+              g := a * 10 + x;
+           end;
+
+        begin
+           x := (a + b ) * 2;
+           Beta(5);
+        end;
+
+        begin { Main }
+           Alpha(3 + 5, 7);
+           r := g + 1;
+        end.  { Main }
+        '''
+
+        get_var_value = interpret(Engine, program_code)
+        self.assertEqual(get_var_value('g'), 80)
+        self.assertSameState(program_code, ['g', 'r'])
+
+    def test_uninitialized_variable(self):
+        program_code = r'''
+        program Main;
+        var a, b : integer;
+        begin
+           a := b + 1;
+        end.
+        '''
+
+        with self.assertRaises(NameError):
+            interpret(Engine, program_code)
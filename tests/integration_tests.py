@@ -1,5 +1,6 @@
 import unittest
-from interpreter import Lexer, Parser, Interpreter, SemanticAnalyzer, enable_log
+from interpreter import Lexer, Parser, Interpreter, SemanticAnalyzer
+from interpreter.ex19 import StackInterpreter
 
 def interpret(text):
     lexer = Lexer(text)
@@ -10,9 +11,6 @@ def interpret(text):
     return interpreter.get_var_value
 
 class IntegrationTests(unittest.TestCase):
-    def setUp(self):
-        enable_log()
-
     def test_1(self):
         program_code = r'''
         PROGRAM Part10AST;
@@ -175,3 +173,83 @@ class IntegrationTests(unittest.TestCase):
 
         with self.assertRaises(Exception) as context:
             semantic_analyzer.visit(tree)
+
+    def test_outer_scope_vars(self):
+        program_code = r'''
+        PROGRAM Scopes;
+        VAR g, r1, r2, r3 : INTEGER;
+
+        PROCEDURE Gamma(v : INTEGER);
+        VAR x : INTEGER;
+        BEGIN
+            x := v * 100;
+            g := g + x;
+        END;
+
+        PROCEDURE Alpha(a : INTEGER);
+        VAR x : INTEGER;
+
+            PROCEDURE Beta(b : INTEGER);
+            BEGIN
+                r1 := x + b;
+                Gamma(b);
+                r2 := x + g;
+            END;
+
+        BEGIN
+            x := a * 2;
+            Beta(a + 1);
+            r3 := x;
+        END;
+
+        BEGIN
+            g := 1;
+            Alpha(5);
+        END.
+        '''
+
+        for cls in (Interpreter, StackInterpreter):
+            tree = Parser(Lexer(program_code)).parse()
+            interpreter = cls(tree)
+            interpreter.interpret()
+            # Gamma's x at level 2 doesn't shadow Alpha's x once it returns
+            self.assertEqual(interpreter.get_var_value('r1'), 16)
+            self.assertEqual(interpreter.get_var_value('r2'), 611)
+            self.assertEqual(interpreter.get_var_value('r3'), 10)
+            self.assertEqual(interpreter.call_stack.display, [None, None, None, None])
+
+    def test_var_addresses(self):
+        program_code = r'''
+        program Main;
+        var g, r : integer;
+
+        procedure Alpha(a : integer);
+        var x : integer;
+        begin
+           x := a;
+           g := x + r;
+        end;
+
+        begin { Main }
+           r := 1;
+           Alpha(41);
+        end.  { Main }
+        '''
+        lexer = Lexer(program_code)
+        parser = Parser(lexer)
+        tree = parser.parse()
+        semantic_analyzer = SemanticAnalyzer()
+        semantic_analyzer.visit(tree)
+
+        self.assertEqual(tree.block.slot_names, ('G', 'R'))
+        proc_decl = tree.block.declarations[2]
+        self.assertEqual(proc_decl.body.slot_names, ('A', 'X'))
+        assign_x, assign_g, _ = proc_decl.body.compound_statement.leaves
+        self.assertEqual(assign_x.left.address, (2, 1))
+        self.assertEqual(assign_x.right.address, (2, 0))
+        self.assertEqual(assign_g.left.address, (1, 0))
+        self.assertEqual(assign_g.right.right.address, (1, 1))
+
+        interpreter = Interpreter(tree)
+        interpreter.interpret()
+        self.assertEqual(interpreter.get_var_value('g'), 42)
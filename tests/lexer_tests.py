@@ -2,6 +2,11 @@ import unittest
 from interpreter.ex9.lexer import Lexer
 from interpreter.ex9.token_type import TokenType
 from interpreter.ex9.token import Token
+from interpreter.ex19.lexer import Lexer as Ex19Lexer
+from interpreter.ex19.token_buffer import TokenBuffer
+from interpreter.ex19.token_type import TokenType as Ex19TokenType
+from interpreter.ex19.token import Token as Ex19Token
+from interpreter.ex19.error import LexerError
 
 class LexerTests(unittest.TestCase):
     def test_1(self):
@@ -31,3 +36,93 @@ class LexerTests(unittest.TestCase):
 
         token = lexer.get_next_token()
         self.assertEqual(token, Token(TokenType.EOF, None))
+
+class RegexLexerTests(unittest.TestCase):
+    def tokens(self, text):
+        lexer = Ex19Lexer(text)
+        ret = []
+        while True:
+            token = lexer.get_next_token()
+            ret.append(token)
+            if token.type == Ex19TokenType.EOF:
+                return ret
+
+    def test_1(self):
+        tokens = self.tokens('BEGIN a := 2; END.')
+        self.assertEqual(tokens, [
+            Ex19Token(Ex19TokenType.BEGIN, 'BEGIN'),
+            Ex19Token(Ex19TokenType.ID, 'A'),
+            Ex19Token(Ex19TokenType.ASSIGN, ':='),
+            Ex19Token(Ex19TokenType.INTEGER_CONST, 2),
+            Ex19Token(Ex19TokenType.SEMI, ';'),
+            Ex19Token(Ex19TokenType.END, 'END'),
+            Ex19Token(Ex19TokenType.DOT, '.'),
+            Ex19Token(Ex19TokenType.EOF, None),
+            ])
+
+    def test_comments_and_positions(self):
+        text = 'x_1 := 3.14 { a\nmulti-line comment }\n  div y'
+        tokens = self.tokens(text)
+        self.assertEqual(tokens[:-1], [
+            Ex19Token(Ex19TokenType.ID, 'X_1'),
+            Ex19Token(Ex19TokenType.ASSIGN, ':='),
+            Ex19Token(Ex19TokenType.REAL_CONST, 3.14),
+            Ex19Token(Ex19TokenType.INTEGER_DIV, 'DIV'),
+            Ex19Token(Ex19TokenType.ID, 'Y'),
+            ])
+        positions = [(token.lineno, token.column) for token in tokens[:-1]]
+        self.assertEqual(positions, [(1, 1), (1, 5), (1, 8), (3, 3), (3, 7)])
+
+    def test_cur_char_follows_token(self):
+        lexer = Ex19Lexer('Alpha(3)')
+        lexer.get_next_token()
+        self.assertEqual(lexer.cur_char, '(')
+
+    def test_error(self):
+        lexer = Ex19Lexer('a :=\n  b ? c')
+        for _ in range(3):
+            lexer.get_next_token()
+
+        with self.assertRaises(LexerError) as context:
+            lexer.get_next_token()
+
+        self.assertIn('line: 2 column: 5', str(context.exception))
+        token = context.exception.token
+        self.assertEqual((token.lineno, token.column), (2, 5))
+
+class TokenBufferTests(unittest.TestCase):
+    text = (
+            'PROGRAM Part10;\n'
+            'VAR a, b : INTEGER; { counters }\n'
+            'BEGIN\n'
+            '   a := 2; b := a * 3.5 DIV a\n'
+            'END.'
+            )
+
+    def test_same_tokens_as_lexer(self):
+        lexer = Ex19Lexer(self.text)
+        cursor = TokenBuffer(self.text).cursor()
+
+        while True:
+            expected = lexer.get_next_token()
+            token = cursor.get_next_token()
+            self.assertEqual(token, expected)
+            self.assertEqual((token.lineno, token.column), (expected.lineno, expected.column))
+            self.assertEqual(cursor.cur_char, lexer.cur_char)
+            if expected.type == Ex19TokenType.EOF:
+                break
+
+    def test_compact_storage(self):
+        buffer = TokenBuffer(self.text)
+        self.assertEqual(len(buffer), 25)
+        self.assertEqual(buffer.types.typecode, 'B')
+        # identifiers and constants are interned
+        self.assertEqual(buffer.values, [None, 'PART10', 'A', 'B', 2, 3.5])
+        self.assertEqual(buffer.token(10), Ex19Token(Ex19TokenType.BEGIN, 'BEGIN'))
+
+    def test_peek_type(self):
+        cursor = TokenBuffer(self.text).cursor()
+        cursor.get_next_token()
+        self.assertEqual(cursor.peek_type(), Ex19TokenType.ID)
+        self.assertEqual(cursor.peek_type(2), Ex19TokenType.SEMI)
+        self.assertEqual(cursor.peek_type(100), Ex19TokenType.EOF)
@@ -0,0 +1,56 @@
+import time
+import unittest
+from interpreter.ex19 import Interpreter, StackInterpreter, CompiledProgram
+from interpreter.ex19.error import LimitExceededError, ErrorCode
+from .programs import two_calls_code, recursive_code, fan_out, analyze
+
+class LimitsTests(unittest.TestCase):
+    def run_limited(self, cls, text, **limits):
+        interpreter = cls(analyze(text), **limits)
+        interpreter.interpret()
+        return interpreter
+
+    def test_step_budget(self):
+        for cls in (Interpreter, StackInterpreter):
+            interpreter = self.run_limited(cls, two_calls_code, max_steps=7)
+            self.assertEqual(interpreter.get_var_value('r'), 18)
+
+            with self.assertRaises(LimitExceededError) as context:
+                self.run_limited(cls, two_calls_code, max_steps=6)
+
+            error = context.exception
+            self.assertEqual(error.error_code, ErrorCode.STEP_BUDGET_EXCEEDED)
+            # stopped before the second statement of the second call
+            self.assertEqual(error.call_stack, ['MAIN', 'ALPHA'])
+            self.assertEqual((error.token.lineno, error.token.column), (8, 6))
+
+    def test_runaway_recursion(self):
+        with self.assertRaises(LimitExceededError) as context:
+            self.run_limited(StackInterpreter, recursive_code, max_steps=500)
+
+        error = context.exception
+        self.assertEqual(error.call_stack, ['MAIN'] + ['FOREVER'] * 500)
+        self.assertEqual(error.as_dict()['call_stack'], error.call_stack)
+
+    def test_deadline(self):
+        for cls in (Interpreter, StackInterpreter):
+            start = time.monotonic()
+            with self.assertRaises(LimitExceededError) as context:
+                self.run_limited(cls, fan_out(30), deadline=start + 0.05)
+
+            self.assertLess(time.monotonic() - start, 1)
+            error = context.exception
+            self.assertEqual(error.error_code, ErrorCode.DEADLINE_EXCEEDED)
+            self.assertEqual(error.call_stack[:2], ['FAN', 'P29'])
+
+    def test_both_limits(self):
+        interpreter = self.run_limited(Interpreter, fan_out(8),
+                max_steps=10 ** 6, deadline=time.monotonic() + 60)
+        self.assertEqual(interpreter.get_var_value('n'), 2 ** 7)
+
+    def test_compiled_program(self):
+        program = CompiledProgram(recursive_code)
+        with self.assertRaises(LimitExceededError):
+            program.run(max_call_depth=10 ** 6, max_steps=100)
+        with self.assertRaises(LimitExceededError):
+            program.run(max_call_depth=10 ** 6, deadline=time.monotonic() + 0.01)
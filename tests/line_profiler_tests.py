@@ -0,0 +1,75 @@
+import sys
+import threading
+import time
+import unittest
+from interpreter.ex19 import Lexer, Parser, SemanticAnalyzer, Interpreter, StackInterpreter
+from interpreter.ex19.line_profiler import LineSampler, frame_line
+
+PROGRAM = r'''PROGRAM Main;
+VAR r : INTEGER;
+
+PROCEDURE Alpha(a : INTEGER);
+BEGIN
+    r := a * 2 + 1;
+END;
+
+BEGIN
+    r := 0;
+    Alpha(3);
+END.
+'''
+
+def analyze(text):
+    tree = Parser(Lexer(text)).parse()
+    SemanticAnalyzer().visit(tree)
+    return tree
+
+class LineSamplerTests(unittest.TestCase):
+    def test_sample_tree_interpreter(self):
+        sampler = LineSampler()
+        sampler.thread_id = threading.get_ident()
+
+        class SampledInterpreter(Interpreter):
+            # the literal has no position, the sample goes to the
+            # enclosing node that has one
+            def visit_Num(self, node):
+                sampler.sample()
+                return node.value
+
+        SampledInterpreter(analyze(PROGRAM)).interpret()
+
+        self.assertEqual(sampler.samples, 4)
+        self.assertEqual(sampler.hits, {6: 2, 10: 1, 11: 1})
+
+    def test_frame_line_stack_interpreter(self):
+        lines = []
+
+        class SampledInterpreter(StackInterpreter):
+            def evaluate(self, node, depth):
+                lines.append(frame_line(sys._getframe()))
+                return super().evaluate(node, depth)
+
+        SampledInterpreter(analyze(PROGRAM)).interpret()
+        self.assertEqual(lines, [10, 11, 6])
+
+    def test_report(self):
+        sampler = LineSampler()
+        sampler.samples = 4
+        sampler.hits = {6: 3}
+
+        report = sampler.report(PROGRAM)
+        self.assertIn('4 samples, 3 in the program', report)
+        self.assertIn('   3  100.0     6      r := a * 2 + 1;', report)
+
+    def test_background_sampling(self):
+        tree = analyze(PROGRAM)
+
+        deadline = time.monotonic() + 5
+
+        with LineSampler(interval=0.0001) as sampler:
+            while not sampler.samples and time.monotonic() < deadline:
+                Interpreter(tree).interpret()
+
+        self.assertGreater(sampler.samples, 0)
+        self.assertFalse(sampler.thread.is_alive())
+        self.assertLessEqual(set(sampler.hits), {6, 10, 11})
@@ -0,0 +1,73 @@
+import unittest
+from interpreter.ex19 import Lexer, Parser, SemanticAnalyzer, Interpreter
+from interpreter.ex19.memory import CallStack, ActivationRecord, ARType
+
+class CallStackTests(unittest.TestCase):
+    def test_slotted_record(self):
+        ar = ActivationRecord('MAIN', ARType.PROGRAM, 1, ('A', 'B'))
+        self.assertFalse(hasattr(ar, '__dict__'))
+        ar['B'] = 2
+        self.assertEqual(ar.slots, [None, 2])
+        self.assertEqual(ar.get('B'), 2)
+        self.assertIsNone(ar.get('C'))
+
+    def test_iteration(self):
+        call_stack = CallStack()
+        records = [ActivationRecord(name, ARType.PROCEDURE, level) for level, name in
+                enumerate(('MAIN', 'ALPHA', 'BETA'), 1)]
+        for ar in records:
+            call_stack.push(ar)
+
+        self.assertEqual(list(call_stack), records)
+        self.assertEqual(list(reversed(call_stack)), records[::-1])
+        self.assertEqual(call_stack.names(), ['MAIN', 'ALPHA', 'BETA'])
+
+    def test_records_recycled(self):
+        call_stack = CallStack()
+        key = object()
+
+        ar = call_stack.new_record(key, 'P', ARType.PROCEDURE, 2, ('X', 'Y'))
+        ar.slots[0] = 1
+        call_stack.push(ar)
+        call_stack.pop()
+
+        # the popped record comes back cleared
+        again = call_stack.new_record(key, 'P', ARType.PROCEDURE, 2, ('X', 'Y'))
+        self.assertIs(again, ar)
+        self.assertEqual(again.slots, [None, None])
+
+        call_stack.push(again)
+        nested = call_stack.new_record(key, 'P', ARType.PROCEDURE, 2, ('X', 'Y'))
+        self.assertIsNot(nested, again)
+
+        other = call_stack.new_record(object(), 'Q', ARType.PROCEDURE, 2, ('Z',))
+        self.assertIsNot(other, ar)
+
+    def test_interpreter_reuses_records(self):
+        program_code = r'''
+        PROGRAM Main;
+        VAR r : INTEGER;
+
+        PROCEDURE Alpha(a : INTEGER);
+        VAR x : INTEGER;
+        BEGIN
+            x := a * 2;
+            r := r + x;
+        END;
+
+        BEGIN
+            r := 0;
+            Alpha(1);
+            Alpha(2);
+            Alpha(3);
+        END.
+        '''
+
+        tree = Parser(Lexer(program_code)).parse()
+        SemanticAnalyzer().visit(tree)
+        interpreter = Interpreter(tree)
+        interpreter.interpret()
+
+        self.assertEqual(interpreter.get_var_value('r'), 12)
+        free_lists = list(interpreter.call_stack.free_lists.values())
+        self.assertEqual([len(free_list) for free_list in free_lists], [1])
@@ -0,0 +1,128 @@
+import unittest
+from interpreter.ex19 import Lexer, Parser, SemanticAnalyzer, ConstantFolder, Interpreter
+from interpreter.ex19.ast import Num, Var, BinOp
+
+def analyze(text):
+    tree = Parser(Lexer(text)).parse()
+    SemanticAnalyzer().visit(tree)
+    return tree
+
+def statements(tree):
+    return tree.block.compound_statement.leaves
+
+def expression_program(expr):
+    return f'''
+    PROGRAM Fold;
+    VAR
+        a : INTEGER;
+        x : INTEGER;
+        y : REAL;
+    BEGIN
+        a := 7;
+        y := 2.5;
+        x := {expr};
+    END.
+    '''
+
+class ConstantFolderTests(unittest.TestCase):
+    def fold(self, expr):
+        tree = analyze(expression_program(expr))
+        removed = ConstantFolder().fold(tree)
+        return statements(tree)[2].right, removed
+
+    def assertSameResult(self, expr):
+        folded = analyze(expression_program(expr))
+        ConstantFolder().fold(folded)
+        interpreter = Interpreter(folded)
+        interpreter.interpret()
+        reference = Interpreter(analyze(expression_program(expr)))
+        reference.interpret()
+        value, expected = interpreter.get_var_value('x'), reference.get_var_value('x')
+        self.assertEqual(value, expected)
+        self.assertIs(type(value), type(expected))
+
+    def test_fold_constants(self):
+        node, removed = self.fold('(3 + 5) * 2')
+        self.assertIsInstance(node, Num)
+        self.assertEqual(node.value, 16)
+        self.assertEqual(removed, 4)
+
+    def test_division_semantics(self):
+        for expr, value in (('7 DIV 2', 3), ('-7 DIV 2', -4), ('7 / 2', 3.5), ('6 / 3', 2.0)):
+            node, _ = self.fold(expr)
+            self.assertEqual(node.value, value)
+            self.assertIs(type(node.value), type(value))
+            self.assertSameResult(expr)
+
+    def test_division_by_zero_not_folded(self):
+        node, removed = self.fold('1 DIV 0')
+        self.assertIsInstance(node, BinOp)
+        self.assertEqual(removed, 0)
+
+        node, removed = self.fold('(1 + 1) DIV 0')
+        self.assertEqual(node.left.value, 2)
+        self.assertEqual(removed, 2)
+
+    def test_expressions_not_modified(self):
+        tree = analyze(expression_program('a * (2 + 3) - 0'))
+        expr = statements(tree)[2].right
+        ConstantFolder().fold(tree)
+
+        self.assertIsInstance(expr.left.right, BinOp)
+        self.assertIsInstance(statements(tree)[2].right.right, Num)
+
+    def test_identities(self):
+        for expr in ('a * 1', '1 * a', 'a + 0', '0 + a', 'a - 0', '+a', '- -a', '+(a * (3 - 2))'):
+            node, _ = self.fold(expr)
+            self.assertIsInstance(node, Var, expr)
+            self.assertEqual(node.name, 'A')
+            self.assertSameResult(expr)
+
+    def test_real_identities_kept(self):
+        # x * 1.0 makes an integer real and x DIV 1 floors a real
+        for expr in ('a * 1.0', 'y DIV 1', 'a / 1'):
+            node, removed = self.fold(expr)
+            self.assertIsInstance(node, BinOp, expr)
+            self.assertEqual(removed, 0)
+
+    def test_partial_folding(self):
+        node, removed = self.fold('10 * a + 10 * (4 DIV 2)')
+        self.assertIsInstance(node.right, Num)
+        self.assertEqual(node.right.value, 20)
+        self.assertEqual(removed, 4)
+        self.assertSameResult('10 * a + 10 * (4 DIV 2)')
+
+    def test_procedures_folded(self):
+        program_code = r'''
+        PROGRAM Fold;
+        VAR
+            a : INTEGER;
+        PROCEDURE P(b : INTEGER);
+        BEGIN
+            a := b * (2 + 2) + 0;
+        END;
+        BEGIN
+            P(1 + 1 + 1);
+        END.
+        '''
+
+        tree = analyze(program_code)
+        self.assertEqual(ConstantFolder().fold(tree), 8)
+        interpreter = Interpreter(tree)
+        interpreter.interpret()
+        self.assertEqual(interpreter.get_var_value('a'), 12)
+
+    def test_uninitialized_var_still_fails(self):
+        program_code = r'''
+        PROGRAM Fold;
+        VAR
+            a, b : INTEGER;
+        BEGIN
+            a := b * 1;
+        END.
+        '''
+
+        tree = analyze(program_code)
+        ConstantFolder().fold(tree)
+        with self.assertRaises(NameError):
+            Interpreter(tree).interpret()
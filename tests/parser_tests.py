@@ -0,0 +1,106 @@
+import unittest
+from interpreter.ex19 import (Lexer, Parser, SemanticAnalyzer, ConstantFolder,
+        Interpreter, StackInterpreter, Compiler, VM, Engine, PythonTranspiler)
+from interpreter.ex19.parser import MAX_EXPR_NESTING
+from interpreter.ex19.error import ParserError, ErrorCode
+
+def parse_expr(text):
+    lexer = Lexer(f'PROGRAM p; BEGIN x := {text} END.')
+    parser = Parser(lexer)
+    tree = parser.parse()
+    return tree.block.compound_statement.leaves[0].right
+
+def to_lisp(node):
+    node_type = type(node).__name__
+    if node_type == 'BinOp':
+        return f'({node.token.value} {to_lisp(node.left)} {to_lisp(node.right)})'
+    elif node_type == 'UnOp':
+        return f'({node.token.value} {to_lisp(node.factor)})'
+    elif node_type == 'Num':
+        return str(node.value)
+    else:
+        return node.token.value
+
+class ExprParserTests(unittest.TestCase):
+    def test_precedence(self):
+        self.assertEqual(to_lisp(parse_expr('2 + 3 * 5')), '(+ 2 (* 3 5))')
+        self.assertEqual(to_lisp(parse_expr('7 + 5 * 2 - 3')), '(- (+ 7 (* 5 2)) 3)')
+        self.assertEqual(
+                to_lisp(parse_expr('10 * a + 10 * a DIV 4')),
+                '(+ (* 10 A) (DIV (* 10 A) 4))')
+
+    def test_left_associativity(self):
+        self.assertEqual(to_lisp(parse_expr('1 - 2 - 3')), '(- (- 1 2) 3)')
+        self.assertEqual(to_lisp(parse_expr('8 / 4 / 2')), '(/ (/ 8 4) 2)')
+
+    def test_parentheses(self):
+        self.assertEqual(
+                to_lisp(parse_expr('5 + ((1 + 2) * 4) - 3')),
+                '(- (+ 5 (* (+ 1 2) 4)) 3)')
+
+    def test_unary(self):
+        self.assertEqual(to_lisp(parse_expr('a - - b')), '(- A (- B))')
+        self.assertEqual(to_lisp(parse_expr('-a * b')), '(* (- A) B)')
+        self.assertEqual(to_lisp(parse_expr('-(a + b) * +c')), '(* (- (+ A B)) (+ C))')
+
+    def test_deep_nesting(self):
+        # parentheses alone add no nesting
+        node = parse_expr('(' * 3000 + '1' + ')' * 3000)
+        self.assertEqual(node.value, 1)
+
+        node = parse_expr(' + '.join(['1'] * 5000))
+        self.assertEqual(node.right.value, 1)
+
+    def test_nesting_limit(self):
+        for text in (
+                '-' * 20000 + '1',
+                '1 - (' * MAX_EXPR_NESTING + '1' + ')' * MAX_EXPR_NESTING,
+                ):
+            with self.assertRaises(ParserError) as context:
+                parse_expr(text)
+            self.assertEqual(context.exception.error_code, ErrorCode.EXPR_TOO_DEEP)
+
+    def run_everywhere(self, expression, value, transpile=True):
+        text = f'''
+        PROGRAM Main;
+        VAR a, b : INTEGER;
+        PROCEDURE P(x : INTEGER);
+        BEGIN b := {expression} END;
+        BEGIN a := 1; P({expression}) END.
+        '''
+
+        tree = Parser(Lexer(text)).parse()
+        SemanticAnalyzer().visit(tree)
+        ConstantFolder().fold(tree)
+
+        backends = [Interpreter(tree), StackInterpreter(tree),
+                VM(Compiler().compile(tree)), Engine(tree)]
+        backends[-1].compile()
+        if transpile:
+            backends.append(PythonTranspiler(Parser(Lexer(text))))
+
+        for backend in backends:
+            backend.interpret()
+            self.assertEqual(backend.get_var_value('b'), value, type(backend).__name__)
+
+    def test_long_chains_run(self):
+        # CPython's own compiler recurses once per term
+        terms = ['a', 'a * 2', '(a + 1) * (a + 1)', '-a', 'a DIV 1'] * 1000
+        self.run_everywhere(' + '.join(terms), 1000 * (1 + 2 + 4 - 1 + 1), transpile=False)
+        self.run_everywhere(' - '.join(['a'] * 5000), 1 - 4999, transpile=False)
+        self.run_everywhere(' * '.join(['a'] * 1000), 1)
+
+    def test_deepest_expressions_run(self):
+        nesting = MAX_EXPR_NESTING
+        self.run_everywhere('-' * (nesting - 1) + 'a', -1)
+        self.run_everywhere('a - (' * (nesting - 1) + 'a' + ')' * (nesting - 1), 0,
+                # CPython allows 200 nested parentheses only
+                transpile=False)
+        self.run_everywhere('a + a - (' * (nesting - 1) + 'a' + ')' * (nesting - 1), 1,
+                transpile=False)
+
+    def test_unbalanced_parentheses(self):
+        with self.assertRaises(ParserError):
+            parse_expr('(1 + 2')
+        with self.assertRaises(ParserError):
+            parse_expr('1 * * 2')
@@ -0,0 +1,76 @@
+import itertools
+import unittest
+from interpreter.ex19 import Lexer, Parser, SemanticAnalyzer
+from interpreter.ex19.profiler import Profiler, ProfilingInterpreter
+
+PROGRAM = r'''
+PROGRAM Main;
+VAR r : INTEGER;
+
+PROCEDURE Alpha(a : INTEGER);
+VAR x : INTEGER;
+
+    PROCEDURE Beta(b : INTEGER);
+    BEGIN
+        r := r + b;
+    END;
+
+BEGIN
+    x := a * 2;
+    Beta(x);
+    Beta(x + 1);
+END;
+
+BEGIN
+    r := 0;
+    Alpha(1);
+    Alpha(2);
+END.
+'''
+
+def ticks():
+    # every clock reading is one second later than the previous
+    return itertools.count().__next__
+
+class ProfilerTests(unittest.TestCase):
+    def test_times(self):
+        profiler = Profiler(clock=ticks())
+        profiler.enter('MAIN')      # 0
+        profiler.enter('P')         # 1
+        profiler.enter('Q')         # 2
+        profiler.leave()            # 3
+        profiler.leave()            # 4
+        profiler.leave()            # 5
+
+        self.assertEqual(profiler.stats, {
+                'MAIN': [1, 2.0, 5.0],
+                'P': [1, 2.0, 3.0],
+                'Q': [1, 1.0, 1.0],
+                })
+        self.assertEqual(profiler.collapsed_stacks(),
+                'MAIN 2000000\nMAIN;P 2000000\nMAIN;P;Q 1000000\n')
+
+    def test_recursion_counted_once(self):
+        profiler = Profiler(clock=ticks())
+        profiler.enter('P')         # 0
+        profiler.enter('P')         # 1
+        profiler.leave()            # 2
+        profiler.leave()            # 3
+
+        calls, exclusive, inclusive = profiler.stats['P']
+        self.assertEqual((calls, exclusive, inclusive), (2, 3.0, 3.0))
+
+    def test_interpreter(self):
+        tree = Parser(Lexer(PROGRAM)).parse()
+        SemanticAnalyzer().visit(tree)
+        interpreter = ProfilingInterpreter(tree)
+        interpreter.interpret()
+        profiler = interpreter.profiler
+
+        self.assertEqual(interpreter.get_var_value('r'), 14)
+        self.assertEqual({name: stats[0] for name, stats in profiler.stats.items()},
+                {'MAIN': 1, 'ALPHA': 2, 'BETA': 4})
+        self.assertEqual([row[0] for row in profiler.rows('cumulative')], ['MAIN', 'ALPHA', 'BETA'])
+        self.assertEqual([row[0] for row in profiler.rows('calls')], ['BETA', 'ALPHA', 'MAIN'])
+        self.assertEqual(sorted(profiler.stacks), ['MAIN', 'MAIN;ALPHA', 'MAIN;ALPHA;BETA'])
+        self.assertIn('Ordered by: cumulative time', profiler.report())
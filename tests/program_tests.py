@@ -0,0 +1,78 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from interpreter.ex19 import CompiledProgram, Parser, SemanticAnalyzer
+from interpreter.ex19.error import InterpreterError, ErrorCode
+from .programs import recursive_code
+
+program_code = r'''
+program Main;
+var a, b, r : integer;
+
+procedure Alpha(x : integer);
+var y : integer;
+
+   procedure Beta(z : integer);
+   begin
+      r := y * z + b;
+   end;
+
+begin
+   y := x + 1;
+   Beta(2 * x);
+end;
+
+begin { Main }
+   Alpha(a + 2 * 3);
+end.  { Main }
+'''
+
+def expected(a, b):
+    x = a + 6
+    return (x + 1) * (2 * x) + b
+
+class CompiledProgramTests(unittest.TestCase):
+    def setUp(self):
+        self.program = CompiledProgram(program_code)
+
+    def test_run(self):
+        self.assertEqual(self.program.name, 'MAIN')
+        self.assertEqual(self.program.global_names, ('A', 'B', 'R'))
+        self.assertEqual(self.program.run({'a': 1, 'B': 2}), {'A': 1, 'B': 2, 'R': expected(1, 2)})
+
+    def test_runs_are_independent(self):
+        self.assertEqual(self.program.run({'a': 4, 'b': 0})['R'], expected(4, 0))
+        with self.assertRaises(NameError):
+            # b isn't carried over from the previous run
+            self.program.run({'a': 4})
+        self.assertEqual(self.program.run({'a': 5, 'b': 1})['R'], expected(5, 1))
+
+    def test_no_analysis_per_run(self):
+        with mock.patch.object(Parser, 'parse', side_effect=AssertionError), \
+                mock.patch.object(SemanticAnalyzer, 'visit', side_effect=AssertionError):
+            self.assertEqual(self.program.run({'a': 0, 'b': 0})['R'], expected(0, 0))
+
+    def test_unknown_global(self):
+        with self.assertRaises(InterpreterError) as context:
+            self.program.run({'a': 1, 'b': 2, 'c': 3})
+        self.assertEqual(context.exception.error_code, ErrorCode.ID_NOT_FOUND)
+
+    def test_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.program.name = 'OTHER'
+        with self.assertRaises(AttributeError):
+            self.program.cache = {}
+
+    def test_threads(self):
+        inputs = [(a, b) for a in range(20) for b in range(5)]
+
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(lambda args: self.program.run({'a': args[0], 'b': args[1]}), inputs))
+
+        self.assertEqual([result['R'] for result in results], [expected(a, b) for a, b in inputs])
+
+    def test_max_call_depth(self):
+        program = CompiledProgram(recursive_code)
+        with self.assertRaises(InterpreterError) as context:
+            program.run(max_call_depth=100)
+        self.assertEqual(context.exception.error_code, ErrorCode.CALL_DEPTH_EXCEEDED)
@@ -0,0 +1,53 @@
+"""
+Pascal programs shared by the test modules
+"""
+
+from interpreter.ex19 import Lexer, Parser, SemanticAnalyzer
+
+# 7 statements: 3 in the program body, 2 in every call of Alpha, r = 18
+two_calls_code = r'''
+program Main;
+var r : integer;
+
+procedure Alpha(a : integer);
+begin
+   r := r + a;
+   r := r * 2
+end;
+
+begin
+   r := 1;
+   Alpha(2);
+   Alpha(3)
+end.
+'''
+
+recursive_code = r'''
+program Main;
+
+procedure Forever;
+begin
+   Forever()
+end;
+
+begin
+   Forever()
+end.
+'''
+
+def fan_out(levels):
+    """
+    Returns a program making 2 ** levels calls
+    """
+
+    lines = ['PROGRAM Fan;', 'VAR n : INTEGER;']
+    for level in range(levels):
+        body = f'P{level - 1}(); P{level - 1}()' if level else 'n := n + 1'
+        lines.append(f'PROCEDURE P{level}; BEGIN {body} END;')
+    lines.append(f'BEGIN n := 0; P{levels - 1}() END.')
+    return '\n'.join(lines)
+
+def analyze(text):
+    tree = Parser(Lexer(text)).parse()
+    SemanticAnalyzer().visit(tree)
+    return tree
@@ -0,0 +1,138 @@
+import unittest
+from interpreter.ex19 import Lexer, Parser, PythonTranspiler
+from interpreter.ex19.error import InterpreterError, ErrorCode
+
+def pascal2python(text):
+    lexer = Lexer(text)
+    parser = Parser(lexer)
+    transpiler = PythonTranspiler(parser)
+    return transpiler.translate()
+
+def interpret(text):
+    lexer = Lexer(text)
+    parser = Parser(lexer)
+    transpiler = PythonTranspiler(parser, filename='test.pas')
+    transpiler.interpret()
+    return transpiler.get_var_value
+
+class PythonTranspilerTests(unittest.TestCase):
+    def test_expressions(self):
+        program_code = r'''
+        PROGRAM Part10AST;
+        VAR
+            a,b : INTEGER;
+            y   : REAL;
+
+        BEGIN {Part10AST}
+            a := 2;
+            b := 10 * a + 10 * a DIV 4;
+            y := 20 / 8 + 3.14;
+        END. {Part10AST}
+        '''
+
+        self.assertIn('B = 10 * A + 10 * A // 4', pascal2python(program_code))
+        get_var_value = interpret(program_code)
+        self.assertEqual(get_var_value('a'), 2)
+        self.assertEqual(get_var_value('b'), 25)
+        self.assertEqual(format(get_var_value('y'), '.2f'), str(5.64))
+
+    def test_nested_procedures(self):
+        program_code = r'''
+        program Main;
+        var g : integer;
+
+        procedure Alpha(a : integer);
+        var x : integer;
+
+           procedure Beta;
+           begin
+              g := x * 10;
+              x := 1;
+           end;
+
+        begin
+           x := a;
+           Beta();
+           g := g + x;
+        end;
+
+        begin { Main }
+           Alpha(4);
+        end.  { Main }
+        '''
+
+        self.assertEqual(interpret(program_code)('g'), 41)
+
+    def test_runtime_error_position(self):
+        program_code = (
+                'program Main;\n'
+                'var a, b : integer;\n'
+                'begin\n'
+                '   a := 1;\n'
+                '   b := a DIV 0;\n'
+                'end.\n'
+                )
+
+        with self.assertRaises(InterpreterError) as context:
+            interpret(program_code)
+
+        self.assertEqual(context.exception.error_code, ErrorCode.RUNTIME_ERROR)
+        self.assertEqual(context.exception.token.lineno, 5)
+        self.assertEqual(context.exception.token.column, 4)
+
+    def test_uninitialized_variable(self):
+        program_code = r'''
+        program Main;
+        var a, b : integer;
+        begin
+           a := b + 1;
+        end.
+        '''
+
+        with self.assertRaises(InterpreterError) as context:
+            interpret(program_code)
+
+        self.assertEqual(context.exception.error_code, ErrorCode.UNINITIALIZED_VAR)
+
+    def test_parentheses(self):
+        program_code = r'''
+        PROGRAM Main;
+        VAR a, b, c : INTEGER;
+        BEGIN
+            a := 7;
+            b := (a - (2 - 1)) * -(a + 1) DIV (2 * 2);
+            c := - -a - (a DIV (3 DIV 2));
+        END.
+        '''
+
+        python_code = pascal2python(program_code)
+        self.assertIn('B = (A - (2 - 1)) * -(A + 1) // (2 * 2)', python_code)
+        self.assertIn('C = --A - A // (3 // 2)', python_code)
+        get_var_value = interpret(program_code)
+        self.assertEqual(get_var_value('b'), -12)
+        self.assertEqual(get_var_value('c'), 0)
+
+    def test_long_chain(self):
+        terms = ' + '.join(['1'] * 250)
+        program_code = f'PROGRAM Main; VAR a : INTEGER; BEGIN a := {terms} END.'
+        self.assertEqual(interpret(program_code)('a'), 250)
+
+    def test_compile_error_position(self):
+        # CPython's compiler recurses once per term of a chain
+        terms = ' + '.join(['a'] * 20000)
+        program_code = (
+                'PROGRAM Main;\n'
+                'VAR a : INTEGER;\n'
+                'BEGIN\n'
+                f'   a := {terms}\n'
+                'END.\n'
+                )
+
+        with self.assertRaises(InterpreterError) as context:
+            interpret(program_code)
+
+        error = context.exception
+        self.assertEqual(error.error_code, ErrorCode.COMPILE_ERROR)
+        # no line is known, the error is reported at the program name
+        self.assertEqual((error.token.lineno, error.token.column), (1, 9))
+        self.assertIsInstance(error.__cause__, RecursionError)
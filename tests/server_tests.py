@@ -0,0 +1,188 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import unittest
+from interpreter.ex19.server import Server, ServerError, ProgramCache
+from .programs import recursive_code
+
+program_code = r'''
+program Main;
+var r, s : integer;
+
+procedure Alpha(a : integer; b : integer);
+var x : integer;
+begin
+   x := (a + b ) * 2;
+   r := x;
+end;
+
+begin { Main }
+   Alpha(3 + 5, 7);
+   s := r DIV 4
+end.  { Main }
+'''
+
+async def request(path, *requests):
+    reader, writer = await asyncio.open_unix_connection(path)
+    responses = []
+    try:
+        for request in requests:
+            line = request if isinstance(request, bytes) else json.dumps(request).encode()
+            writer.write(line + b'\n')
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+    finally:
+        writer.close()
+    return responses
+
+class ProgramCacheTests(unittest.TestCase):
+    def test_lru(self):
+        cache = ProgramCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+class ServerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'interpreter.sock')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def serve(self, client, **kwargs):
+        server = Server(**kwargs)
+
+        async def run():
+            await server.start(self.path)
+            try:
+                return await client()
+            finally:
+                server.server.close()
+                await server.server.wait_closed()
+                server.close()
+
+        return asyncio.run(run())
+
+    def test_source_and_cache(self):
+        responses = self.serve(lambda: request(self.path,
+                {'id': 1, 'source': program_code},
+                {'id': 2, 'source': program_code},
+                ))
+
+        self.assertEqual([response['id'] for response in responses], [1, 2])
+        for response in responses:
+            self.assertTrue(response['ok'])
+            self.assertEqual(response['globals'], {'R': 30, 'S': 7})
+        self.assertEqual([response['cached'] for response in responses], [False, True])
+
+    def test_globals(self):
+        source = 'PROGRAM Main; VAR a, b : INTEGER; BEGIN b := a * 2 END.'
+        responses = self.serve(lambda: request(self.path,
+                {'source': source, 'globals': {'a': 4}},
+                {'source': source, 'globals': {'a': 5}},
+                {'source': source, 'globals': [1]},
+                ))
+
+        self.assertEqual([response.get('globals') for response in responses[:2]],
+                [{'A': 4, 'B': 8}, {'A': 5, 'B': 10}])
+        self.assertEqual(responses[2]['error']['type'], 'RequestError')
+
+    def test_path(self):
+        source_path = os.path.join(self.tmp_dir.name, 'main.pas')
+        with open(source_path, 'w') as f:
+            f.write(program_code)
+
+        response, = self.serve(lambda: request(self.path, {'path': source_path}))
+        self.assertEqual(response['globals'], {'R': 30, 'S': 7})
+
+    def test_concurrent_clients(self):
+        async def clients():
+            return await asyncio.gather(*(
+                    request(self.path, {'id': i, 'source': program_code.replace('7)', f'{i})')})
+                    for i in range(20)))
+
+        for i, (response,) in enumerate(self.serve(clients)):
+            self.assertEqual(response['id'], i)
+            self.assertEqual(response['globals']['R'], (8 + i) * 2)
+
+    def test_errors(self):
+        responses = self.serve(lambda: request(self.path,
+                b'not json',
+                {'id': 1},
+                {'id': 2, 'source': 'PROGRAM Main;\nBEGIN a := END.'},
+                {'id': 3, 'source': program_code.replace('s := r', 's := q')},
+                ))
+
+        self.assertEqual([response['ok'] for response in responses], [False] * 4)
+        self.assertEqual(responses[0]['error']['type'], 'RequestError')
+        self.assertEqual(responses[1]['error']['type'], 'RequestError')
+
+        error = responses[2]['error']
+        self.assertEqual(error['type'], 'ParserError')
+        self.assertEqual((error['line'], error['column']), (2, 12))
+
+        self.assertEqual(responses[3]['error']['type'], 'SemanticError')
+        self.assertEqual(responses[3]['error']['code'], 'Identifier not found')
+
+    def test_limits(self):
+        responses = self.serve(lambda: request(self.path,
+                {'source': recursive_code, 'max_call_depth': 50},
+                {'source': recursive_code, 'max_call_depth': 10 ** 9},
+                {'source': program_code, 'timeout': -1},
+                {'source': program_code, 'max_steps': 1},
+                ), max_call_depth=100)
+
+        for response in responses[:2]:
+            self.assertEqual(response['error']['code'], 'Maximum call depth exceeded')
+        self.assertEqual(responses[2]['error']['type'], 'RequestError')
+
+        error = responses[3]['error']
+        self.assertEqual(error['code'], 'Step budget exceeded')
+        self.assertEqual(error['call_stack'], ['MAIN', 'ALPHA'])
+
+    def test_request_size(self):
+        response, = self.serve(lambda: request(self.path, {'source': program_code}),
+                max_request_size=64)
+        self.assertIn('longer than 64 bytes', response['error']['message'])
+
+    def test_socket_path_taken(self):
+        with open(self.path, 'w') as f:
+            f.write('notes')
+
+        server = Server()
+        with self.assertRaises(ServerError):
+            asyncio.run(server.start(self.path))
+        server.close()
+
+        with open(self.path) as f:
+            self.assertEqual(f.read(), 'notes')
+
+    def test_live_socket_kept(self):
+        async def clients():
+            second = Server()
+            try:
+                with self.assertRaises(ServerError):
+                    await second.start(self.path)
+            finally:
+                second.close()
+            return await request(self.path, {'source': program_code})
+
+        response, = self.serve(clients)
+        self.assertEqual(response['globals'], {'R': 30, 'S': 7})
+
+    def test_stale_socket_replaced(self):
+        # a bound socket nobody listens on, as a killed server leaves it
+        with socket.socket(socket.AF_UNIX) as stale:
+            stale.bind(self.path)
+
+        response, = self.serve(lambda: request(self.path, {'source': program_code}))
+        self.assertTrue(response['ok'])
@@ -0,0 +1,104 @@
+import unittest
+from interpreter.ex19 import Lexer, Parser, SemanticAnalyzer, Interpreter, StackInterpreter
+from interpreter.ex19.error import InterpreterError, ErrorCode
+
+def analyze(text):
+    tree = Parser(Lexer(text)).parse()
+    SemanticAnalyzer().visit(tree)
+    return tree
+
+def chain_program(depth):
+    # P<i> calls P<i-1>, so calling the last one nests depth calls
+    procs = ['PROCEDURE P0(x : INTEGER); BEGIN r := x END;']
+    procs.extend(f'PROCEDURE P{i}(x : INTEGER); BEGIN P{i-1}(x + 1) END;'
+            for i in range(1, depth))
+    body = f'P{depth - 1}(0)'
+    return 'PROGRAM Chain; VAR r : INTEGER;\n' + '\n'.join(procs) + f'\nBEGIN {body} END.'
+
+class StackInterpreterTests(unittest.TestCase):
+    def assertSameState(self, program_code, names):
+        tree = analyze(program_code)
+        stack = StackInterpreter(tree)
+        stack.interpret()
+        reference = Interpreter(tree)
+        reference.interpret()
+        for name in names:
+            self.assertEqual(stack.get_var_value(name), reference.get_var_value(name))
+
+    def test_expressions(self):
+        program_code = r'''
+        PROGRAM Part10AST;
+        VAR
+            a, b, c : INTEGER;
+            y       : REAL;
+
+        BEGIN {Part10AST}
+            BEGIN
+                a := 2;
+                b := 10 * a + 10 * a DIV 4;
+            END;
+            c := a - - b - 1;
+            y := 20 / 8 + 3.14 / a;
+        END. {Part10AST}
+        '''
+
+        self.assertSameState(program_code, ['a', 'b', 'c', 'y'])
+
+    def test_nested_proc_calls(self):
+        program_code = r'''
+        PROGRAM Main;
+        VAR
+            r, s : INTEGER;
+
+        PROCEDURE Alpha(a : INTEGER; b : INTEGER);
+        VAR x : INTEGER;
+
+            PROCEDURE Beta(a : INTEGER; b : INTEGER);
+            VAR x : INTEGER;
+            BEGIN
+                x := a * 10 + b * 2;
+                s := x + r;
+            END;
+
+        BEGIN
+            x := (a + b) * 2;
+            Beta(x, -(b + 1));
+            r := r + x;
+        END;
+
+        BEGIN {Main}
+            r := 1;
+            Alpha(3 + 5, 7);
+            Alpha(1, 2);
+        END. {Main}
+        '''
+
+        self.assertSameState(program_code, ['r', 's'])
+
+    def test_deep_calls(self):
+        tree = analyze(chain_program(5000))
+        stack = StackInterpreter(tree)
+        stack.interpret()
+        self.assertEqual(stack.get_var_value('r'), 4999)
+        self.assertTrue(stack.call_stack.is_empty())
+
+    def test_call_depth_limit(self):
+        tree = analyze(chain_program(50))
+
+        with self.assertRaises(InterpreterError) as cm:
+            StackInterpreter(tree, max_call_depth=10).interpret()
+        self.assertEqual(cm.exception.error_code, ErrorCode.CALL_DEPTH_EXCEEDED)
+        self.assertEqual(cm.exception.token.value, 'P39')
+
+    def test_infinite_recursion(self):
+        tree = analyze('PROGRAM R; PROCEDURE P; BEGIN P() END; BEGIN P() END.')
+
+        with self.assertRaises(InterpreterError) as cm:
+            StackInterpreter(tree, max_call_depth=1000).interpret()
+        self.assertEqual(cm.exception.error_code, ErrorCode.CALL_DEPTH_EXCEEDED)
+
+    def test_uninitialized_var(self):
+        tree = analyze('PROGRAM U; VAR a, b : INTEGER; BEGIN a := b + 1 END.')
+
+        with self.assertRaises(NameError):
+            StackInterpreter(tree).interpret()
@@ -0,0 +1,72 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from unittest import mock
+from interpreter.ex19 import Lexer, Parser, main
+from interpreter.ex19.arena import Arena
+from interpreter.ex19.timings import Timings, count_nodes
+
+PROGRAM = r'''
+PROGRAM Timed;
+VAR
+    a, b : INTEGER;
+
+PROCEDURE P(x : INTEGER);
+BEGIN
+    b := x * (2 + 3);
+END;
+
+BEGIN
+    a := 2;
+    P(a);
+END.
+'''
+
+class TimingsTests(unittest.TestCase):
+    def test_phases(self):
+        timings = Timings()
+        with timings.phase('first'):
+            pass
+        with self.assertRaises(ValueError):
+            with timings.phase('failed'):
+                raise ValueError()
+
+        data = timings.as_dict()
+        self.assertEqual([phase['name'] for phase in data['phases']], ['first', 'failed'])
+        self.assertGreaterEqual(data['total']['wall'], 0)
+        self.assertIn('total', timings.report())
+
+    def test_count_nodes(self):
+        tree = Parser(Lexer('PROGRAM T; VAR a : INTEGER; BEGIN a := 1 + 2 END.')).parse()
+        # Program, Var, Block, VarDecl, Var, Type, Compound, Assign, Var, BinOp, Num, Num
+        self.assertEqual(count_nodes(tree), 12)
+        self.assertEqual(count_nodes(Arena.from_tree(tree).root), 12)
+
+    def test_cli_json(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'timed.pas')
+            with open(path, 'w') as f:
+                f.write(PROGRAM)
+
+            stderr = io.StringIO()
+            argv = ['interpreter', path, '--no-cache', '--timings=json']
+            with mock.patch('sys.argv', argv), redirect_stderr(stderr):
+                main()
+
+        data = json.loads(stderr.getvalue())
+        names = [phase['name'] for phase in data['phases']]
+        self.assertEqual(names, ['read', 'lex', 'parse', 'analyze', 'fold', 'compile', 'execute'])
+        self.assertEqual(data['tokens'], len(list(tokens(PROGRAM))))
+        self.assertEqual(data['folded_nodes'], 2)
+        self.assertGreater(data['ast_nodes'], 0)
+
+def tokens(text):
+    lexer = Lexer(text)
+    while True:
+        token = lexer.get_next_token()
+        yield token
+        if token.value is None:
+            break
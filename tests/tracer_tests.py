@@ -0,0 +1,106 @@
+import io
+import threading
+import unittest
+import interpreter
+from contextlib import redirect_stdout
+from interpreter.ex19 import Lexer, Parser, SemanticAnalyzer, Interpreter, StackInterpreter, Tracer
+
+program_code = r'''
+program Main;
+var r : integer;
+
+procedure Alpha(a : integer);
+   procedure Beta(b : integer);
+   begin
+      r := a + b
+   end;
+begin
+   Beta(a * 2)
+end;
+
+begin
+   Alpha(1);
+   Alpha(2)
+end.
+'''
+
+def analyze(text, tracer=None):
+    tree = Parser(Lexer(text)).parse()
+    if tracer:
+        SemanticAnalyzer(tracer).visit(tree)
+    else:
+        SemanticAnalyzer().visit(tree)
+    return tree
+
+def trace_lines(output):
+    return [line for line in output.getvalue().splitlines()
+            if line.startswith(('ENTER', 'LEAVE'))]
+
+class TracerTests(unittest.TestCase):
+    def test_default_is_silent(self):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            Interpreter(analyze(program_code)).interpret()
+            StackInterpreter(analyze(program_code)).interpret()
+        self.assertEqual(stdout.getvalue(), '')
+
+    def test_scope_trace(self):
+        output = io.StringIO()
+        analyze(program_code, Tracer(output))
+        lines = output.getvalue().splitlines()
+        self.assertEqual(lines[0], 'Enter scope: global')
+        self.assertIn('Enter scope ALPHA', lines)
+        self.assertIn('Leave scope BETA', lines)
+
+    def test_stack_trace(self):
+        expected = [
+                'ENTER: PROGRAM MAIN',
+                'ENTER: PROCEDURE ALPHA',
+                'ENTER: PROCEDURE BETA',
+                'LEAVE: PROCEDURE BETA',
+                'LEAVE: PROCEDURE ALPHA',
+                ] + [
+                'ENTER: PROCEDURE ALPHA',
+                'ENTER: PROCEDURE BETA',
+                'LEAVE: PROCEDURE BETA',
+                'LEAVE: PROCEDURE ALPHA',
+                'LEAVE: PROGRAM MAIN',
+                ]
+
+        for cls in (Interpreter, StackInterpreter):
+            output = io.StringIO()
+            cls(analyze(program_code), tracer=Tracer(output)).interpret()
+            self.assertEqual(trace_lines(output), expected, cls.__name__)
+
+    def test_threads_trace_apart(self):
+        tree = analyze(program_code)
+        outputs = [io.StringIO(), io.StringIO()]
+        tracers = [Tracer(outputs[0]), None, Tracer(outputs[1]), None]
+
+        def run(tracer):
+            for _ in range(50):
+                if tracer:
+                    Interpreter(tree, tracer=tracer).interpret()
+                else:
+                    Interpreter(tree).interpret()
+
+        threads = [threading.Thread(target=run, args=(tracer,)) for tracer in tracers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(trace_lines(outputs[0])), 50 * 10)
+        self.assertEqual(outputs[0].getvalue(), outputs[1].getvalue())
+
+    def test_enable_log_deprecated(self):
+        from interpreter.ex19.interpreter import enable_log as enable_stack_log
+        for enable_log in (interpreter.enable_log, enable_stack_log):
+            with self.assertWarns(DeprecationWarning) as context:
+                enable_log()
+            self.assertIn('Tracer(sys.stdout)', str(context.warning))
+
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            Interpreter(analyze(program_code)).interpret()
+        self.assertEqual(stdout.getvalue(), '')
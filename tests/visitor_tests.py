@@ -0,0 +1,43 @@
+import unittest
+from interpreter.ex19.visitor import NodeVisitor
+from interpreter.ex19.ast import Num, NoOp
+
+class Base(NodeVisitor):
+    def visit_Num(self, node):
+        return 'base'
+
+class Derived(Base):
+    def visit_Num(self, node):
+        return 'derived'
+
+class Inherited(Base):
+    pass
+
+class Fallback(Base):
+    def generic_visit(self, node):
+        return 'generic'
+
+class NodeVisitorTests(unittest.TestCase):
+    def test_dispatch(self):
+        self.assertEqual(Base().visit(Num(1)), 'base')
+        self.assertEqual(Derived().visit(Num(1)), 'derived')
+        self.assertEqual(Inherited().visit(Num(1)), 'base')
+        # the tables are per class, a visit through one doesn't leak
+        self.assertEqual(Base().visit(Num(1)), 'base')
+
+    def test_generic_visit(self):
+        with self.assertRaises(Exception):
+            Base().visit(NoOp())
+        self.assertEqual(Fallback().visit(NoOp()), 'generic')
+        self.assertEqual(Fallback().visit(Num(1)), 'base')
+
+    def test_node_subclass(self):
+        class Literal(Num):
+            __slots__ = ()
+        # dispatch goes by the class name, like arena views
+        self.assertEqual(Fallback().visit(Literal(1)), 'generic')
+
+        class Num_(Num):
+            __slots__ = ()
+        Num_.__name__ = 'Num'
+        self.assertEqual(Base().visit(Num_(1)), 'base')
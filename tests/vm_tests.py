@@ -0,0 +1,111 @@
+import unittest
+from interpreter.ex19 import Lexer, Parser, SemanticAnalyzer, Interpreter, Compiler, VM
+
+def analyze(text):
+    lexer = Lexer(text)
+    parser = Parser(lexer)
+    tree = parser.parse()
+    semantic_analyzer = SemanticAnalyzer()
+    semantic_analyzer.visit(tree)
+    return tree
+
+def run_vm(text):
+    bytecode = Compiler().compile(analyze(text))
+    vm = VM(bytecode)
+    vm.interpret()
+    return vm
+
+def run_tree(text):
+    interpreter = Interpreter(analyze(text))
+    interpreter.interpret()
+    return interpreter
+
+class VMTests(unittest.TestCase):
+    def assertSameState(self, program_code, names):
+        vm = run_vm(program_code)
+        interpreter = run_tree(program_code)
+        for name in names:
+            self.assertEqual(vm.get_var_value(name), interpreter.get_var_value(name))
+
+    def test_expressions(self):
+        program_code = r'''
+        PROGRAM Part10;
+        VAR
+           number     : INTEGER;
+           a, b, c, x : INTEGER;
+           y          : REAL;
+
+        BEGIN {Part10}
+           BEGIN
+              number := 2;
+              a := number;
+              b := 10 * a + 10 * number DIV 4;
+              c := a - - b
+           END;
+           x := 11;
+           y := 20 / 7 + 3.14;
+        END.  {Part10}
+        '''
+
+        vm = run_vm(program_code)
+        self.assertEqual(vm.get_var_value('b'), 25)
+        self.assertEqual(vm.get_var_value('c'), 27)
+        self.assertSameState(program_code, ['number', 'a', 'b', 'c', 'x', 'y'])
+
+    def test_proc_call(self):
+        program_code = r'''
+        program Main;
+        var r : integer;
+
+        procedure Alpha(a : integer; b : integer);
+        var x : integer;
+
+           procedure Beta(a : integer; b : integer);
+           var x : integer;
+           begin
+              x := a * 10 + b * 2;
+           end;
+
+        begin
+           x := (a + b ) * 2;
+           Beta(5, 10);
+        end;
+
+        begin { Main }
+           Alpha(3 + 5, 7);
+           r := 1;
+        end.  { Main }
+        '''
+
+        self.assertSameState(program_code, ['r'])
+
+    def test_enclosing_scope_access(self):
+        program_code = r'''
+        program Main;
+        var g, r : integer;
+
+        procedure Alpha(a : integer);
+        begin
+           g := a + r;
+        end;
+
+        begin { Main }
+           r := 1;
+           Alpha(41);
+        end.  { Main }
+        '''
+
+        vm = run_vm(program_code)
+        self.assertEqual(vm.get_var_value('g'), 42)
+
+    def test_uninitialized_variable(self):
+        program_code = r'''
+        program Main;
+        var a, b : integer;
+        begin
+           a := b + 1;
+        end.
+        '''
+
+        with self.assertRaises(NameError):
+            run_vm(program_code)